@@ -0,0 +1,39 @@
+"""Add foreign key and composite indexes
+
+Tables are created with Base.metadata.create_all (see entrypoint.sh), so
+this first revision only adds the indexes that existing databases are
+missing. IF NOT EXISTS keeps it a no-op on databases created after the
+indexes were declared on the models.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_grades_enrollment_id_periodo",
+        "grades",
+        ["enrollment_id", "periodo"],
+        if_not_exists=True,
+    )
+    op.create_index("ix_subjects_profesor_id", "subjects", ["profesor_id"], if_not_exists=True)
+    op.create_index("ix_enrollments_subject_id", "enrollments", ["subject_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_enrollments_subject_id", table_name="enrollments", if_exists=True)
+    op.drop_index("ix_subjects_profesor_id", table_name="subjects", if_exists=True)
+    op.drop_index("ix_grades_enrollment_id_periodo", table_name="grades", if_exists=True)
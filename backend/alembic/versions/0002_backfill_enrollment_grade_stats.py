@@ -0,0 +1,53 @@
+"""Create and backfill enrollment_grade_stats
+
+create_all (see entrypoint.sh) creates the table on existing databases but
+leaves it empty, so this revision creates it if needed and fills it from
+the grades table. Later writes keep it current.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("enrollment_grade_stats"):
+        op.create_table(
+            "enrollment_grade_stats",
+            sa.Column(
+                "enrollment_id",
+                sa.Integer(),
+                sa.ForeignKey("enrollments.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("grade_count", sa.Integer(), nullable=False),
+            sa.Column("grade_sum", sa.Numeric(12, 2), nullable=False),
+            sa.Column("grade_avg", sa.Numeric(7, 4), nullable=False),
+            sa.Column("grade_min", sa.Numeric(3, 2), nullable=False),
+            sa.Column("grade_max", sa.Numeric(3, 2), nullable=False),
+            sa.Column("last_updated", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        )
+
+    op.execute("DELETE FROM enrollment_grade_stats")
+    op.execute(
+        "INSERT INTO enrollment_grade_stats "
+        "(enrollment_id, grade_count, grade_sum, grade_avg, grade_min, grade_max, last_updated) "
+        "SELECT enrollment_id, COUNT(id), SUM(nota), AVG(nota), MIN(nota), MAX(nota), CURRENT_TIMESTAMP "
+        "FROM grades GROUP BY enrollment_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("enrollment_grade_stats")
@@ -0,0 +1,67 @@
+"""Add code_counters and seed it from existing institutional codes
+
+Institutional codes were numbered with COUNT(*) over the users and
+subjects tables. This revision creates the counter table used by the
+allocator in app/utils/codigo_generator.py and starts every counter at
+the highest number already in use.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+import re
+from typing import Dict, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_USER_CODE = re.compile(r"^([A-Z]+)-(\d{4})-(\d+)$")
+_SUBJECT_CODE = re.compile(r"^([A-Z]+)-(\d+)$")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("code_counters"):
+        op.create_table(
+            "code_counters",
+            sa.Column("prefix", sa.String(10), primary_key=True),
+            sa.Column("year", sa.Integer(), primary_key=True),
+            sa.Column("last_value", sa.Integer(), nullable=False),
+        )
+
+    counters: Dict[Tuple[str, int], int] = {}
+    for (codigo,) in bind.execute(sa.text("SELECT codigo_institucional FROM users")):
+        match = _USER_CODE.match(codigo or "")
+        if match:
+            key = (match.group(1), int(match.group(2)))
+            counters[key] = max(counters.get(key, 0), int(match.group(3)))
+    for (codigo,) in bind.execute(sa.text("SELECT codigo_institucional FROM subjects")):
+        match = _SUBJECT_CODE.match(codigo or "")
+        if match:
+            key = (match.group(1), 0)
+            counters[key] = max(counters.get(key, 0), int(match.group(2)))
+
+    op.execute("DELETE FROM code_counters")
+    if counters:
+        counter_table = sa.table(
+            "code_counters",
+            sa.column("prefix", sa.String),
+            sa.column("year", sa.Integer),
+            sa.column("last_value", sa.Integer),
+        )
+        op.bulk_insert(counter_table, [
+            {"prefix": prefix, "year": year, "last_value": last_value}
+            for (prefix, year), last_value in counters.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table("code_counters")
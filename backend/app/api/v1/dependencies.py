@@ -1,59 +1,147 @@
 """API v1 dependencies."""
 
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.exceptions import BaseAppException, ValidationError
+from app.core.metrics import set_request_role
+from app.core.principal_cache import principal_cache
+from app.core.read_replica import reads_from_replica
 from app.core.security import decode_access_token
 from app.models.user import User, UserRole
-from app.schemas.token import TokenData
+from app.schemas.token import Principal, TokenData
+from app.utils.bulk_ingest import BulkFormatError, SUPPORTED_CONTENT_TYPES, media_type
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    """Dependency to get the current authenticated user.
+def _credentials_exception() -> HTTPException:
+    """Build the 401 raised for invalid credentials."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _decode_token_data(token: str) -> TokenData:
+    """Decode a JWT into token data.
     
     Args:
         token: JWT token from request
-        db: Database session
     
     Returns:
-        Current user
+        Token data with email, role and user ID claims
     
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid or has no subject
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
     try:
         payload = decode_access_token(token)
         email: str = payload.get("sub")
         if email is None:
-            raise credentials_exception
-        token_data = TokenData(email=email, role=payload.get("role"))
+            raise _credentials_exception()
+        return TokenData(email=email, role=payload.get("role"), user_id=payload.get("uid"))
     except Exception:
-        raise credentials_exception
+        raise _credentials_exception()
+
+
+async def _load_user(db: AsyncSession, email: str) -> User:
+    """Load the user for a token subject, using the principal cache.
+    
+    On a cache hit the user is attached to the session from its cached
+    column values without querying the database, so relationships and
+    writes keep working as with a loaded instance. Users read from the
+    replica may be stale and are not cached.
+    
+    Args:
+        db: Database session
+        email: Token subject
+    
+    Returns:
+        User attached to the session
+    
+    Raises:
+        HTTPException: If the user does not exist
+    """
+    cached = principal_cache.get(email)
+    if cached is not None:
+        set_request_role(cached["role"])
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
     
-    stmt = select(User).where(User.email == token_data.email)
+    generation = principal_cache.generation
+    stmt = select(User).where(User.email == email)
     result = await db.execute(stmt)
     user = result.scalar_one_or_none()
     
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
+    set_request_role(user.role)
+    if not reads_from_replica(db):
+        principal_cache.set(email, user, generation)
     return user
 
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Dependency to get the current authenticated user.
+    
+    Args:
+        token: JWT token from request
+        db: Database session
+    
+    Returns:
+        Current user
+    
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    token_data = _decode_token_data(token)
+    return await _load_user(db, token_data.email)
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """Dependency to get the current identity for read-only endpoints.
+    
+    When ``TRUST_TOKEN_CLAIMS`` is enabled and the token carries id and role
+    claims, the identity is built from the token alone. Otherwise the user
+    is loaded as in ``get_current_user`` and reduced to its ``id``,
+    ``email`` and ``role``.
+    
+    Args:
+        token: JWT token from request
+        db: Database session
+    
+    Returns:
+        Principal of the current user
+    
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    token_data = _decode_token_data(token)
+    if settings.trust_token_claims and token_data.user_id is not None and token_data.role:
+        try:
+            principal = Principal(id=token_data.user_id, email=token_data.email, role=token_data.role)
+        except ValueError:
+            raise _credentials_exception()
+        set_request_role(principal.role)
+        return principal
+    return Principal.model_validate(await _load_user(db, token_data.email))
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -97,3 +185,36 @@ require_admin = require_role([UserRole.ADMIN])
 require_profesor = require_role([UserRole.PROFESOR])
 require_estudiante = require_role([UserRole.ESTUDIANTE])
 require_admin_or_profesor = require_role([UserRole.ADMIN, UserRole.PROFESOR])
+
+
+# Response header carrying the cursor of the next page in list endpoints
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Expose the cursor of the next page on a list response.
+    
+    The body stays a plain list for backward compatibility; clients pass
+    the header value back as the ``cursor`` query parameter.
+    
+    Args:
+        response: Response of the list endpoint
+        next_cursor: Cursor of the next page, or None on the last page
+    """
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def bulk_upload_error(request: Request, error: BulkFormatError) -> BaseAppException:
+    """Map a malformed bulk upload body to an HTTP error.
+    
+    Args:
+        request: Bulk upload request
+        error: Error raised while parsing the body
+    
+    Returns:
+        415 for unsupported content types, 400 otherwise
+    """
+    if media_type(request.headers.get("content-type")) not in SUPPORTED_CONTENT_TYPES:
+        return BaseAppException(str(error), status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+    return ValidationError(str(error))
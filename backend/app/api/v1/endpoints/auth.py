@@ -5,8 +5,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.core.security import verify_password, create_access_token
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.core.security import verify_password_async, create_access_token
 from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
 from app.core.rate_limit import rate_limit
 from app.models.user import User
 from app.schemas.token import Token
@@ -17,7 +19,7 @@ from app.api.v1.dependencies import (
     require_admin,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.post("/login", response_model=Token)
@@ -42,7 +44,7 @@ async def login(
     user_service = UserService(db)
     user = await user_service.get_user_by_email(form_data.username)
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -52,7 +54,7 @@ async def login(
     # Create access token
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.email, "role": user.role.value},
+        data={"sub": user.email, "role": user.role.value, "uid": user.id},
         expires_delta=access_token_expires,
     )
     
@@ -96,6 +98,8 @@ async def register(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    except ServiceUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,30 @@
+"""Dashboard endpoints."""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.schemas.dashboard import DashboardSummary
+from app.schemas.token import Principal
+from app.services.dashboard_service import DashboardService
+from app.api.v1.dependencies import get_current_principal
+
+router = APIRouter(route_class=UnitOfWorkRoute)
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """Get the dashboard statistics of the current user.
+    
+    - Admin: totals of users, subjects, enrollments and grades, every subject
+    - Profesor: their assigned subjects, enrollments and grades
+    - Estudiante: their enrollments and own grades
+    
+    Counts and per-subject averages are computed with aggregate queries and
+    cached for ``DASHBOARD_CACHE_TTL_SECONDS``.
+    """
+    service = DashboardService(db)
+    return await service.get_summary(current_user.id, current_user.role)
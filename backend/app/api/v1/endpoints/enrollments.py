@@ -1,19 +1,21 @@
 """Enrollment endpoints - Refactored to use repository pattern and serializers."""
 
-from typing import List
-from fastapi import APIRouter, Depends, Query, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
 from app.core.exceptions import NotFoundError, ValidationError, ConflictError
 from app.core.logging import logger
 from app.models.user import User
-from app.schemas.enrollment import EnrollmentCreate, EnrollmentResponse
+from app.schemas.enrollment import EnrollmentBulkResult, EnrollmentCreate, EnrollmentResponse
 from app.services.enrollment_service import EnrollmentService
 from app.repositories.enrollment_repository import EnrollmentRepository
-from app.api.v1.dependencies import require_admin
+from app.api.v1.dependencies import bulk_upload_error, require_admin, set_next_cursor
 from app.api.v1.serializers.enrollment_serializer import EnrollmentSerializer
+from app.utils.bulk_ingest import BulkFormatError, iter_records
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.post("", response_model=EnrollmentResponse, status_code=status.HTTP_201_CREATED)
@@ -26,9 +28,8 @@ async def create_enrollment(
     service = EnrollmentService(db)
     
     try:
+        # Committed with the request's unit of work
         enrollment = await service.create_enrollment(enrollment_data)
-        await db.commit()
-        await db.refresh(enrollment)
         
         # Load enrollment with relations using repository
         enrollment_repo = EnrollmentRepository(db)
@@ -54,21 +55,57 @@ async def create_enrollment(
         raise ValidationError(f"Error creating enrollment: {str(e)}")
 
 
+@router.post("/bulk", response_model=EnrollmentBulkResult)
+async def bulk_create_enrollments(
+    request: Request,
+    response: Response,
+    atomic: bool = Query(True, description="Create nothing if any row fails validation"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    """Enroll many students at once (Admin only).
+    
+    The body is a CSV document with a header row (``text/csv``) or a JSON
+    array of objects (``application/json``), each row with
+    ``estudiante_id`` and ``subject_id``. Existing enrollments are skipped.
+    With ``atomic=true`` (default) a batch with any invalid row creates
+    nothing and responds 422.
+    """
+    service = EnrollmentService(db)
+    try:
+        result = await service.bulk_create_enrollments(
+            iter_records(request.stream(), request.headers.get("content-type")), atomic
+        )
+    except BulkFormatError as e:
+        raise bulk_upload_error(request, e)
+    
+    if atomic and result.failed:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return result
+
+
 @router.get("", response_model=List[EnrollmentResponse])
 async def get_enrollments(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
     """Get all enrollments (Admin only)."""
     # Use repository to load enrollments with relations
     enrollment_repo = EnrollmentRepository(db)
-    enrollments = await enrollment_repo.get_many_with_relations(
-        relations=['estudiante', 'subject'],
-        skip=skip,
-        limit=limit
-    )
+    try:
+        enrollments, next_cursor = await enrollment_repo.get_page_with_relations(
+            relations=['estudiante', 'subject'],
+            cursor=cursor,
+            skip=skip,
+            limit=limit
+        )
+    except ValueError as e:
+        raise ValidationError(str(e))
+    set_next_cursor(response, next_cursor)
     
     # Serialize enrollments using serializer
     return await EnrollmentSerializer.serialize_batch(enrollments, db)
@@ -1,25 +1,29 @@
 """Grade endpoints - Refactored to use repository pattern and serializers."""
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
 from app.core.exceptions import NotFoundError, ForbiddenError
 from app.models.user import User, UserRole
-from app.schemas.grade import GradeCreate, GradeUpdate, GradeResponse
+from app.schemas.grade import GradeBulkResult, GradeCreate, GradeUpdate, GradeResponse
+from app.schemas.token import Principal
 from app.services.grade_service import GradeService
 from app.services.profesor_service import ProfesorService
-from app.services.estudiante_service import EstudianteService
 from app.repositories.grade_repository import GradeRepository
 from app.repositories.enrollment_repository import EnrollmentRepository
+from app.repositories.subject_repository import SubjectRepository
 from app.api.v1.dependencies import (
-    get_current_active_user,
+    bulk_upload_error,
+    get_current_principal,
     require_admin_or_profesor,
 )
 from app.api.v1.serializers.grade_serializer import GradeSerializer
 from app.api.v1.validators.grade_validator import GradeValidator
+from app.utils.bulk_ingest import BulkFormatError, iter_records
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 # ==================== Endpoints ====================
@@ -62,9 +66,50 @@ async def create_grade(
             raise NotFoundError("Grade", str(e))
 
 
+@router.post("/bulk", response_model=GradeBulkResult)
+async def bulk_create_grades(
+    request: Request,
+    response: Response,
+    subject_id: int = Query(..., description="Subject ID"),
+    periodo: str = Query(..., min_length=1, max_length=20, description="Period applied to every row"),
+    atomic: bool = Query(True, description="Insert nothing if any row fails"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin_or_profesor),
+):
+    """Upload many grades of one subject and period (Profesor or Admin only).
+    
+    The body is a CSV document with a header row (``text/csv``) or a JSON
+    array of objects (``application/json``) and is parsed as it streams in.
+    Each row has ``enrollment_id`` or ``estudiante_id``, ``nota``, ``fecha``
+    and optionally ``observaciones``.
+    
+    Returns per-row errors. With ``atomic=true`` (default) a batch with any
+    failing row inserts nothing and responds 422; with ``atomic=false`` the
+    valid rows are inserted.
+    """
+    records = iter_records(request.stream(), request.headers.get("content-type"))
+    try:
+        if current_user.role == UserRole.PROFESOR:
+            profesor_service = ProfesorService(db, current_user)
+            result = await profesor_service.bulk_create_grades(subject_id, periodo, records, atomic)
+        else:
+            if not await SubjectRepository(db).get_by_id(subject_id):
+                raise NotFoundError("Subject", subject_id)
+            service = GradeService(db)
+            result = await service.bulk_create_grades(subject_id, periodo, records, atomic)
+    except BulkFormatError as e:
+        raise bulk_upload_error(request, e)
+    except ValueError as e:
+        raise ForbiddenError(str(e))
+    
+    if atomic and result.failed:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return result
+
+
 async def _get_grades_with_filters(
     db: AsyncSession,
-    current_user: Optional[User] = None,
+    current_user: Optional[Principal] = None,
     subject_id: Optional[int] = None,
     enrollment_id: Optional[int] = None,
     is_estudiante: bool = False,
@@ -86,9 +131,8 @@ async def _get_grades_with_filters(
     grade_repo = GradeRepository(db)
     
     if is_estudiante and current_user:
-        # Estudiante: get grades through service first
-        estudiante_service = EstudianteService(db, current_user)
-        grades = await estudiante_service.get_grades_by_subject(subject_id)
+        # Estudiante: only grades of their own enrollment
+        grades = await GradeService(db).get_grades_by_estudiante_and_subject(current_user.id, subject_id)
         grade_ids = [grade.id for grade in grades]
         grades_with_enrollment = await grade_repo.get_many_with_relations(
             grade_ids=grade_ids,
@@ -114,7 +158,7 @@ async def get_grades(
     subject_id: int = Query(None, description="Filter by subject ID"),
     enrollment_id: int = Query(None, description="Filter by enrollment ID"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get grades.
     
@@ -147,7 +191,7 @@ async def get_grades(
 async def get_grade(
     grade_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get grade by ID."""
     grade_repo = GradeRepository(db)
@@ -175,26 +219,24 @@ async def update_grade(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin_or_profesor),
 ):
-    """Update grade (Profesor or Admin only)."""
-    grade_repo = GradeRepository(db)
+    """Update grade (Profesor or Admin only).
     
-    # Get existing grade to verify permissions
-    existing_grade = await grade_repo.get_by_id(grade_id)
-    if not existing_grade:
+    Authorizes with the grade's subject loaded in one query, then updates
+    with ``UPDATE ... RETURNING``; the loaded relationships are reused to
+    serialize the response.
+    """
+    # Load the grade with the owners needed for permissions and the response
+    grade = await GradeRepository(db).get_with_owners(grade_id)
+    if not grade:
         raise NotFoundError("Grade", grade_id)
     
     # Verify profesor permissions
     if current_user.role == UserRole.PROFESOR:
-        await GradeValidator.verify_profesor_subject_permission(
-            db, current_user, existing_grade.enrollment_id
-        )
+        GradeValidator.verify_profesor_grade_permission(current_user, grade)
     
     # Update grade using service (business logic)
     service = GradeService(db)
-    await service.update_grade(grade_id, grade_data)
-    
-    # Load updated grade with enrollment relationship
-    grade = await grade_repo.get_with_relations(grade_id)
+    grade = await service.update_grade(grade_id, grade_data)
     if not grade:
         raise NotFoundError("Grade", grade_id)
     
@@ -220,7 +262,7 @@ async def delete_grade(
     # Verify profesor permissions
     if current_user.role == UserRole.PROFESOR:
         await GradeValidator.verify_profesor_subject_permission(
-            db, current_user, existing_grade.enrollment_id
+            db, current_user, existing_grade.enrollment_id, for_write=True
         )
     
     # Delete grade using service (business logic)
@@ -3,6 +3,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
 from app.core.exceptions import NotFoundError, ValidationError
 from app.models.user import User, UserRole
 from app.schemas.user import UserResponse, UserUpdate
@@ -11,7 +12,7 @@ from app.services.estudiante_service import EstudianteService
 from app.services.user_service import UserService
 from app.api.v1.dependencies import get_current_active_user
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("", response_model=UserResponse)
@@ -3,6 +3,7 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
 from app.models.user import User
 from app.services.admin_service import AdminService
 from app.services.profesor_service import ProfesorService
@@ -14,13 +15,14 @@ from app.api.v1.dependencies import (
 )
 from app.api.v1.serializers.report_response_handler import ReportResponseHandler
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.get("/student/{estudiante_id}")
 async def get_student_report(
     estudiante_id: int,
     format: str = Query("json", description="Report format: pdf, html, json"),
+    stream: bool = Query(False, description="Stream the report as it renders (html only)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
@@ -28,7 +30,7 @@ async def get_student_report(
     admin_service = AdminService(db, current_user)
     
     try:
-        report = await admin_service.generate_student_report(estudiante_id, format)
+        report = await admin_service.generate_student_report(estudiante_id, format, stream=stream)
         return ReportResponseHandler.handle_response(report, format)
     except ValueError as e:
         error_type = "not_found" if "not found" in str(e).lower() else "validation"
@@ -39,6 +41,7 @@ async def get_student_report(
 async def get_subject_report(
     subject_id: int,
     format: str = Query("pdf", description="Report format: pdf, html, json"),
+    stream: bool = Query(False, description="Stream the report as it renders (html only)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_profesor),
 ):
@@ -46,7 +49,7 @@ async def get_subject_report(
     profesor_service = ProfesorService(db, current_user)
     
     try:
-        report = await profesor_service.generate_subject_report(subject_id, format)
+        report = await profesor_service.generate_subject_report(subject_id, format, stream=stream)
         return ReportResponseHandler.handle_response(report, format)
     except ValueError as e:
         error_type = "forbidden" if ("not found" in str(e).lower() or "not assigned" in str(e).lower()) else "validation"
@@ -56,12 +59,13 @@ async def get_subject_report(
 @router.get("/general")
 async def get_general_report(
     format: str = Query("pdf", description="Report format: pdf, html, json"),
+    stream: bool = Query(False, description="Stream the report as it renders (html only)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_estudiante),
 ):
     """Generate general report with all subjects (Estudiante only)."""
     estudiante_service = EstudianteService(db, current_user)
     
-    report = await estudiante_service.generate_general_report(format)
+    report = await estudiante_service.generate_general_report(format, stream=stream)
     return ReportResponseHandler.handle_response(report, format)
 
@@ -1,37 +1,38 @@
 """Subject endpoints - Refactored to use repository pattern and serializers."""
 
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
 from app.core.exceptions import NotFoundError, ValidationError, ForbiddenError
 from app.models.user import User, UserRole
 from app.models.subject import Subject
 from app.schemas.subject import SubjectCreate, SubjectUpdate, SubjectResponse
+from app.schemas.token import Principal
 from app.schemas.user import UserResponse
 from app.services.admin_service import AdminService
 from app.services.subject_service import SubjectService
-from app.services.profesor_service import ProfesorService
+from app.services.permission_service import PermissionService
 from app.services.user_service import UserService
 from app.repositories.subject_repository import SubjectRepository
 from app.repositories.enrollment_repository import EnrollmentRepository
-from app.api.v1.dependencies import require_admin, get_current_active_user
+from app.api.v1.dependencies import require_admin, get_current_principal, set_next_cursor
 from app.api.v1.serializers.subject_serializer import SubjectSerializer
 from app.api.v1.serializers.enrollment_serializer import EnrollmentSerializer
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 # ==================== Helper Functions ====================
 
 async def _get_subjects_for_profesor(
-    db: AsyncSession, current_user: User
+    db: AsyncSession, current_user: Principal
 ) -> List[SubjectResponse]:
     """Get subjects for profesor role."""
-    profesor_service = ProfesorService(db, current_user)
-    subjects = await profesor_service.get_assigned_subjects()
+    subjects = await SubjectRepository(db).get_by_profesor(current_user.id)
     
     # Si hay subjects, cargar relación profesor con eager loading
     if subjects:
@@ -48,25 +49,25 @@ async def _get_subjects_for_profesor(
 
 
 async def _get_subjects_for_admin(
-    db: AsyncSession, skip: int, limit: int
+    db: AsyncSession, response: Response, skip: int, limit: int, cursor: Optional[str]
 ) -> List[SubjectResponse]:
     """Get subjects for admin role."""
     # Usar eager loading para cargar relación profesor directamente
-    stmt = (
-        select(Subject)
-        .options(selectinload(Subject.profesor))
-        .offset(skip)
-        .limit(limit)
-    )
-    result = await db.execute(stmt)
-    subjects = list(result.scalars().all())
+    subject_repo = SubjectRepository(db)
+    try:
+        subjects, next_cursor = await subject_repo.get_page_with_profesor(
+            cursor=cursor, limit=limit, skip=skip
+        )
+    except ValueError as e:
+        raise ValidationError(str(e))
+    set_next_cursor(response, next_cursor)
     
     return SubjectSerializer.serialize_batch(subjects)
 
 
 async def _get_enrollments_for_role(
     db: AsyncSession,
-    current_user: User,
+    current_user: Principal,
     subject_id: int,
     is_profesor: bool
 ) -> List:
@@ -75,8 +76,9 @@ async def _get_enrollments_for_role(
     
     if is_profesor:
         # Profesor: verificar que la materia esté asignada
-        profesor_service = ProfesorService(db, current_user)
-        await profesor_service.get_students_by_subject(subject_id)
+        permissions = PermissionService(db)
+        if not await permissions.profesor_teaches(current_user.id, subject_id):
+            raise ValueError("Subject is not assigned to this profesor")
     
     enrollments = await enrollment_repo.get_many_with_relations(
         subject_id=subject_id,
@@ -87,27 +89,29 @@ async def _get_enrollments_for_role(
 
 async def _get_students_for_role(
     db: AsyncSession,
-    current_user: User,
+    current_user: Principal,
     subject_id: int,
     is_profesor: bool
 ) -> List[UserResponse]:
     """Get students for a subject based on user role."""
     if is_profesor:
-        profesor_service = ProfesorService(db, current_user)
-        students = await profesor_service.get_students_by_subject(subject_id)
-    else:
-        # Admin: obtener estudiantes usando eager loading (evita N+1 queries)
-        enrollment_repo = EnrollmentRepository(db)
-        enrollments = await enrollment_repo.get_many_with_relations(
-            subject_id=subject_id,
-            relations=['estudiante']  # Eager load estudiantes
-        )
-        # Extraer estudiantes de enrollments (ya cargados)
-        students = [
-            enrollment.estudiante 
-            for enrollment in enrollments 
-            if hasattr(enrollment, 'estudiante') and enrollment.estudiante
-        ]
+        # Profesor: verificar que la materia esté asignada
+        permissions = PermissionService(db)
+        if not await permissions.profesor_teaches(current_user.id, subject_id):
+            raise ValueError("Subject is not assigned to this profesor")
+    
+    # Obtener estudiantes usando eager loading (evita N+1 queries)
+    enrollment_repo = EnrollmentRepository(db)
+    enrollments = await enrollment_repo.get_many_with_relations(
+        subject_id=subject_id,
+        relations=['estudiante']  # Eager load estudiantes
+    )
+    # Extraer estudiantes de enrollments (ya cargados)
+    students = [
+        enrollment.estudiante 
+        for enrollment in enrollments 
+        if hasattr(enrollment, 'estudiante') and enrollment.estudiante
+    ]
     
     return [UserResponse.model_validate(student) for student in students]
 
@@ -125,7 +129,7 @@ async def create_subject(
     
     try:
         subject = await admin_service.create_subject(subject_data)
-        # El repositorio ya hace commit, solo necesitamos cargar la relación profesor
+        # La materia ya está en la sesión, solo necesitamos cargar la relación profesor
         # Usar eager loading en lugar de refresh manual
         stmt = (
             select(Subject)
@@ -148,10 +152,12 @@ async def create_subject(
 
 @router.get("", response_model=List[SubjectResponse])
 async def get_subjects(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get subjects.
     
@@ -161,7 +167,7 @@ async def get_subjects(
     if current_user.role == UserRole.PROFESOR:
         return await _get_subjects_for_profesor(db, current_user)
     elif current_user.role == UserRole.ADMIN:
-        return await _get_subjects_for_admin(db, skip, limit)
+        return await _get_subjects_for_admin(db, response, skip, limit, cursor)
     else:
         raise ForbiddenError("Not enough permissions")
 
@@ -170,7 +176,7 @@ async def get_subjects(
 async def get_subject_enrollments(
     subject_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get enrollments for a subject.
     
@@ -192,7 +198,7 @@ async def get_subject_enrollments(
 async def get_subject_students(
     subject_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """Get students enrolled in a subject.
     
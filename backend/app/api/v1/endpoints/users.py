@@ -1,17 +1,20 @@
 """User endpoints - Refactored to use services directly."""
 
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.logging import logger
 from app.models.user import User, UserRole
-from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.schemas.user import UserBulkResult, UserCreate, UserUpdate, UserResponse
 from app.services.admin_service import AdminService
 from app.services.user_service import UserService
-from app.api.v1.dependencies import require_admin
+from app.api.v1.dependencies import bulk_upload_error, require_admin, set_next_cursor
+from app.utils.bulk_ingest import BulkFormatError, iter_records
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -39,18 +42,61 @@ async def create_user(
         raise ValidationError(str(e))
 
 
+@router.post("/bulk", response_model=UserBulkResult)
+async def bulk_import_users(
+    request: Request,
+    response: Response,
+    dry_run: bool = Query(False, description="Validate and preview codes without creating users"),
+    atomic: bool = Query(True, description="Create nothing if any row fails validation"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin),
+):
+    """Import many estudiantes and profesores (Admin only).
+    
+    The body is a CSV document with a header row (``text/csv``) or a JSON
+    array of objects (``application/json``) with the user creation fields.
+    The response lists the institutional code assigned to each created
+    user. With ``atomic=true`` (default) a batch with any invalid row
+    creates nothing and responds 422.
+    """
+    def log_progress(stage: str, done: int, total: int) -> None:
+        logger.info(f"Bulk user import: {stage} {done}/{total}")
+    
+    user_service = UserService(db)
+    try:
+        result = await user_service.bulk_import_users(
+            iter_records(request.stream(), request.headers.get("content-type")),
+            dry_run=dry_run,
+            atomic=atomic,
+            progress=log_progress,
+        )
+    except BulkFormatError as e:
+        raise bulk_upload_error(request, e)
+    
+    if atomic and result.failed:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return result
+
+
 @router.get("", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
-    """Get all users (Admin only)."""
+    """Get all estudiantes and profesores ordered by ID (Admin only)."""
     user_service = UserService(db)
-    estudiantes = await user_service.get_users_by_role(UserRole.ESTUDIANTE.value, skip, limit)
-    profesores = await user_service.get_users_by_role(UserRole.PROFESOR.value, skip, limit)
-    return list(estudiantes) + list(profesores)
+    try:
+        users, next_cursor = await user_service.get_users_page(
+            [UserRole.ESTUDIANTE.value, UserRole.PROFESOR.value], cursor=cursor, skip=skip, limit=limit
+        )
+    except ValueError as e:
+        raise ValidationError(str(e))
+    set_next_cursor(response, next_cursor)
+    return users
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -4,11 +4,13 @@ from app.api.v1.serializers.grade_serializer import GradeSerializer
 from app.api.v1.serializers.enrollment_serializer import EnrollmentSerializer
 from app.api.v1.serializers.subject_serializer import SubjectSerializer
 from app.api.v1.serializers.report_response_handler import ReportResponseHandler
+from app.api.v1.serializers.relations import resolve_many_to_one
 
 __all__ = [
     "GradeSerializer",
     "EnrollmentSerializer",
     "SubjectSerializer",
     "ReportResponseHandler",
+    "resolve_many_to_one",
 ]
 
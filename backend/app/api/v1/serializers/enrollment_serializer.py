@@ -2,10 +2,10 @@
 
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from app.models.enrollment import Enrollment
 from app.models.user import User
 from app.models.subject import Subject
+from app.api.v1.serializers.relations import resolve_many_to_one
 from app.schemas.enrollment import (
     EnrollmentResponse,
     EstudianteInfo,
@@ -22,8 +22,9 @@ class EnrollmentSerializer:
     ) -> List[EnrollmentResponse]:
         """Serialize a batch of enrollments with efficient batch loading of relationships.
         
-        This method loads all estudiante and subject relationships in batches
-        to avoid N+1 queries.
+        Estudiante and subject relationships already loaded on the
+        enrollments are reused; missing ones are loaded in batches to avoid
+        N+1 queries.
         
         Args:
             enrollments: List of Enrollment entities to serialize
@@ -35,29 +36,9 @@ class EnrollmentSerializer:
         if not enrollments:
             return []
 
-        # Collect all unique estudiante_ids and subject_ids
-        unique_estudiante_ids = set()
-        unique_subject_ids = set()
-
-        for enrollment in enrollments:
-            unique_estudiante_ids.add(enrollment.estudiante_id)
-            unique_subject_ids.add(enrollment.subject_id)
-
-        # Batch load all estudiantes
-        estudiantes_map = {}
-        if unique_estudiante_ids:
-            estudiantes_stmt = select(User).where(User.id.in_(list(unique_estudiante_ids)))
-            estudiantes_result = await db.execute(estudiantes_stmt)
-            estudiantes_list = estudiantes_result.scalars().all()
-            estudiantes_map = {est.id: est for est in estudiantes_list}
-
-        # Batch load all subjects
-        subjects_map = {}
-        if unique_subject_ids:
-            subjects_stmt = select(Subject).where(Subject.id.in_(list(unique_subject_ids)))
-            subjects_result = await db.execute(subjects_stmt)
-            subjects_list = subjects_result.scalars().all()
-            subjects_map = {subj.id: subj for subj in subjects_list}
+        # Reuse eager-loaded relationships and batch load the missing ones
+        estudiantes_map = await resolve_many_to_one(db, enrollments, "estudiante", "estudiante_id", User)
+        subjects_map = await resolve_many_to_one(db, enrollments, "subject", "subject_id", Subject)
 
         # Serialize each enrollment using batch-loaded maps
         responses = []
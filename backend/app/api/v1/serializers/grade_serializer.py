@@ -2,10 +2,11 @@
 
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.models.enrollment import Enrollment
 from app.models.grade import Grade
 from app.models.user import User
 from app.models.subject import Subject
+from app.api.v1.serializers.relations import resolve_many_to_one
 from app.schemas.grade import (
     GradeResponse,
     EnrollmentInfo,
@@ -23,8 +24,9 @@ class GradeSerializer:
     ) -> List[GradeResponse]:
         """Serialize a batch of grades with efficient batch loading of relationships.
         
-        This method loads all estudiante and subject relationships in batches
-        to avoid N+1 queries.
+        Enrollment, estudiante and subject relationships already loaded on
+        the grades are reused; missing ones are loaded in batches to avoid
+        N+1 queries.
         
         Args:
             grades: List of Grade entities to serialize
@@ -36,30 +38,11 @@ class GradeSerializer:
         if not grades:
             return []
 
-        # Collect all unique estudiante_ids and subject_ids
-        unique_estudiante_ids = set()
-        unique_subject_ids = set()
-
-        for grade in grades:
-            if grade.enrollment:
-                unique_estudiante_ids.add(grade.enrollment.estudiante_id)
-                unique_subject_ids.add(grade.enrollment.subject_id)
-
-        # Batch load all estudiantes
-        estudiantes_map = {}
-        if unique_estudiante_ids:
-            estudiantes_stmt = select(User).where(User.id.in_(list(unique_estudiante_ids)))
-            estudiantes_result = await db.execute(estudiantes_stmt)
-            estudiantes_list = estudiantes_result.scalars().all()
-            estudiantes_map = {est.id: est for est in estudiantes_list}
-
-        # Batch load all subjects
-        subjects_map = {}
-        if unique_subject_ids:
-            subjects_stmt = select(Subject).where(Subject.id.in_(list(unique_subject_ids)))
-            subjects_result = await db.execute(subjects_stmt)
-            subjects_list = subjects_result.scalars().all()
-            subjects_map = {subj.id: subj for subj in subjects_list}
+        # Reuse eager-loaded relationships and batch load the missing ones
+        enrollments_map = await resolve_many_to_one(db, grades, "enrollment", "enrollment_id", Enrollment)
+        enrollments = list(enrollments_map.values())
+        estudiantes_map = await resolve_many_to_one(db, enrollments, "estudiante", "estudiante_id", User)
+        subjects_map = await resolve_many_to_one(db, enrollments, "subject", "subject_id", Subject)
 
         # Serialize each grade using batch-loaded maps
         responses = []
@@ -74,11 +57,12 @@ class GradeSerializer:
             }
 
             enrollment_info = None
-            if grade.enrollment:
+            enrollment = enrollments_map.get(grade.enrollment_id)
+            if enrollment:
                 # Get estudiante from batch-loaded map
                 estudiante_info = None
-                if grade.enrollment.estudiante_id in estudiantes_map:
-                    estudiante = estudiantes_map[grade.enrollment.estudiante_id]
+                if enrollment.estudiante_id in estudiantes_map:
+                    estudiante = estudiantes_map[enrollment.estudiante_id]
                     estudiante_info = EstudianteBasicInfo(
                         id=estudiante.id,
                         nombre=estudiante.nombre,
@@ -88,8 +72,8 @@ class GradeSerializer:
 
                 # Get subject from batch-loaded map
                 subject_info = None
-                if grade.enrollment.subject_id in subjects_map:
-                    subject = subjects_map[grade.enrollment.subject_id]
+                if enrollment.subject_id in subjects_map:
+                    subject = subjects_map[enrollment.subject_id]
                     subject_info = SubjectBasicInfo(
                         id=subject.id,
                         nombre=subject.nombre,
@@ -97,9 +81,9 @@ class GradeSerializer:
                     )
 
                 enrollment_info = EnrollmentInfo(
-                    id=grade.enrollment.id,
-                    estudiante_id=grade.enrollment.estudiante_id,
-                    subject_id=grade.enrollment.subject_id,
+                    id=enrollment.id,
+                    estudiante_id=enrollment.estudiante_id,
+                    subject_id=enrollment.subject_id,
                     estudiante=estudiante_info,
                     subject=subject_info,
                 )
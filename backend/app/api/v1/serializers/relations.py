@@ -0,0 +1,57 @@
+"""Relationship resolution shared by the batch serializers."""
+
+from typing import Any, Dict, Iterable, Type
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def resolve_many_to_one(
+    db: AsyncSession,
+    instances: Iterable[Any],
+    relation: str,
+    foreign_key: str,
+    model: Type[Any],
+) -> Dict[int, Any]:
+    """Map foreign key values to related objects, fetching only what is missing.
+
+    Relationships already loaded on an instance (e.g. by ``joinedload`` in
+    the repository) and matching its foreign key are reused; the remaining
+    keys are fetched with one ``SELECT ... WHERE id IN`` query. Unloaded
+    relationships are never accessed, so no lazy load is triggered.
+
+    Args:
+        db: Database session
+        instances: Objects holding the relationship
+        relation: Relationship attribute name (e.g. 'estudiante')
+        foreign_key: Foreign key attribute name (e.g. 'estudiante_id')
+        model: Related model class
+
+    Returns:
+        Mapping of foreign key value to related object
+    """
+    related: Dict[int, Any] = {}
+    missing = set()
+    for instance in instances:
+        key = getattr(instance, foreign_key)
+        if key is None:
+            continue
+        if relation in inspect(instance).unloaded:
+            missing.add(key)
+            continue
+        value = getattr(instance, relation)
+        if value is None:
+            continue
+        # A foreign key changed after the relationship was loaded points elsewhere
+        if value.id == key:
+            related[key] = value
+        else:
+            missing.add(key)
+
+    missing -= related.keys()
+    if missing:
+        result = await db.execute(select(model).where(model.id.in_(sorted(missing))))
+        related.update({obj.id: obj for obj in result.scalars().all()})
+    return related
+
+
+__all__ = ["resolve_many_to_one"]
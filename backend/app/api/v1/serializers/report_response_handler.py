@@ -1,8 +1,8 @@
 """Report response handler for different formats (JSON, PDF, HTML)."""
 
-import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator
 from fastapi import Response
+from fastapi.responses import StreamingResponse
 from app.core.exceptions import NotFoundError, ForbiddenError, ValidationError
 
 
@@ -15,7 +15,7 @@ class ReportResponseHandler:
         format: str,
         error: Exception = None,
         error_type: str = None,
-    ) -> Response | Dict[str, Any]:
+    ) -> Response:
         """Handle report response based on format.
         
         Args:
@@ -25,7 +25,9 @@ class ReportResponseHandler:
             error_type: Type of error ('not_found', 'forbidden', 'validation')
             
         Returns:
-            Response object for PDF/HTML or dict for JSON
+            Response object; JSON content is sent inline as generated, PDF and
+            HTML as attachments (StreamingResponse when the content is an
+            iterator of chunks)
             
         Raises:
             NotFoundError: If error_type is 'not_found'
@@ -44,22 +46,37 @@ class ReportResponseHandler:
 
         format_lower = format.lower()
 
-        # Handle JSON format
+        # Handle JSON format (already encoded by the generator)
         if format_lower == "json":
             content = report["content"]
-            if isinstance(content, bytes):
-                return json.loads(content.decode("utf-8"))
-            else:
-                return json.loads(content)
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            return Response(content=content, media_type=report["content_type"])
 
-        # Handle PDF and HTML formats
+        headers = {"Content-Disposition": f'attachment; filename="{report["filename"]}"'}
+
+        # Handle streamed content (iterator of str/bytes chunks)
         content = report["content"]
+        if not isinstance(content, (str, bytes)):
+            return StreamingResponse(
+                ReportResponseHandler._encode_chunks(content),
+                media_type=report["content_type"],
+                headers=headers,
+            )
+
+        # Handle PDF and HTML formats
         if isinstance(content, str):
             content = content.encode("utf-8")
 
         return Response(
             content=content,
             media_type=report["content_type"],
-            headers={"Content-Disposition": f'attachment; filename="{report["filename"]}"'},
+            headers=headers,
         )
 
+    @staticmethod
+    def _encode_chunks(chunks: Iterable[str | bytes]) -> Iterator[bytes]:
+        """Encode streamed report chunks as UTF-8 bytes."""
+        for chunk in chunks:
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
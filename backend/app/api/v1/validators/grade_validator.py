@@ -1,11 +1,11 @@
 """Grade validators for permission checks."""
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.grade import Grade
 from app.models.user import User
+from app.schemas.token import Principal
 from app.core.exceptions import NotFoundError, ForbiddenError
-from app.repositories.enrollment_repository import EnrollmentRepository
-from app.repositories.subject_repository import SubjectRepository
-from app.services.profesor_service import ProfesorService
+from app.services.permission_service import PermissionService
 
 
 class GradeValidator:
@@ -13,7 +13,7 @@ class GradeValidator:
 
     @staticmethod
     async def verify_profesor_subject_permission(
-        db: AsyncSession, current_user: User, enrollment_id: int
+        db: AsyncSession, current_user: User, enrollment_id: int, for_write: bool = False
     ) -> None:
         """Verify that a profesor has permission to access a subject via enrollment.
         
@@ -21,26 +21,39 @@ class GradeValidator:
             db: Database session
             current_user: Current profesor user
             enrollment_id: Enrollment ID to check
+            for_write: Confirm a cached assignment against the database
             
         Raises:
             NotFoundError: If enrollment not found
             ForbiddenError: If subject is not assigned to profesor
         """
-        enrollment_repo = EnrollmentRepository(db)
-        enrollment = await enrollment_repo.get_by_id(enrollment_id)
+        permissions = PermissionService(db)
+        subject_id = await permissions.get_enrollment_subject_id(enrollment_id)
 
-        if not enrollment:
+        if subject_id is None:
             raise NotFoundError("Enrollment", enrollment_id)
 
-        subject_repo = SubjectRepository(db)
-        subject = await subject_repo.get_by_id(enrollment.subject_id)
+        if not await permissions.profesor_teaches(current_user.id, subject_id, for_write):
+            raise ForbiddenError("Cannot access grade for unassigned subject")
 
-        if not subject or subject.profesor_id != current_user.id:
+    @staticmethod
+    def verify_profesor_grade_permission(current_user: User, grade: Grade) -> None:
+        """Verify that a profesor teaches the subject of an already loaded grade.
+        
+        Args:
+            current_user: Current profesor user
+            grade: Grade loaded with its enrollment and subject
+                (see ``GradeRepository.get_with_owners``)
+            
+        Raises:
+            ForbiddenError: If subject is not assigned to profesor
+        """
+        if grade.enrollment.subject.profesor_id != current_user.id:
             raise ForbiddenError("Cannot access grade for unassigned subject")
 
     @staticmethod
     async def verify_profesor_can_access_subject(
-        db: AsyncSession, current_user: User, subject_id: int
+        db: AsyncSession, current_user: Principal, subject_id: int
     ) -> None:
         """Verify that a profesor has access to a subject.
         
@@ -52,10 +65,7 @@ class GradeValidator:
         Raises:
             ForbiddenError: If subject is not assigned to profesor
         """
-        profesor_service = ProfesorService(db, current_user)
-        subjects = await profesor_service.get_assigned_subjects()
-        subject_ids = [s.id for s in subjects]
-
-        if subject_id not in subject_ids:
+        permissions = PermissionService(db)
+        if not await permissions.profesor_teaches(current_user.id, subject_id):
             raise ForbiddenError("Subject is not assigned to this profesor")
 
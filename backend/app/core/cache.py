@@ -0,0 +1,668 @@
+"""Async result cache with pluggable backends.
+
+``Cache.cached`` memoizes coroutine results. Keys are built from the bound
+arguments of the call with their types (``5`` and ``"5"`` differ), and
+``self``, ``cls`` and database sessions are left out, so every service
+instance shares the same entries. Concurrent misses on the same key run the
+loader once per process; the other callers wait for its result. Results
+of calls whose session reads from the read replica are never stored.
+
+Entries can carry tags (e.g. ``enrollment:42``). Invalidating a tag bumps
+its version in the backend, so every entry stored under an older version
+is treated as a miss from then on, in this worker and, with the shared
+backend, in every other one.
+
+Backends:
+
+- ``MemoryCacheBackend``: per-process LRU with TTL and an entry bound.
+- ``SharedCacheBackend``: values pickled into a Redis-compatible key-value
+  store shared by all workers. ``LocalKeyValueStore`` stands in for Redis
+  when no URL is configured (or the ``redis`` package is not installed).
+
+Cache plain, immutable data (numbers, tuples, pydantic models), never ORM
+instances bound to a session. The memory backend returns the cached object
+itself, so callers must not mutate it.
+"""
+
+import asyncio
+import fnmatch
+import functools
+import hashlib
+import inspect
+import pickle
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime, time as time_of_day
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.read_replica import reads_from_replica
+
+# Keys longer than this are replaced by their SHA-256 digest
+MAX_KEY_LENGTH = 200
+
+_SCALAR_TYPES = (bool, int, float, str, bytes, Decimal, type(None))
+
+# Stored value: (result, tag versions captured before the loader ran)
+Envelope = Tuple[Any, Dict[str, int]]
+
+
+def _key_part(value: Any) -> str:
+    """Encode a value for a cache key, keeping its type.
+
+    Raises:
+        TypeError: If the value has no stable representation
+    """
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}.{value.name}"
+    if isinstance(value, _SCALAR_TYPES):
+        return f"{type(value).__name__}:{value!r}"
+    if isinstance(value, (date, datetime, time_of_day)):
+        return f"{type(value).__name__}:{value.isoformat()}"
+    if isinstance(value, (tuple, list)):
+        return "[" + ",".join(_key_part(item) for item in value) + "]"
+    if isinstance(value, (set, frozenset)):
+        return "{" + ",".join(sorted(_key_part(item) for item in value)) + "}"
+    if isinstance(value, dict):
+        items = sorted(f"{_key_part(k)}={_key_part(v)}" for k, v in value.items())
+        return "{" + ",".join(items) + "}"
+    if isinstance(value, BaseModel):
+        return f"{type(value).__name__}:{value.model_dump_json()}"
+    raise TypeError(f"Cannot build a cache key from a {type(value).__name__} value")
+
+
+def make_key(namespace: str, /, *parts: Any, **named: Any) -> str:
+    """Build a cache key from a namespace and typed parts.
+
+    Args:
+        namespace: Key namespace (e.g. 'grades.average')
+        *parts: Scalars, dates, enums, pydantic models or containers of them
+        **named: Parts encoded with their name (e.g. the call arguments)
+
+    Returns:
+        Cache key
+
+    Raises:
+        TypeError: If a part has no stable representation
+    """
+    encoded = ",".join(
+        [_key_part(part) for part in parts]
+        + [f"{name}={_key_part(value)}" for name, value in named.items()]
+    )
+    if len(encoded) > MAX_KEY_LENGTH:
+        encoded = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    return f"{namespace}:{encoded}"
+
+
+def _is_context_argument(name: str, value: Any) -> bool:
+    """Tell whether an argument identifies the caller rather than the result."""
+    return name in ("self", "cls") or isinstance(value, (AsyncSession, Session))
+
+
+def call_session(signature: inspect.Signature, args: tuple, kwargs: dict) -> Optional[Any]:
+    """Find the database session a call reads through.
+
+    The session is either an argument of the call or the ``db`` attribute
+    of the service the method is bound to.
+
+    Args:
+        signature: Signature of the cached function
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+
+    Returns:
+        Session of the call, or None if it has none
+    """
+    bound = signature.bind(*args, **kwargs)
+    for name, value in bound.arguments.items():
+        if isinstance(value, (AsyncSession, Session)):
+            return value
+        if name in ("self", "cls") and isinstance(getattr(value, "db", None), (AsyncSession, Session)):
+            return value.db
+    return None
+
+
+def call_arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> Dict[str, Any]:
+    """Bind call arguments by name, without self, cls and sessions.
+
+    Positional and keyword forms of the same call give the same mapping.
+
+    Args:
+        signature: Signature of the cached function
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+
+    Returns:
+        Arguments that determine the result, in signature order
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return {
+        name: value
+        for name, value in bound.arguments.items()
+        if not _is_context_argument(name, value)
+    }
+
+
+class CacheBackend(ABC):
+    """Storage behind a ``Cache``."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Envelope]:
+        """Get a stored envelope, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, envelope: Envelope, ttl_seconds: float) -> None:
+        """Store an envelope for ttl_seconds."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Remove entries."""
+
+    @abstractmethod
+    async def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Get the current version of each tag (0 if never invalidated)."""
+
+    @abstractmethod
+    async def bump_tags(self, tags: Iterable[str]) -> None:
+        """Increment the version of each tag."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every entry and tag version."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend statistics."""
+        return {"backend": type(self).__name__}
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU cache with TTL and an entry bound."""
+
+    def __init__(self, max_entries: int):
+        """Initialize memory backend.
+
+        Args:
+            max_entries: Maximum number of cached entries
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Envelope, float]]" = OrderedDict()
+        self._tag_versions: Dict[str, int] = {}
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Optional[Envelope]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        envelope, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return envelope
+
+    async def set(self, key: str, envelope: Envelope, ttl_seconds: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (envelope, time.monotonic() + ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        return {tag: self._tag_versions.get(tag, 0) for tag in tags}
+
+    async def bump_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tag_versions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+        }
+
+
+class KeyValueClient(Protocol):
+    """Subset of the ``redis.asyncio.Redis`` API used by ``SharedCacheBackend``."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value, or None if missing or expired."""
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Get several values at once (None for missing keys)."""
+
+    async def set(self, key: str, value: bytes, px: Optional[int] = None) -> Any:
+        """Store a value, expiring after ``px`` milliseconds if given."""
+
+    async def delete(self, *keys: str) -> int:
+        """Remove keys and return how many existed."""
+
+    async def incr(self, key: str) -> int:
+        """Increment an integer value (created at 0) and return it."""
+
+    def scan_iter(self, match: Optional[str] = None) -> AsyncIterator[str]:
+        """Iterate over keys matching a glob pattern."""
+
+    async def aclose(self) -> None:
+        """Close the connection."""
+
+
+class LocalKeyValueStore:
+    """In-process stand-in for Redis implementing ``KeyValueClient``.
+
+    Lets the shared backend run in development and tests without a server;
+    it is not shared between processes.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+
+    def _live(self, key: str) -> Optional[bytes]:
+        """Return a value unless it is missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._live(key)
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self._live(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, px: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + px / 1000 if px is not None else None
+        self._data[key] = (value, expires_at)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        self._data[key] = (str(value).encode(), None)
+        return value
+
+    async def scan_iter(self, match: Optional[str] = None) -> AsyncIterator[str]:
+        for key in list(self._data):
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def aclose(self) -> None:
+        self._data.clear()
+
+
+class SharedCacheBackend(CacheBackend):
+    """Cache stored in a key-value server shared by all workers."""
+
+    def __init__(self, client: KeyValueClient, prefix: str = "cache:"):
+        """Initialize shared backend.
+
+        Args:
+            client: Redis client (``redis.asyncio.Redis``) or ``LocalKeyValueStore``
+            prefix: Prefix of every key written by this cache
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}entry:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    async def get(self, key: str) -> Optional[Envelope]:
+        raw = await self.client.get(self._entry_key(key))
+        return pickle.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, envelope: Envelope, ttl_seconds: float) -> None:
+        raw = pickle.dumps(envelope, protocol=pickle.HIGHEST_PROTOCOL)
+        await self.client.set(self._entry_key(key), raw, px=max(1, int(ttl_seconds * 1000)))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self._entry_key(key) for key in keys))
+
+    async def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = list(tags)
+        if not tags:
+            return {}
+        values = await self.client.mget([self._tag_key(tag) for tag in tags])
+        return {tag: int(value or 0) for tag, value in zip(tags, values)}
+
+    async def bump_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            await self.client.incr(self._tag_key(tag))
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "shared", "client": type(self.client).__name__}
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    """Mark a future's exception as retrieved when nobody else awaited it."""
+    if not future.cancelled():
+        future.exception()
+
+
+class Cache:
+    """Result cache with single-flight loading, tags and hit/miss metrics."""
+
+    def __init__(self, backend: CacheBackend, default_ttl_seconds: float):
+        """Initialize cache.
+
+        Args:
+            backend: Storage backend
+            default_ttl_seconds: TTL of entries stored without an explicit one
+                (0 disables caching)
+        """
+        self.backend = backend
+        self.default_ttl_seconds = default_ttl_seconds
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, namespace: str, event: str) -> None:
+        counters = self._counters.setdefault(
+            namespace, {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+        )
+        counters[event] += 1
+
+    async def _lookup(self, key: str, tags: List[str]) -> Tuple[bool, Any, Dict[str, int]]:
+        """Read an entry and the current versions of its tags.
+
+        Returns:
+            (found, value, current tag versions)
+        """
+        envelope = await self.backend.get(key)
+        versions = await self.backend.tag_versions(tags)
+        if envelope is None:
+            return False, None, versions
+        value, stored_versions = envelope
+        # Stale if any tag was invalidated after the value was loaded
+        if any(stored_versions.get(tag, 0) != version for tag, version in versions.items()):
+            return False, None, versions
+        return True, value, versions
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl_seconds: Optional[float] = None,
+        tags: Iterable[str] = (),
+        namespace: Optional[str] = None,
+        store: bool = True,
+    ) -> Any:
+        """Return a cached value or load it once for all concurrent callers.
+
+        Backend failures are logged and the loader result is returned
+        uncached; exceptions raised by the loader are never cached.
+        With ``store=False`` (loaders reading from a lagging replica) the
+        caller may use a cached or in-flight value, but its own result is
+        neither shared with concurrent callers nor stored.
+
+        Args:
+            key: Cache key (see ``make_key``)
+            loader: Coroutine factory computing the value on a miss
+            ttl_seconds: Entry lifetime (defaults to ``default_ttl_seconds``)
+            tags: Tags the value depends on
+            namespace: Metrics bucket (defaults to the key prefix)
+            store: Whether the loader result may be cached
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        ttl = self.default_ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return await loader()
+        namespace = namespace or key.split(":", 1)[0]
+        tags = sorted(set(tags))
+
+        try:
+            found, value, versions = await self._lookup(key, tags)
+        except Exception as e:
+            logger.warning(f"Cache lookup failed for {key}: {e}")
+            self._count(namespace, "errors")
+            return await loader()
+        if found:
+            self._count(namespace, "hits")
+            return value
+
+        # Another caller is already loading this key: wait for its result
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._count(namespace, "coalesced")
+            return await asyncio.shield(inflight)
+
+        self._count(namespace, "misses")
+        if not store:
+            return await loader()
+        value = await self._load_once(key, loader)
+        await self._store(key, value, versions, ttl, namespace)
+        return value
+
+    async def _load_once(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a loader, sharing its result with callers that arrive meanwhile.
+
+        Args:
+            key: Cache key
+            loader: Coroutine factory computing the value
+
+        Returns:
+            Loaded value
+        """
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    async def _store(self, key: str, value: Any, versions: Dict[str, int], ttl: float, namespace: str) -> None:
+        """Store a loaded value, logging backend failures.
+
+        Args:
+            key: Cache key
+            value: Loaded value
+            versions: Tag versions captured before loading
+            ttl: Entry lifetime
+            namespace: Metrics bucket
+        """
+        try:
+            # Versions captured before loading: a concurrent invalidation leaves this entry stale
+            await self.backend.set(key, (value, versions), ttl)
+        except Exception as e:
+            logger.warning(f"Cache store failed for {key}: {e}")
+            self._count(namespace, "errors")
+
+    def cached(
+        self,
+        namespace: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> Callable:
+        """Decorator caching the results of a coroutine function.
+
+        Args:
+            namespace: Key namespace (defaults to the function's qualified name)
+            ttl_seconds: Entry lifetime (defaults to the cache default)
+            tags: Tag templates formatted with the call arguments
+                (e.g. ``"enrollment:{enrollment_id}"``)
+
+        Usage:
+            @cache.cached(namespace="grades.average", tags=("enrollment:{enrollment_id}",))
+            async def calculate_average(self, enrollment_id: int) -> Decimal:
+                ...
+        """
+        tag_templates = tuple(tags)
+
+        def decorator(func: Callable) -> Callable:
+            signature = inspect.signature(func)
+            key_namespace = namespace or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs) -> Any:
+                arguments = call_arguments(signature, args, kwargs)
+                key = make_key(key_namespace, **arguments)
+                entry_tags = [template.format(**arguments) for template in tag_templates]
+                session = call_session(signature, args, kwargs)
+                return await self.get_or_load(
+                    key,
+                    lambda: func(*args, **kwargs),
+                    ttl_seconds=ttl_seconds,
+                    tags=entry_tags,
+                    namespace=key_namespace,
+                    store=session is None or not reads_from_replica(session),
+                )
+
+            setattr(wrapper, "cache_namespace", key_namespace)
+            return wrapper
+
+        return decorator
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """Invalidate every entry stored under any of the tags.
+
+        Args:
+            *tags: Tags to invalidate (e.g. 'enrollment:42')
+        """
+        if not tags:
+            return
+        try:
+            await self.backend.bump_tags(tags)
+        except Exception as e:
+            # A missed invalidation is bounded by the entry TTL
+            logger.error(f"Cache invalidation failed for {tags}: {e}")
+
+    async def delete(self, *keys: str) -> None:
+        """Remove entries by key.
+
+        Args:
+            *keys: Cache keys
+        """
+        await self.backend.delete(*keys)
+
+    async def clear(self) -> None:
+        """Remove every entry and reset the metrics."""
+        await self.backend.clear()
+        self._counters.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics, in total and per namespace.
+
+        Returns:
+            Dictionary with 'backend', 'totals' and 'namespaces'
+        """
+        totals = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+        for counters in self._counters.values():
+            for event, count in counters.items():
+                totals[event] += count
+        lookups = totals["hits"] + totals["misses"] + totals["coalesced"]
+        hit_ratio = round((totals["hits"] + totals["coalesced"]) / lookups, 4) if lookups else 0.0
+        return {
+            "backend": self.backend.stats(),
+            "totals": {**totals, "hit_ratio": hit_ratio},
+            "namespaces": {namespace: dict(counters) for namespace, counters in self._counters.items()},
+        }
+
+    async def close(self) -> None:
+        """Release backend resources."""
+        await self.backend.close()
+
+
+def create_cache_backend(
+    backend: str, max_entries: int, shared_url: str = ""
+) -> CacheBackend:
+    """Create the configured cache backend.
+
+    Args:
+        backend: 'memory' or 'shared'
+        max_entries: Entry bound of the memory backend
+        shared_url: Redis URL of the shared backend ('' uses the local stand-in)
+
+    Returns:
+        Cache backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend == "memory":
+        return MemoryCacheBackend(max_entries=max_entries)
+    if backend != "shared":
+        raise ValueError(f"Unknown cache backend '{backend}'; use 'memory' or 'shared'")
+    if shared_url:
+        try:
+            from redis import asyncio as redis_asyncio
+            return SharedCacheBackend(redis_asyncio.from_url(shared_url))
+        except ImportError:
+            logger.warning("redis is not installed; the shared cache uses an in-process store")
+    return SharedCacheBackend(LocalKeyValueStore())
+
+
+cache = Cache(
+    create_cache_backend(
+        settings.cache_backend,
+        max_entries=settings.cache_max_entries,
+        shared_url=settings.cache_shared_url,
+    ),
+    default_ttl_seconds=settings.cache_default_ttl_seconds,
+)
+
+
+__all__ = [
+    "Cache",
+    "CacheBackend",
+    "KeyValueClient",
+    "LocalKeyValueStore",
+    "MemoryCacheBackend",
+    "SharedCacheBackend",
+    "cache",
+    "call_arguments",
+    "call_session",
+    "create_cache_backend",
+    "make_key",
+]
@@ -12,11 +12,42 @@ class Settings(BaseSettings):
     # Database
     database_url: str
     database_url_sync: str
+    # Read replica for GET requests (empty = every query goes to database_url)
+    database_replica_url: str = ""
+    # Seconds a user's reads stay on the primary after they commit a write
+    replica_sticky_seconds: float = 5.0
+    # Log every SQL statement (independent of debug)
+    db_echo: bool = False
+    # Pool preset ("production", "development" or "pgbouncer"); the db_* values
+    # below override single preset entries when set
+    db_pool_preset: str = "production"
+    db_pool_size: Optional[int] = None
+    db_max_overflow: Optional[int] = None
+    db_pool_timeout_seconds: Optional[float] = None
+    db_pool_recycle_seconds: Optional[int] = None
+    db_pool_pre_ping: Optional[bool] = None
+    # PostgreSQL statement_timeout in milliseconds (0 = no limit)
+    db_statement_timeout_ms: Optional[int] = None
+    # Prepared statements cached per asyncpg connection (0 disables, needed behind PgBouncer)
+    db_prepared_statement_cache_size: Optional[int] = None
+    # SQLAlchemy compiled statement cache entries per engine
+    db_compiled_cache_size: int = 1000
+    # Worker processes serving the app (uvicorn/gunicorn WEB_CONCURRENCY), used to
+    # report the total number of connections the pools can open
+    web_concurrency: int = 1
 
     # Security
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+
+    # Authenticated principal cache (0 disables it)
+    principal_cache_ttl_seconds: float = 30.0
+    # Subjects assigned to each profesor, cached for permission checks (0 disables it)
+    permission_cache_ttl_seconds: float = 60.0
+    # Let read-only endpoints use the id and role claims of the token without
+    # loading the user; role changes then apply when the token expires
+    trust_token_claims: bool = False
     
     @field_validator('secret_key')
     @classmethod
@@ -51,6 +82,53 @@ class Settings(BaseSettings):
     default_page_size: int = 100
     max_page_size: int = 1000
 
+    # Bulk uploads (grades, enrollments, users)
+    bulk_upload_max_rows: int = 5000
+    bulk_insert_chunk_size: int = 500
+    # Worker processes hashing passwords of bulk user imports (0 = password hashing threads)
+    bulk_password_hash_workers: int = 2
+
+    # Password hashing (bcrypt runs in a bounded thread pool)
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+
+    # Report rendering (CPU-bound formats such as PDF)
+    # 0 workers renders in a background thread; > 0 uses a process pool
+    report_render_workers: int = 0
+    report_render_timeout_seconds: float = 30.0
+    report_render_max_pending: int = 32
+    # Pretty-print JSON reports (compact by default)
+    json_report_indent: bool = False
+
+    # Report cache (in-process, per worker)
+    report_cache_max_bytes: int = 64 * 1024 * 1024
+    report_cache_ttl_seconds: float = 120.0
+
+    # Result cache ("memory": per-worker LRU; "shared": Redis at cache_shared_url,
+    # or an in-process stand-in when the URL is empty)
+    cache_backend: str = "memory"
+    cache_shared_url: str = ""
+    cache_max_entries: int = 10000
+    # 0 disables the result cache
+    cache_default_ttl_seconds: float = 60.0
+
+    # Dashboard summary (result cache TTL and number of recent grades shown)
+    dashboard_cache_ttl_seconds: float = 30.0
+    dashboard_recent_grades: int = 10
+
+    # Per-request SQL statistics (Server-Timing header, logs, N+1 detection)
+    sql_instrumentation_enabled: bool = True
+    # Executions of one statement shape per request before it is flagged
+    sql_repeat_threshold: int = 10
+    # "warn" logs repeated statements, "raise" fails the request (tests)
+    sql_repeat_action: str = "warn"
+
+    # Expose /metrics (Prometheus text format, per worker); off by default
+    # because it reveals routes, latencies and pool saturation
+    metrics_enabled: bool = False
+    # Bearer token the scraper must send to /metrics (empty: no token required)
+    metrics_token: str = ""
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
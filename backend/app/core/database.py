@@ -1,35 +1,323 @@
 """Database configuration and session management."""
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from app.core.config import settings
+import time
+from typing import Any, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.selectable import CompoundSelect, Select
+from starlette.requests import Request
+from app.core.config import Settings, settings
+from app.core.logging import logger
+from app.core.metrics import db_pool_checkout_wait
+from app.core import unit_of_work
+from app.core.read_replica import READ_ONLY, REPLICA_BIND, WRITER, recent_writers, request_writer, wants_replica
 
-# Create async engine
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long each checkout waits for a connection.
+    
+    The wait includes opening a new connection when the pool has room for one.
+    """
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - started)
+
+
+# Pool presets; the db_* settings override single entries
+DB_POOL_PRESETS: Dict[str, Dict[str, Any]] = {
+    # Several workers against one PostgreSQL: fail fast when the pool is exhausted
+    "production": {
+        "pool_size": 10,
+        "max_overflow": 10,
+        "pool_timeout": 10.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 30000,
+        "prepared_statement_cache_size": 500,
+    },
+    "development": {
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 30.0,
+        "pool_recycle": 3600,
+        "pool_pre_ping": False,
+        "statement_timeout_ms": 0,
+        "prepared_statement_cache_size": 100,
+    },
+    # PgBouncer in transaction mode multiplexes server connections, so keep few
+    # client connections and no prepared statements
+    "pgbouncer": {
+        "pool_size": 5,
+        "max_overflow": 0,
+        "pool_timeout": 10.0,
+        "pool_recycle": 600,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 30000,
+        "prepared_statement_cache_size": 0,
+    },
+}
+
+_POOL_OVERRIDES = {
+    "pool_size": "db_pool_size",
+    "max_overflow": "db_max_overflow",
+    "pool_timeout": "db_pool_timeout_seconds",
+    "pool_recycle": "db_pool_recycle_seconds",
+    "pool_pre_ping": "db_pool_pre_ping",
+    "statement_timeout_ms": "db_statement_timeout_ms",
+    "prepared_statement_cache_size": "db_prepared_statement_cache_size",
+}
+
+
+def resolve_pool_config(config: Settings) -> Dict[str, Any]:
+    """Combine the configured pool preset with explicit overrides.
+    
+    Args:
+        config: Application settings
+    
+    Returns:
+        Pool configuration (keys of ``DB_POOL_PRESETS`` entries)
+    
+    Raises:
+        ValueError: If the preset is unknown
+    """
+    preset = DB_POOL_PRESETS.get(config.db_pool_preset)
+    if preset is None:
+        raise ValueError(
+            f"Unknown db_pool_preset '{config.db_pool_preset}'; use one of {', '.join(DB_POOL_PRESETS)}"
+        )
+    pool_config = dict(preset)
+    for key, setting_name in _POOL_OVERRIDES.items():
+        value = getattr(config, setting_name)
+        if value is not None:
+            pool_config[key] = value
+    return pool_config
+
+
+def engine_options(database_url: str, pool_config: Dict[str, Any], config: Settings) -> Dict[str, Any]:
+    """Build ``create_async_engine`` keyword arguments.
+    
+    SQLite keeps its default pool; pool, timeout and prepared statement
+    options only apply to server databases.
+    
+    Args:
+        database_url: Database URL
+        pool_config: Result of ``resolve_pool_config``
+        config: Application settings
+    
+    Returns:
+        Engine keyword arguments
+    """
+    options: Dict[str, Any] = {
+        "echo": config.db_echo,
+        "query_cache_size": config.db_compiled_cache_size,
+    }
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        return options
+    
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=pool_config["pool_size"],
+        max_overflow=pool_config["max_overflow"],
+        pool_timeout=pool_config["pool_timeout"],
+        pool_recycle=pool_config["pool_recycle"],
+        pool_pre_ping=pool_config["pool_pre_ping"],
+    )
+    if url.get_driver_name() == "asyncpg":
+        connect_args: Dict[str, Any] = {
+            "prepared_statement_cache_size": pool_config["prepared_statement_cache_size"],
+        }
+        if pool_config["statement_timeout_ms"]:
+            connect_args["server_settings"] = {"statement_timeout": str(pool_config["statement_timeout_ms"])}
+        options["connect_args"] = connect_args
+    return options
+
+
+def describe_pool(engine: AsyncEngine, pool_config: Dict[str, Any], workers: int) -> Dict[str, Any]:
+    """Describe the effective pool configuration of an engine.
+    
+    Args:
+        engine: Async engine
+        pool_config: Result of ``resolve_pool_config``
+        workers: Number of worker processes sharing the database
+    
+    Returns:
+        Dictionary with the pool class, sizes, timeouts and connection totals
+    """
+    pool = engine.sync_engine.pool
+    report: Dict[str, Any] = {
+        "backend": engine.url.get_backend_name(),
+        "pool_class": type(pool).__name__,
+        "compiled_cache_size": engine.sync_engine._compiled_cache.capacity
+        if engine.sync_engine._compiled_cache is not None else 0,
+        "workers": workers,
+    }
+    if not isinstance(pool, QueuePool):
+        return report
+    
+    per_worker = pool.size() + max(pool._max_overflow, 0)
+    report.update(
+        pool_size=pool.size(),
+        max_overflow=pool._max_overflow,
+        pool_timeout=pool.timeout(),
+        pool_recycle=pool._recycle,
+        pool_pre_ping=pool._pre_ping,
+        statement_timeout_ms=pool_config["statement_timeout_ms"],
+        prepared_statement_cache_size=pool_config["prepared_statement_cache_size"],
+        max_connections_per_worker=per_worker,
+        max_connections_total=per_worker * workers,
+    )
+    return report
+
+
+async def log_pool_report(
+    engine: AsyncEngine, pool_config: Dict[str, Any], workers: int, name: str = "primary"
+) -> Dict[str, Any]:
+    """Log the effective pool configuration at startup.
+    
+    On PostgreSQL the total is compared with the server's
+    ``max_connections``, which is what ends in ``QueuePool limit`` errors
+    and refused connections at peak.
+    
+    Args:
+        engine: Async engine
+        pool_config: Result of ``resolve_pool_config``
+        workers: Number of worker processes sharing the database
+        name: Engine name shown in the log ('primary' or 'replica')
+    
+    Returns:
+        The logged report (with 'server_max_connections' when available)
+    """
+    report = describe_pool(engine, pool_config, workers)
+    if report["backend"] == "postgresql" and "max_connections_total" in report:
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql("SHOW max_connections")
+                report["server_max_connections"] = int(result.scalar_one())
+        except Exception as e:
+            logger.warning(f"Could not read max_connections: {e}")
+    
+    logger.info(f"Database pool ({name}): " + " ".join(f"{key}={value}" for key, value in report.items()))
+    server_max = report.get("server_max_connections")
+    if server_max is not None and report["max_connections_total"] > server_max:
+        logger.warning(
+            f"Database pools can open {report['max_connections_total']} connections "
+            f"({workers} workers x {report['max_connections_per_worker']}) but the server "
+            f"allows {server_max}; lower db_pool_size/db_max_overflow or use PgBouncer"
+        )
+    return report
+
+
+# Session info key marking a session that wrote since its last commit
+_WROTE = "wrote"
+
+
+def _is_plain_select(clause: Any) -> bool:
+    """Check whether a statement can run on the replica (SELECT without FOR UPDATE)."""
+    return isinstance(clause, (Select, CompoundSelect)) and getattr(clause, "_for_update_arg", None) is None
+
+
+class RoutingSession(Session):
+    """Session sending the reads of read-only sessions to the replica.
+    
+    Sessions opened with ``READ_ONLY`` in their info run plain SELECTs on
+    the replica bound under ``REPLICA_BIND``; flushes, INSERT/UPDATE/DELETE
+    statements and anything else run on the primary. The first write pins
+    the session to the primary, and committing it marks the session's
+    ``WRITER`` in ``recent_writers`` so the writer's next requests read
+    their own changes. Without a replica every statement uses the primary.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get(REPLICA_BIND)
+        if replica is not None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info[_WROTE] = True
+                self.info[READ_ONLY] = False
+            elif self.info.get(READ_ONLY) and _is_plain_select(clause):
+                return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session: Session) -> None:
+    """Pin a writer's reads to the primary after a committed write."""
+    if session.info.pop(_WROTE, False) and session.info.get(WRITER):
+        recent_writers.mark(session.info[WRITER])
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_rolled_back_writes(session: Session) -> None:
+    """Rolled back writes do not make the replica stale."""
+    session.info.pop(_WROTE, None)
+
+
+def create_session_factory(
+    primary: AsyncEngine, replica: Optional[AsyncEngine] = None
+) -> async_sessionmaker:
+    """Create a session factory routing reads between a primary and a replica.
+    
+    Args:
+        primary: Engine of the primary database
+        replica: Engine of the read replica, if any
+    
+    Returns:
+        Async session factory using ``RoutingSession``
+    """
+    return async_sessionmaker(
+        primary,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        info={} if replica is None else {REPLICA_BIND: replica.sync_engine},
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+pool_config = resolve_pool_config(settings)
+
+# Create async engines
 engine = create_async_engine(
     settings.database_url,
-    echo=settings.debug,
     future=True,
+    **engine_options(settings.database_url, pool_config, settings),
 )
+replica_engine: Optional[AsyncEngine] = None
+if settings.database_replica_url:
+    replica_engine = create_async_engine(
+        settings.database_replica_url,
+        future=True,
+        **engine_options(settings.database_replica_url, pool_config, settings),
+    )
 
 # Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+AsyncSessionLocal = create_session_factory(engine, replica_engine)
 
 # Base class for models
 Base = declarative_base()
 
 
-async def get_db() -> AsyncSession:
-    """Dependency to get database session."""
-    async with AsyncSessionLocal() as session:
-        try:
+async def get_db(request: Request) -> AsyncSession:
+    """Dependency to get database session.
+    
+    The session is the request's unit of work: writes are flushed as they
+    happen and committed once when the request succeeds (rolled back if it
+    fails). With a replica configured, GET and HEAD requests read from it
+    unless the caller committed a write within ``replica_sticky_seconds``.
+    """
+    info: Dict[str, Any] = {}
+    if replica_engine is not None:
+        writer = request_writer(request)
+        info = {READ_ONLY: wants_replica(request, writer), WRITER: writer}
+    async with AsyncSessionLocal(info=info) as session:
+        async with unit_of_work.scope(session, request):
             yield session
-        finally:
-            await session.close()
-
-
@@ -209,62 +209,10 @@ def validate_not_none(*param_names: str):
     return decorator
 
 
-def cache_result(ttl_seconds: int = 300):
-    """Decorator to cache function results for a specified time.
-    
-    Note: This is a simple in-memory cache. For production, use Redis or similar.
-    
-    Args:
-        ttl_seconds: Time to live for cached results in seconds
-        
-    Usage:
-        @cache_result(ttl_seconds=60)
-        async def get_expensive_data(self):
-            # ... expensive operation
-    """
-    cache = {}
-    
-    def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        async def wrapper(*args, **kwargs) -> Any:
-            import hashlib
-            import json
-            
-            # Create cache key from function name and arguments
-            cache_key = f"{func.__name__}:{hashlib.md5(json.dumps(str(args) + str(kwargs), sort_keys=True).encode()).hexdigest()}"
-            
-            # Check if cached result exists and is still valid
-            if cache_key in cache:
-                result, timestamp = cache[cache_key]
-                if time.time() - timestamp < ttl_seconds:
-                    logger.debug(f"Cache hit for {func.__name__}")
-                    return result
-            
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            cache[cache_key] = (result, time.time())
-            
-            # Simple cache cleanup (remove expired entries)
-            if len(cache) > 1000:  # Prevent unbounded growth
-                current_time = time.time()
-                expired_keys = [
-                    k for k, (_, ts) in cache.items() 
-                    if current_time - ts >= ttl_seconds
-                ]
-                for k in expired_keys:
-                    del cache[k]
-            
-            return result
-        
-        return wrapper
-    return decorator
-
-
 __all__ = [
     "handle_service_errors",
     "handle_repository_errors",
     "log_execution_time",
     "retry_on_db_lock",
     "validate_not_none",
-    "cache_result",
 ]
@@ -47,3 +47,9 @@ class ConflictError(BaseAppException):
     def __init__(self, detail: str):
         super().__init__(detail=detail, status_code=status.HTTP_409_CONFLICT)
 
+
+class ServiceUnavailableError(BaseAppException):
+    """Exception for temporarily overloaded or timed out resources."""
+    
+    def __init__(self, detail: str = "Service temporarily unavailable"):
+        super().__init__(detail=detail, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
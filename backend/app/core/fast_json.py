@@ -0,0 +1,61 @@
+"""Fast JSON encoding (optional orjson).
+
+``dumps`` encodes straight to UTF-8 bytes with orjson when it is installed
+and falls back to the standard library otherwise, with the same output
+rules: compact separators, non-ASCII kept, dates as ISO 8601 and any other
+unknown value as its string form. ``FastJSONResponse`` renders responses
+with it and is the application's default response class.
+"""
+
+import json
+from datetime import date, datetime, time
+from types import ModuleType
+from typing import Any, Optional
+from fastapi.responses import JSONResponse
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:
+    # If orjson is not installed, use the standard library encoder
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode values the JSON encoder does not know."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps(value: Any, indent: bool = False) -> bytes:
+    """Encode a value as JSON.
+
+    Args:
+        value: Value to encode
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        encoded: bytes = orjson.dumps(value, default=_default, option=option)
+        return encoded
+    return json.dumps(
+        value,
+        ensure_ascii=False,
+        default=_default,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with ``dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+__all__ = ["FastJSONResponse", "dumps"]
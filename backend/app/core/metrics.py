@@ -0,0 +1,416 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Counters and histograms are plain dictionaries keyed by label values and
+updated under a per-metric lock (observations also come from hashing
+threads), so recording costs a few microseconds. Gauges that mirror the
+state of other components (database pool, caches, hashing pool) are read
+from callbacks only when ``/metrics`` is scraped.
+
+``MetricsMiddleware`` times every HTTP request by route template, method
+and role of the authenticated user. Metrics are per worker process; the
+scraper adds them up across workers.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+LabelValues = Tuple[str, ...]
+M = TypeVar("M", bound="Metric")
+
+# Request latency buckets in seconds (tail latency up to 10 s)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Report sizes in bytes
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value (integers without a decimal part)."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label(value: Any) -> str:
+    """Escape a label value (backslash, double quote and newline)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format a label set."""
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Metric(ABC):
+    """Base class of named metrics with a fixed set of label names."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        """Initialize metric.
+
+        Args:
+            name: Metric name
+            help_text: Description shown in the exposition
+            label_names: Names of the labels every sample carries
+        """
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def samples(self) -> Iterator[Tuple[str, LabelValues, float, Sequence[str]]]:
+        """Yield (sample name, label values, value, label names) tuples."""
+
+    def render(self) -> List[str]:
+        """Render the metric in the text exposition format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+        for sample_name, values, value, names in self.samples():
+            lines.append(f"{sample_name}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """Increase the counter of a label set.
+
+        Args:
+            *label_values: Values of the metric's labels, in order
+            amount: Increment
+        """
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        """Current value of a label set."""
+        return self._values.get(label_values, 0.0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for values, value in sorted(items):
+            yield self.name, values, value, self.label_names
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets per label set."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record an observation.
+
+        Args:
+            value: Observed value
+            *label_values: Values of the metric's labels, in order
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[label_values] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, *label_values: str) -> int:
+        """Number of observations of a label set."""
+        series = self._series.get(label_values)
+        return sum(series[0]) if series else 0
+
+    def total(self, *label_values: str) -> float:
+        """Sum of the observations of a label set."""
+        series = self._series.get(label_values)
+        return series[1][0] if series else 0.0
+
+    def samples(self):
+        with self._lock:
+            items = [(values, list(counts), total[0]) for values, (counts, total) in self._series.items()]
+        bucket_names = self.label_names + ("le",)
+        for values, counts, total in sorted(items):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", values + (_format_value(bound),), cumulative, bucket_names
+            yield f"{self.name}_sum", values, total, self.label_names
+            yield f"{self.name}_count", values, cumulative, self.label_names
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class CallbackGauge(Metric):
+    """Gauge whose samples are read from a callback at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        callback: Callable[[], Iterable[Tuple[LabelValues, float]]],
+        label_names: Sequence[str] = (),
+        type_name: str = "gauge",
+    ):
+        """Initialize callback gauge.
+
+        Args:
+            name: Metric name
+            help_text: Description shown in the exposition
+            callback: Returns (label values, value) pairs
+            label_names: Names of the labels every sample carries
+            type_name: Exposition type ('gauge', or 'counter' for totals kept elsewhere)
+        """
+        super().__init__(name, help_text, label_names)
+        self.callback = callback
+        self.type_name = type_name
+
+    def samples(self):
+        for values, value in self.callback():
+            yield self.name, tuple(values), value, self.label_names
+
+
+class MetricsRegistry:
+    """Set of metrics rendered together."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        """Add a metric (replacing one with the same name).
+
+        Args:
+            metric: Metric to expose
+
+        Returns:
+            The metric
+        """
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the text exposition format.
+
+        Callback failures are skipped so one component cannot break the scrape.
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            try:
+                lines.extend(metric.render())
+            except Exception:
+                continue
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Clear recorded counters and histograms (tests)."""
+        for metric in self._metrics.values():
+            if isinstance(metric, (Counter, Histogram)):
+                metric.reset()
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response body is sent",
+    ("method", "route", "role", "status"),
+))
+report_generation_duration = registry.register(Histogram(
+    "report_generation_seconds",
+    "Report rendering time by format",
+    ("format", "mode"),
+))
+report_size = registry.register(Histogram(
+    "report_size_bytes",
+    "Size of generated reports by format",
+    ("format",),
+    buckets=SIZE_BUCKETS,
+))
+report_bytes = registry.register(Counter(
+    "report_bytes_total",
+    "Bytes of generated reports by format",
+    ("format",),
+))
+password_hash_duration = registry.register(Histogram(
+    "password_hash_seconds",
+    "bcrypt hash and verify time, excluding queue wait",
+    ("operation",),
+))
+db_pool_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    (),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+))
+
+
+_request_role: ContextVar[Optional[Dict[str, str]]] = ContextVar("metrics_request_labels", default=None)
+
+
+def set_request_role(role: Any) -> None:
+    """Record the role of the authenticated user for the current request's metrics.
+
+    Args:
+        role: User role (enum or string)
+    """
+    labels = _request_role.get()
+    if labels is not None:
+        labels["role"] = getattr(role, "value", role) or "anonymous"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by route, method, role and status."""
+
+    def __init__(self, app):
+        """Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        labels = {"role": "anonymous"}
+        token = _request_role.set(labels)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_role.reset(token)
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners cannot blow up cardinality
+            route_label = getattr(route, "path", None) or "unmatched"
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope.get("method", ""),
+                route_label,
+                labels["role"],
+                f"{status_code // 100}xx",
+            )
+
+
+def _db_pool_samples() -> List[Tuple[LabelValues, float]]:
+    """Pool size, checked-out connections, overflow and utilisation of the engines."""
+    from app.core.database import engine
+
+    pool = engine.sync_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return []
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    return [
+        (("size",), pool.size()),
+        (("checked_out",), checked_out),
+        (("overflow",), max(pool.overflow(), 0)),
+        (("utilization",), checked_out / capacity if capacity else 0.0),
+    ]
+
+
+def _password_hash_pool_samples() -> List[Tuple[LabelValues, float]]:
+    """Queue figures of the password hashing pool."""
+    from app.core.security import password_hash_pool
+
+    stats = password_hash_pool.stats()
+    return [((name,), stats[name]) for name in ("pending", "completed", "rejected", "max_wait_seconds")]
+
+
+def _cache_samples(event: str) -> List[Tuple[LabelValues, float]]:
+    """Hits or misses of the result, report and principal caches."""
+    from app.core.cache import cache
+    from app.core.principal_cache import principal_cache
+    from app.core.report_cache import report_cache
+
+    totals = cache.stats()["totals"]
+    result = totals["hits"] + totals["coalesced"] if event == "hits" else totals["misses"]
+    return [
+        (("result",), result),
+        (("report",), getattr(report_cache, event)),
+        (("principal",), getattr(principal_cache, event)),
+    ]
+
+
+def _cache_ratio_samples() -> List[Tuple[LabelValues, float]]:
+    """Hit ratio of each cache."""
+    hits = dict(_cache_samples("hits"))
+    misses = dict(_cache_samples("misses"))
+    return [
+        (name, hits[name] / (hits[name] + misses[name]) if hits[name] + misses[name] else 0.0)
+        for name in hits
+    ]
+
+
+registry.register(CallbackGauge("db_pool_connections", "Database pool state", _db_pool_samples, ("state",)))
+registry.register(CallbackGauge(
+    "password_hash_pool", "Password hashing pool queue", _password_hash_pool_samples, ("figure",)
+))
+registry.register(CallbackGauge(
+    "cache_hits_total", "Cache hits by cache", lambda: _cache_samples("hits"), ("cache",), type_name="counter"
+))
+registry.register(CallbackGauge(
+    "cache_misses_total", "Cache misses by cache", lambda: _cache_samples("misses"), ("cache",), type_name="counter"
+))
+registry.register(CallbackGauge("cache_hit_ratio", "Cache hit ratio by cache", _cache_ratio_samples, ("cache",)))
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "CallbackGauge",
+    "Counter",
+    "Histogram",
+    "MetricsMiddleware",
+    "MetricsRegistry",
+    "db_pool_checkout_wait",
+    "http_request_duration",
+    "password_hash_duration",
+    "registry",
+    "report_bytes",
+    "report_generation_duration",
+    "report_size",
+    "set_request_role",
+]
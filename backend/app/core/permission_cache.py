@@ -0,0 +1,118 @@
+"""In-process cache of the subjects assigned to each profesor.
+
+Profesor permission checks on grade and subject endpoints only need to
+know whether a subject is assigned to the profesor. This cache keeps the
+set of assigned subject IDs per profesor for a short TTL, so repeated
+checks are set lookups. ``SubjectService`` invalidates the profesores
+involved when a subject is created, reassigned or deleted; changes made in
+other worker processes are bounded by the TTL for reads; a negative
+answer, and a positive one on write paths, is confirmed against the
+database by ``PermissionService``.
+"""
+
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+from app.core.config import settings
+
+
+class SubjectAssignmentCache:
+    """TTL cache of assigned subject IDs keyed by profesor ID."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        """Initialize assignment cache.
+
+        Args:
+            ttl_seconds: Maximum age of a cached assignment set (0 disables caching)
+            max_entries: Maximum number of cached profesores
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[int, Tuple[FrozenSet[int], float]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation.
+
+        Capture it before loading assignments and pass it to ``set`` so a
+        load that raced with an invalidation is not cached.
+        """
+        return self._generation
+
+    def get(self, profesor_id: int) -> Optional[FrozenSet[int]]:
+        """Get the cached subject IDs of a profesor.
+
+        Args:
+            profesor_id: Profesor user ID
+
+        Returns:
+            Assigned subject IDs, or None if missing or expired
+        """
+        entry = self._entries.get(profesor_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        subject_ids, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[profesor_id]
+            self.misses += 1
+            return None
+        self.hits += 1
+        return subject_ids
+
+    def set(self, profesor_id: int, subject_ids: Iterable[int], generation: int) -> None:
+        """Cache the subject IDs assigned to a profesor.
+
+        Args:
+            profesor_id: Profesor user ID
+            subject_ids: Assigned subject IDs
+            generation: Value of ``generation`` captured before the IDs were loaded
+        """
+        if self.ttl_seconds <= 0:
+            return
+        if generation != self._generation:
+            return
+        if profesor_id not in self._entries and len(self._entries) >= self.max_entries:
+            self._evict_expired()
+            if len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        self._entries[profesor_id] = (frozenset(subject_ids), time.monotonic())
+
+    def invalidate_profesores(self, *profesor_ids: Optional[int]) -> None:
+        """Drop the cached assignments of some profesores.
+
+        Args:
+            *profesor_ids: Profesor user IDs (None values are ignored)
+        """
+        self._generation += 1
+        for profesor_id in profesor_ids:
+            if profesor_id is not None:
+                self._entries.pop(profesor_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached assignments and statistics."""
+        self._generation += 1
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _evict_expired(self) -> None:
+        """Remove every expired entry."""
+        now = time.monotonic()
+        expired = [
+            profesor_id for profesor_id, (_, stored_at) in self._entries.items()
+            if now - stored_at > self.ttl_seconds
+        ]
+        for profesor_id in expired:
+            del self._entries[profesor_id]
+
+
+subject_assignment_cache = SubjectAssignmentCache(ttl_seconds=settings.permission_cache_ttl_seconds)
+
+
+__all__ = ["SubjectAssignmentCache", "subject_assignment_cache"]
@@ -0,0 +1,126 @@
+"""In-process cache for authenticated principals.
+
+``get_current_user`` resolves the JWT subject to a user row on every
+authenticated request. This cache keeps a snapshot of the user's column
+values keyed by token subject for a short TTL, so repeated requests with
+the same token skip the lookup. ``UserService`` invalidates entries when a
+user is updated or deleted; writes made in other worker processes are
+bounded by the TTL.
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import inspect
+from app.core.config import settings
+from app.models.user import User
+
+
+class PrincipalCache:
+    """TTL cache of user column snapshots keyed by token subject."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        """Initialize principal cache.
+
+        Args:
+            ttl_seconds: Maximum age of a cached principal (0 disables caching)
+            max_entries: Maximum number of cached principals
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._subjects_by_id: Dict[int, str] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation.
+
+        Capture it before loading a user and pass it to ``set`` so a lookup
+        that raced with an invalidation is not cached.
+        """
+        return self._generation
+
+    def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        """Get the cached column values for a token subject.
+
+        Args:
+            subject: Token subject (user email)
+
+        Returns:
+            Dictionary of user column values, or None if missing or expired
+        """
+        entry = self._entries.get(subject)
+        if entry is None:
+            self.misses += 1
+            return None
+        values, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            self._remove(subject)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return values
+
+    def set(self, subject: str, user: User, generation: Optional[int] = None) -> None:
+        """Cache a snapshot of a loaded user.
+
+        Args:
+            subject: Token subject (user email)
+            user: Loaded user instance
+            generation: Value of ``generation`` captured before the user was loaded
+        """
+        if self.ttl_seconds <= 0:
+            return
+        if generation is not None and generation != self._generation:
+            return
+        if subject not in self._entries and len(self._entries) >= self.max_entries:
+            self._evict_expired()
+            if len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        self._entries[subject] = (values, time.monotonic())
+        self._subjects_by_id[values["id"]] = subject
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop the cached principal of a user.
+
+        Args:
+            user_id: User ID
+        """
+        self._generation += 1
+        subject = self._subjects_by_id.get(user_id)
+        if subject is not None:
+            self._remove(subject)
+
+    def clear(self) -> None:
+        """Drop all cached principals."""
+        self._generation += 1
+        self._entries.clear()
+        self._subjects_by_id.clear()
+
+    def _remove(self, subject: str) -> None:
+        """Remove a cached principal and its ID index entry."""
+        entry = self._entries.pop(subject, None)
+        if entry is not None:
+            self._subjects_by_id.pop(entry[0]["id"], None)
+
+    def _evict_expired(self) -> None:
+        """Remove every expired principal."""
+        now = time.monotonic()
+        expired = [
+            subject for subject, (_, stored_at) in self._entries.items()
+            if now - stored_at > self.ttl_seconds
+        ]
+        for subject in expired:
+            self._remove(subject)
+
+
+principal_cache = PrincipalCache(ttl_seconds=settings.principal_cache_ttl_seconds)
+
+
+__all__ = ["PrincipalCache", "principal_cache"]
@@ -0,0 +1,156 @@
+"""Read-your-writes tracking for read-replica routing.
+
+When ``database_replica_url`` is set, sessions opened for GET requests read
+from the replica (see ``RoutingSession`` in ``app.core.database``). A
+replica lags behind the primary, so once a user commits a write their
+requests read from the primary for ``replica_sticky_seconds`` and see their
+own changes. Writers are identified by the subject of their bearer token
+and tracked per worker process; a user balanced onto another worker right
+after a write may read from the replica within the same window.
+
+Results read from the replica may be stale, so they must never fill the
+process-wide caches (results, reports, principals, permission sets):
+another request would otherwise serve the stale rows under a key that an
+invalidation has just refreshed. ``reads_from_replica`` tells cache users
+when to skip storing.
+"""
+
+import time
+from typing import Any, Dict, Optional
+from jose import JWTError, jwt
+from starlette.requests import Request
+from app.core.config import settings
+
+# Methods whose requests may read from the replica
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# Session info keys used by RoutingSession
+REPLICA_BIND = "replica_bind"
+READ_ONLY = "read_only"
+WRITER = "writer"
+
+
+class RecentWriters:
+    """Writers that committed within the stickiness window."""
+
+    def __init__(self, window_seconds: float, max_entries: int = 10000):
+        """Initialize recent writers.
+
+        Args:
+            window_seconds: Seconds a writer stays pinned to the primary (0 disables it)
+            max_entries: Maximum number of tracked writers
+        """
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._deadlines: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def mark(self, writer: str) -> None:
+        """Record that a writer committed a write.
+
+        Args:
+            writer: Writer key (token subject)
+        """
+        if self.window_seconds <= 0:
+            return
+        if writer not in self._deadlines and len(self._deadlines) >= self.max_entries:
+            self._evict_expired()
+            if len(self._deadlines) >= self.max_entries:
+                self._deadlines.pop(next(iter(self._deadlines)))
+        self._deadlines[writer] = time.monotonic() + self.window_seconds
+
+    def is_recent(self, writer: str) -> bool:
+        """Check whether a writer committed within the window.
+
+        Args:
+            writer: Writer key (token subject)
+
+        Returns:
+            True if the writer's reads must go to the primary
+        """
+        deadline = self._deadlines.get(writer)
+        if deadline is None:
+            return False
+        if time.monotonic() >= deadline:
+            self._deadlines.pop(writer, None)
+            return False
+        return True
+
+    def clear(self) -> None:
+        """Forget every writer."""
+        self._deadlines.clear()
+
+    def _evict_expired(self) -> None:
+        """Remove writers whose window has passed."""
+        now = time.monotonic()
+        for writer in [key for key, deadline in self._deadlines.items() if now >= deadline]:
+            del self._deadlines[writer]
+
+
+def request_writer(request: Request) -> Optional[str]:
+    """Get the writer key of a request.
+
+    The token is not verified here: the key only decides which database a
+    request reads from, and authentication still happens in the endpoint
+    dependencies.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Subject of the bearer token, or None for anonymous requests
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        subject = jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+    return subject if isinstance(subject, str) else None
+
+
+def wants_replica(request: Request, writer: Optional[str]) -> bool:
+    """Decide whether a request may read from the replica.
+
+    Args:
+        request: Incoming request
+        writer: Writer key of the request
+
+    Returns:
+        True for GET/HEAD requests whose caller has not written recently
+    """
+    if request.method not in READ_METHODS:
+        return False
+    return writer is None or not recent_writers.is_recent(writer)
+
+
+def reads_from_replica(session: Any) -> bool:
+    """Check whether a session's reads may come from the replica.
+
+    Args:
+        session: Database session (async or sync)
+
+    Returns:
+        True if the session is read-only and a replica is bound
+    """
+    info = session.info
+    return bool(info.get(READ_ONLY)) and info.get(REPLICA_BIND) is not None
+
+
+recent_writers = RecentWriters(window_seconds=settings.replica_sticky_seconds)
+
+
+__all__ = [
+    "READ_METHODS",
+    "READ_ONLY",
+    "REPLICA_BIND",
+    "WRITER",
+    "RecentWriters",
+    "reads_from_replica",
+    "recent_writers",
+    "request_writer",
+    "wants_replica",
+]
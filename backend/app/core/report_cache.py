@@ -0,0 +1,229 @@
+"""In-process cache for generated reports.
+
+Reports are keyed by (report kind, entity type, entity id, format, data
+version). Every write that changes the data behind a report (grades,
+enrollments, or the names of the students and subjects it lists) bumps
+the data version of the affected students and subjects, so stale entries
+can never be served again and are dropped right away. Entries also expire
+after a TTL, which bounds staleness for writes made in other worker
+processes.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from app.core.config import settings
+from app.core.logging import logger
+
+CacheKey = Tuple[str, str, int, str, int]
+
+# Data versions kept before versions of entities with no cached report are pruned
+MIN_TRACKED_VERSIONS = 1024
+
+
+def _report_size(report: Dict[str, Any]) -> int:
+    """Approximate memory size of a report in bytes."""
+    content = report.get("content", b"")
+    if isinstance(content, str):
+        return len(content.encode("utf-8"))
+    return len(content)
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    """Mark a future's exception as retrieved when nobody else awaited it."""
+    if not future.cancelled():
+        future.exception()
+
+
+class ReportCache:
+    """LRU report cache with a byte budget and single-flight generation."""
+    
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        """Initialize report cache.
+        
+        Args:
+            max_bytes: Maximum total size of cached report contents
+            ttl_seconds: Maximum age of a cached report
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[Dict[str, Any], int, float]]" = OrderedDict()
+        self._versions: Dict[Tuple[str, int], int] = {}
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def size(self) -> int:
+        """Total size in bytes of cached report contents."""
+        return self._size
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _make_key(self, kind: str, entity_type: str, entity_id: int, format: str) -> CacheKey:
+        """Build the cache key for the current data version of an entity."""
+        version = self._versions.get((entity_type, entity_id), 0)
+        return (kind, entity_type, entity_id, format.lower(), version)
+    
+    def _get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached report and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        report, _, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return report
+    
+    def _store(self, key: CacheKey, report: Dict[str, Any]) -> None:
+        """Store a report, evicting least recently used entries over budget."""
+        # Skip if the entity was invalidated while the report was being generated
+        if self._make_key(*key[:4]) != key:
+            return
+        size = _report_size(report)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (report, size, time.monotonic())
+        self._size += size
+        while self._size > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+    
+    def _remove(self, key: CacheKey) -> None:
+        """Remove an entry and release its bytes."""
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+    
+    async def get_or_generate(
+        self,
+        kind: str,
+        entity_type: str,
+        entity_id: int,
+        format: str,
+        generate: Callable[[], Awaitable[Dict[str, Any]]],
+        store: bool = True,
+    ) -> Dict[str, Any]:
+        """Return a cached report or generate it once for all concurrent callers.
+        
+        Reports generated with ``store=False`` (from replica reads) are
+        returned to the caller only, never cached or shared.
+        
+        Args:
+            kind: Report kind (e.g. 'student', 'general', 'subject')
+            entity_type: Entity whose data the report depends on ('estudiante' or 'subject')
+            entity_id: Entity ID
+            format: Report format (pdf, html, json)
+            generate: Coroutine factory that builds the report on a miss
+            store: Whether the generated report may be cached
+        
+        Returns:
+            Report dictionary with 'content', 'filename', and 'content_type'
+        """
+        key = self._make_key(kind, entity_type, entity_id, format)
+        
+        report = self._get(key)
+        if report is not None:
+            self.hits += 1
+            return report
+        
+        # Another request is already generating this report: wait for it
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+        
+        self.misses += 1
+        if not store:
+            return await generate()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        self._inflight[key] = future
+        try:
+            report = await generate()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        
+        self._store(key, report)
+        future.set_result(report)
+        return report
+    
+    def invalidate(self, entity_type: str, entity_id: int) -> None:
+        """Invalidate every cached report that depends on an entity.
+        
+        Args:
+            entity_type: 'estudiante' or 'subject'
+            entity_id: Entity ID
+        """
+        entity = (entity_type, entity_id)
+        self._versions[entity] = self._versions.get(entity, 0) + 1
+        stale_keys = [key for key in self._entries if key[1:3] == entity]
+        for key in stale_keys:
+            self._remove(key)
+        if stale_keys:
+            logger.debug(f"Invalidated {len(stale_keys)} cached reports for {entity_type} {entity_id}")
+        self._prune_versions()
+    
+    def invalidate_many(self, entity_type: str, entity_ids: Iterable[int]) -> None:
+        """Invalidate the cached reports of several entities of one type.
+        
+        Args:
+            entity_type: 'estudiante' or 'subject'
+            entity_ids: Entity IDs
+        """
+        for entity_id in entity_ids:
+            self.invalidate(entity_type, entity_id)
+    
+    def invalidate_enrollment(self, estudiante_id: int, subject_id: int) -> None:
+        """Invalidate reports of the student and subject behind an enrollment.
+        
+        Args:
+            estudiante_id: Estudiante user ID
+            subject_id: Subject ID
+        """
+        self.invalidate("estudiante", estudiante_id)
+        self.invalidate("subject", subject_id)
+    
+    def _prune_versions(self) -> None:
+        """Forget data versions of entities with no cached or in-flight report.
+        
+        A version only has to outlive the reports keyed by it: once none is
+        cached or being generated, restarting the entity at version 0 cannot
+        match a stale entry.
+        """
+        if len(self._versions) <= max(MIN_TRACKED_VERSIONS, 2 * len(self._entries)):
+            return
+        live = {key[1:3] for key in self._entries}
+        live.update(key[1:3] for key in self._inflight)
+        self._versions = {
+            entity: version for entity, version in self._versions.items() if entity in live
+        }
+    
+    def clear(self) -> None:
+        """Remove all cached reports and statistics."""
+        self._entries.clear()
+        self._versions.clear()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+
+report_cache = ReportCache(
+    max_bytes=settings.report_cache_max_bytes,
+    ttl_seconds=settings.report_cache_ttl_seconds,
+)
+
+
+__all__ = ["ReportCache", "report_cache"]
@@ -1,10 +1,20 @@
 """Security utilities for authentication and authorization."""
 
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, TypeVar
 from jose import JWTError, jwt
 import bcrypt
 from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.core.logging import logger
+from app.core.metrics import password_hash_duration
+
+T = TypeVar("T")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -48,6 +58,301 @@ def get_password_hash(password: str) -> str:
     return hashed.decode('utf-8')
 
 
+class PasswordHashPool:
+    """Bounded thread pool for bcrypt work.
+    
+    bcrypt releases the GIL while hashing, so a small thread pool keeps the
+    event loop responsive while hashes run in parallel. Jobs beyond
+    ``max_pending`` are rejected instead of queueing without limit, and the
+    time each job spends waiting for a free worker is recorded. A job keeps
+    its slot until the thread finishes it, even if its caller was cancelled.
+    
+    Attributes:
+        max_workers: Number of hashing threads
+        max_pending: Maximum number of jobs queued or running at once
+        completed: Number of jobs that have started running
+        rejected: Number of jobs rejected because the queue was full
+        total_wait_seconds: Accumulated queue wait of started jobs
+        max_wait_seconds: Longest queue wait observed
+    """
+    
+    def __init__(self, max_workers: int = 4, max_pending: int = 64):
+        """Initialize password hash pool.
+        
+        Args:
+            max_workers: Number of hashing threads
+            max_pending: Maximum number of jobs queued or running at once
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        if max_pending < 1:
+            raise ValueError("max_pending must be positive")
+        
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+    
+    @property
+    def pending(self) -> int:
+        """Number of jobs currently queued or running."""
+        return self._pending
+    
+    @property
+    def average_wait_seconds(self) -> float:
+        """Average queue wait of started jobs."""
+        return self.total_wait_seconds / self.completed if self.completed else 0.0
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+    
+    def _record_wait(self, wait_seconds: float) -> None:
+        """Record the queue wait of a job that just started.
+        
+        Args:
+            wait_seconds: Time between submission and start
+        """
+        with self._stats_lock:
+            self.completed += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+    
+    def _release(self, job: Future) -> None:
+        """Free the queue slot of a finished job (runs in the completing thread).
+        
+        Args:
+            job: Executor future of the job
+        """
+        with self._pending_lock:
+            self._pending -= 1
+    
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a bcrypt function in the pool.
+        
+        Args:
+            func: Blocking function to run
+            *args: Positional arguments for the function
+        
+        Returns:
+            Result of the function
+        
+        Raises:
+            ServiceUnavailableError: If too many jobs are already pending
+        """
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                logger.warning(f"Password hashing queue full ({self._pending} pending), rejecting job")
+                raise ServiceUnavailableError("Authentication is busy, please try again later")
+            self._pending += 1
+        
+        submitted_at = time.perf_counter()
+        operation = getattr(func, "__name__", "bcrypt").lstrip("_")
+        
+        def job() -> T:
+            started_at = time.perf_counter()
+            self._record_wait(started_at - submitted_at)
+            try:
+                return func(*args)
+            finally:
+                password_hash_duration.observe(time.perf_counter() - started_at, operation)
+        
+        try:
+            future = self._get_executor().submit(job)
+        except BaseException:
+            with self._pending_lock:
+                self._pending -= 1
+            raise
+        # The slot is held until the job itself ends, not until the caller gives up
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get a snapshot of pool metrics.
+        
+        Returns:
+            Dictionary with pending, completed, rejected and queue wait figures
+        """
+        return {
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "average_wait_seconds": self.average_wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+    
+    def shutdown(self) -> None:
+        """Shut down hashing threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop.
+    
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+    
+    Returns:
+        True if password matches, False otherwise
+    
+    Raises:
+        ServiceUnavailableError: If the hashing queue is full
+    """
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop.
+    
+    Args:
+        password: Plain text password
+    
+    Returns:
+        Hashed password as string
+    
+    Raises:
+        ValueError: If password is empty
+        ServiceUnavailableError: If the hashing queue is full
+    """
+    if not password:
+        raise ValueError("password cannot be empty")
+    return await password_hash_pool.run(get_password_hash, password)
+
+
+def _hash_password_chunk(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords (runs inside a bulk hashing worker).
+    
+    Args:
+        passwords: Plain text passwords
+    
+    Returns:
+        Hashed passwords, in the same order
+    """
+    return [get_password_hash(password) for password in passwords]
+
+
+class BulkPasswordHasher:
+    """Process pool that hashes the passwords of a bulk import.
+    
+    A cohort import hashes thousands of passwords at once. Sending them to
+    worker processes in chunks spreads the bcrypt cost over every core
+    without occupying the request-path ``password_hash_pool``.
+    
+    Attributes:
+        max_workers: Number of worker processes (0 hashes in the password_hash_pool threads)
+        chunk_size: Passwords sent to a worker per job
+    """
+    
+    def __init__(self, max_workers: int = 2, chunk_size: int = 25):
+        """Initialize bulk password hasher.
+        
+        Args:
+            max_workers: Number of worker processes (0 hashes in the password_hash_pool threads)
+            chunk_size: Passwords sent to a worker per job
+        """
+        if max_workers < 0:
+            raise ValueError("max_workers must be non-negative")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the process pool, creating it on first use."""
+        if self._executor is None:
+            # spawn avoids forking a process that already runs event loop threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+    
+    def _max_in_flight(self) -> int:
+        """Number of chunks submitted at once.
+        
+        In the shared ``password_hash_pool`` a bulk import may use at most
+        its threads and a quarter of its queue, leaving room for logins.
+        """
+        if self.max_workers == 0:
+            return max(1, min(password_hash_pool.max_workers, password_hash_pool.max_pending // 4))
+        return self.max_workers * 2
+    
+    async def hash_all(
+        self,
+        passwords: List[str],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[str]:
+        """Hash many passwords in parallel.
+        
+        Args:
+            passwords: Plain text passwords (none may be empty)
+            progress: Called with (hashed, total) as chunks finish
+        
+        Returns:
+            Hashed passwords, in the same order
+        
+        Raises:
+            ValueError: If a password is empty
+        """
+        if any(not password for password in passwords):
+            raise ValueError("password cannot be empty")
+        chunks = [
+            passwords[start:start + self.chunk_size]
+            for start in range(0, len(passwords), self.chunk_size)
+        ]
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(self._max_in_flight())
+        
+        async def run_chunk(chunk: List[str]) -> List[str]:
+            async with in_flight:
+                if self.max_workers == 0:
+                    return await password_hash_pool.run(_hash_password_chunk, chunk)
+                return await loop.run_in_executor(self._get_executor(), _hash_password_chunk, chunk)
+        
+        tasks = [asyncio.ensure_future(run_chunk(chunk)) for chunk in chunks]
+        try:
+            hashed = 0
+            for finished in asyncio.as_completed(tasks):
+                hashed += len(await finished)
+                if progress:
+                    progress(hashed, len(passwords))
+        finally:
+            for task in tasks:
+                task.cancel()
+        return [hashed_password for task in tasks for hashed_password in task.result()]
+    
+    def shutdown(self) -> None:
+        """Shut down worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+bulk_password_hasher = BulkPasswordHasher(max_workers=settings.bulk_password_hash_workers)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token.
     
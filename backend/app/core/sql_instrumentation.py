@@ -0,0 +1,223 @@
+"""Per-request SQL instrumentation and N+1 detection.
+
+Cursor execution hooks on every SQLAlchemy ``Engine`` record each statement
+into the ``QueryStats`` of the current request (held in a context variable,
+so concurrent requests never mix). Statements are grouped by shape: the SQL
+text with literals removed and expanded ``IN`` lists collapsed, so the same
+query issued for different IDs counts as one repeated shape.
+
+``SQLInstrumentationMiddleware`` opens a ``QueryStats`` per HTTP request,
+adds a ``Server-Timing`` header (``db`` time and query count, ``app`` time
+until the response started) and logs the numbers. When a request runs one
+shape more than ``sql_repeat_threshold`` times (an N+1 pattern) it logs a
+warning, or raises ``RepeatedQueryError`` when ``sql_repeat_action`` is
+'raise' (used by the test suite).
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.logging import logger
+
+_PLACEHOLDER = r"(?:\?|\$\d+|%\(\w+\)s|%s|:\w+)"
+_SHAPE_RULES = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\$\d+"), "?"),
+    (re.compile(r"%\(\w+\)s|%s"), "?"),
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)"), "(?)"),
+    (re.compile(r"\s+"), " "),
+]
+
+# Statement shapes shown in logs and errors
+_MAX_REPORTED_SHAPES = 3
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so executions with different values compare equal.
+
+    Args:
+        statement: SQL text as sent to the driver
+
+    Returns:
+        Statement with literals and placeholders replaced by '?' and IN lists collapsed
+    """
+    shape = statement
+    for pattern, replacement in _SHAPE_RULES:
+        shape = pattern.sub(replacement, shape)
+    return shape.strip()
+
+
+class RepeatedQueryError(AssertionError):
+    """Raised when a request repeats a statement shape too often (N+1)."""
+
+
+class QueryStats:
+    """Statements executed within one request (or ``track_queries`` block)."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        """Record one executed statement.
+
+        Args:
+            statement: SQL text as sent to the driver
+            duration: Execution time in seconds
+        """
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Find statement shapes executed more than a threshold.
+
+        Args:
+            threshold: Maximum executions allowed per shape
+
+        Returns:
+            (shape, executions) pairs, most repeated first
+        """
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    @property
+    def max_repeat(self) -> int:
+        """Executions of the most repeated statement shape."""
+        return max(self.shapes.values(), default=0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Summary for structured logs."""
+        return {
+            "queries": self.count,
+            "db_ms": round(self.duration * 1000, 2),
+            "distinct_shapes": len(self.shapes),
+            "max_repeat": self.max_repeat,
+        }
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Statistics of the request being handled, or None outside a request."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements executed in a block (and the tasks it spawns).
+
+    Usage:
+        with track_queries() as stats:
+            await service.generate_report(...)
+        assert not stats.repeated(settings.sql_repeat_threshold)
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Remember when a statement started, if a request is being tracked."""
+    if _current_stats.get() is not None:
+        conn.info.setdefault("sql_instrumentation_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Record a finished statement into the current request's statistics."""
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("sql_instrumentation_start")
+    if starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def _describe_repeats(repeats: List[Tuple[str, int]]) -> str:
+    """Format repeated shapes for a log line or error message."""
+    return "; ".join(f"{count}x {shape[:200]}" for shape, count in repeats[:_MAX_REPORTED_SHAPES])
+
+
+class SQLInstrumentationMiddleware:
+    """ASGI middleware reporting the SQL statements of every HTTP request."""
+
+    def __init__(self, app):
+        """Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.sql_instrumentation_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_queries() as stats:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    app_ms = (time.perf_counter() - started) * 1000
+                    server_timing = (
+                        f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", '
+                        f"app;dur={app_ms:.2f}"
+                    )
+                    message.setdefault("headers", []).append(
+                        (b"server-timing", server_timing.encode("latin-1"))
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+        self._report(scope, stats, time.perf_counter() - started)
+
+    def _report(self, scope, stats: QueryStats, elapsed: float) -> None:
+        """Log the request's SQL statistics and flag repeated statements.
+
+        Raises:
+            RepeatedQueryError: If a shape exceeds the threshold and the action is 'raise'
+        """
+        summary = {
+            "method": scope.get("method"),
+            "path": scope.get("path"),
+            "duration_ms": round(elapsed * 1000, 2),
+            **stats.as_dict(),
+        }
+        message = " ".join(f"{key}={value}" for key, value in summary.items())
+        repeats = stats.repeated(settings.sql_repeat_threshold)
+        if not repeats:
+            logger.debug(f"sql_stats {message}", extra={"sql_stats": summary})
+            return
+
+        detail = (
+            f"{summary['method']} {summary['path']} repeated a statement more than "
+            f"{settings.sql_repeat_threshold} times: {_describe_repeats(repeats)}"
+        )
+        if settings.sql_repeat_action == "raise":
+            raise RepeatedQueryError(detail)
+        logger.warning(f"sql_stats {message} n_plus_one: {detail}", extra={"sql_stats": summary})
+
+
+__all__ = [
+    "QueryStats",
+    "RepeatedQueryError",
+    "SQLInstrumentationMiddleware",
+    "current_query_stats",
+    "statement_shape",
+    "track_queries",
+]
@@ -0,0 +1,164 @@
+"""Request-scoped unit of work.
+
+``get_db`` opens every request's session as a unit of work: repositories
+and services only flush their writes, and the request commits once after
+the endpoint returns, or rolls back if anything raises. Multi-step and
+bulk operations therefore cost a single transaction.
+
+- Repositories and services call ``commit`` instead of
+  ``session.commit()``; outside a unit of work (scripts, services used
+  directly) it still commits immediately.
+- Cache invalidations go through ``after_commit`` so they run once the
+  data is committed; invalidating earlier would let a concurrent request
+  re-cache the rows that are about to change.
+- ``UnitOfWorkRoute`` commits before the response is sent. FastAPI runs
+  the code after ``yield`` in dependencies only once the response is out,
+  so committing there would report success before the data is durable.
+"""
+
+import inspect
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+# Session.info keys
+UNIT_OF_WORK = "unit_of_work"
+_AFTER_COMMIT = "after_commit"
+_PENDING_WRITES = "pending_writes"
+
+
+def in_unit_of_work(session: AsyncSession) -> bool:
+    """Check whether a session belongs to a request's unit of work."""
+    return bool(session.info.get(UNIT_OF_WORK))
+
+
+async def commit(session: AsyncSession) -> None:
+    """Commit a session's writes, or only flush them inside a unit of work.
+
+    Args:
+        session: Database session
+    """
+    if in_unit_of_work(session):
+        await session.flush()
+    else:
+        await session.commit()
+
+
+async def after_commit(session: AsyncSession, callback: Callable[..., Any], *args: Any) -> None:
+    """Run a callback once the session's writes are committed.
+
+    Inside a unit of work the callback waits for the request's commit and
+    is dropped if the request rolls back; otherwise the caller has already
+    committed and it runs immediately.
+
+    Args:
+        session: Database session
+        callback: Function or coroutine function
+        *args: Arguments of the callback
+    """
+    if in_unit_of_work(session):
+        session.info.setdefault(_AFTER_COMMIT, []).append((callback, args))
+        return
+    await _run(callback, args)
+
+
+async def complete(session: AsyncSession) -> None:
+    """Commit a unit of work and run its after-commit callbacks.
+
+    Args:
+        session: Database session
+    """
+    if session.in_transaction():
+        await session.commit()
+    for callback, args in session.info.pop(_AFTER_COMMIT, []):
+        await _run(callback, args)
+
+
+@asynccontextmanager
+async def scope(session: AsyncSession, request: Optional[Request] = None) -> AsyncIterator[AsyncSession]:
+    """Run a session as a unit of work, committing once at the end.
+
+    Args:
+        session: Database session
+        request: Request whose ``UnitOfWorkRoute`` commits before responding
+
+    Yields:
+        The session
+    """
+    session.info[UNIT_OF_WORK] = True
+    if request is not None:
+        request.state.db_session = session
+    try:
+        yield session
+        await complete(session)
+    except Exception:
+        # A request that failed before writing has nothing to undo
+        if session.info.get(_PENDING_WRITES):
+            await session.rollback()
+        raise
+    finally:
+        session.info.pop(UNIT_OF_WORK, None)
+
+
+class UnitOfWorkRoute(APIRoute):
+    """Route committing the request's unit of work before the response is sent."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            response = await handler(request)
+            session = getattr(request.state, "db_session", None)
+            if session is not None and in_unit_of_work(session):
+                await complete(session)
+            return response
+
+        return route_handler
+
+
+async def _run(callback: Callable[..., Any], args: tuple) -> None:
+    """Call a callback, awaiting it if it is a coroutine function."""
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        await result
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context: Any) -> None:
+    """Remember that the transaction holds flushed writes."""
+    session.info[_PENDING_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(orm_execute_state: ORMExecuteState) -> None:
+    """Remember that the transaction holds INSERT/UPDATE/DELETE statements."""
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_PENDING_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_committed_writes(session: Session) -> None:
+    """Committed writes no longer need a rollback."""
+    session.info.pop(_PENDING_WRITES, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit_callbacks(session: Session) -> None:
+    """Rolled back writes leave the caches valid."""
+    session.info.pop(_PENDING_WRITES, None)
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+__all__ = [
+    "UNIT_OF_WORK",
+    "UnitOfWorkRoute",
+    "after_commit",
+    "commit",
+    "complete",
+    "in_unit_of_work",
+    "scope",
+]
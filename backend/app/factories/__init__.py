@@ -9,6 +9,7 @@ from app.factories.report_factory import (
     ReportGenerator,
     ReportFormat,
 )
+from app.factories.render_pool import ReportRenderPool
 
 # Import generators to trigger registration via decorators
 from app.factories.pdf_generator import PDFReportGenerator  # noqa: F401
@@ -19,6 +20,7 @@ __all__ = [
     "ReportFactory",
     "ReportGenerator",
     "ReportFormat",
+    "ReportRenderPool",
     "PDFReportGenerator",
     "HTMLReportGenerator",
     "JSONReportGenerator",
@@ -2,25 +2,12 @@
 
 from typing import Dict, Any
 from datetime import datetime
-from jinja2 import Template
+from jinja2 import Environment
 from app.factories.report_factory import ReportGenerator, ReportFactory
 
 
-@ReportFactory.register('html')
-class HTMLReportGenerator(ReportGenerator):
-    """HTML report generator implementation."""
-    
-    def generate(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate an HTML report from data.
-        
-        Args:
-            data: Report data dictionary
-        
-        Returns:
-            Dictionary with HTML content, filename, and content_type
-        """
-        # HTML template
-        template_str = """
+# HTML template
+_TEMPLATE_SOURCE = """
 <!DOCTYPE html>
 <html lang="es">
 <head>
@@ -190,33 +177,73 @@ class HTMLReportGenerator(ReportGenerator):
 </body>
 </html>
         """
+
+# Compiled once at import; every request reuses the same Template object
+_ENVIRONMENT = Environment(auto_reload=False)
+REPORT_TEMPLATE = _ENVIRONMENT.from_string(_TEMPLATE_SOURCE)
+
+# Number of template chunks grouped into each streamed write
+STREAM_BUFFER_SIZE = 64
+
+
+@ReportFactory.register('html')
+class HTMLReportGenerator(ReportGenerator):
+    """HTML report generator implementation."""
+    
+    supports_streaming = True
+    
+    def generate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate an HTML report from data.
         
-        template = Template(template_str)
-        timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        Args:
+            data: Report data dictionary
         
-        html_content = template.render(
-            estudiante=data.get("estudiante"),
-            subject=data.get("subject"),
-            subjects=data.get("subjects", []),
-            students=data.get("students", []),
-            timestamp=timestamp,
-        )
+        Returns:
+            Dictionary with HTML content, filename, and content_type
+        """
+        html_content = REPORT_TEMPLATE.render(**self._build_context(data))
+        
+        return {
+            "content": html_content,
+            "filename": self._build_filename(data),
+            "content_type": "text/html",
+        }
+    
+    def generate_stream(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate an HTML report whose content is rendered lazily in chunks.
         
-        # Generate filename
+        Args:
+            data: Report data dictionary
+        
+        Returns:
+            Dictionary with an iterator of HTML chunks as content, filename, and content_type
+        """
+        stream = REPORT_TEMPLATE.stream(**self._build_context(data))
+        stream.enable_buffering(STREAM_BUFFER_SIZE)
+        
+        return {
+            "content": iter(stream),
+            "filename": self._build_filename(data),
+            "content_type": "text/html",
+        }
+    
+    def _build_context(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build template variables from report data."""
+        return {
+            "estudiante": data.get("estudiante"),
+            "subject": data.get("subject"),
+            "subjects": data.get("subjects", []),
+            "students": data.get("students", []),
+            "timestamp": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+        }
+    
+    def _build_filename(self, data: Dict[str, Any]) -> str:
+        """Build the download filename for report data."""
         timestamp_file = datetime.now().strftime("%Y%m%d_%H%M%S")
         if "estudiante" in data:
             codigo = data["estudiante"].get("codigo_institucional", "report")
-            filename = f"reporte_estudiante_{codigo}_{timestamp_file}.html"
+            return f"reporte_estudiante_{codigo}_{timestamp_file}.html"
         elif "subject" in data:
             codigo = data["subject"].get("codigo_institucional", "report")
-            filename = f"reporte_materia_{codigo}_{timestamp_file}.html"
-        else:
-            filename = f"reporte_{timestamp_file}.html"
-        
-        return {
-            "content": html_content,
-            "filename": filename,
-            "content_type": "text/html",
-        }
-
-
+            return f"reporte_materia_{codigo}_{timestamp_file}.html"
+        return f"reporte_{timestamp_file}.html"
@@ -1,8 +1,9 @@
 """JSON report generator."""
 
-import json
 from typing import Dict, Any
 from datetime import datetime
+from app.core.config import settings
+from app.core.fast_json import dumps
 from app.factories.report_factory import ReportGenerator, ReportFactory
 
 
@@ -17,7 +18,7 @@ class JSONReportGenerator(ReportGenerator):
             data: Report data dictionary
         
         Returns:
-            Dictionary with JSON content, filename, and content_type
+            Dictionary with JSON content (UTF-8 bytes), filename, and content_type
         """
         # Add metadata
         report_data = {
@@ -28,8 +29,8 @@ class JSONReportGenerator(ReportGenerator):
             **data,
         }
         
-        # Convert to JSON string
-        json_content = json.dumps(report_data, indent=2, ensure_ascii=False, default=str)
+        # Encode once; the bytes are sent as they are
+        json_content = dumps(report_data, indent=settings.json_report_indent)
         
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -15,6 +15,9 @@ from app.factories.report_factory import ReportGenerator, ReportFactory
 class PDFReportGenerator(ReportGenerator):
     """PDF report generator implementation."""
     
+    # ReportLab layout is CPU-bound; render outside the event loop
+    offload = True
+    
     def generate(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a PDF report from data.
         
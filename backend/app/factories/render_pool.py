@@ -0,0 +1,136 @@
+"""Rendering backend for CPU-bound report generators.
+
+Generators such as PDF spend the whole request building the document in
+pure Python. Running them directly inside an async endpoint blocks the
+event loop, so this module moves the work to a process pool (or a worker
+thread when no processes are configured) with a bounded queue and a
+per-job timeout. A timed-out job keeps its queue slot until the worker
+actually finishes it, so the bound holds under sustained slow renders.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Optional
+from app.core.exceptions import ServiceUnavailableError
+from app.core.logging import logger
+
+
+def _render_in_worker(format_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Render a report with the registered generator (runs inside the worker).
+    
+    Args:
+        format_name: Registered report format
+        data: Report data dictionary
+    
+    Returns:
+        Dictionary with 'content', 'filename', and 'content_type'
+    """
+    from app.factories import ReportFactory  # Import from __init__.py to ensure generators are registered
+    
+    return ReportFactory.create_generator(format_name).generate(data)
+
+
+class ReportRenderPool:
+    """Bounded rendering backend for report generators.
+    
+    Attributes:
+        max_workers: Number of worker processes (0 renders in a thread)
+        timeout_seconds: Maximum time to wait for a single job
+        max_pending: Maximum number of jobs queued or running at once
+    """
+    
+    def __init__(self, max_workers: int = 0, timeout_seconds: float = 30.0, max_pending: int = 32):
+        """Initialize render pool.
+        
+        Args:
+            max_workers: Number of worker processes (0 renders in a thread)
+            timeout_seconds: Maximum time to wait for a single job
+            max_pending: Maximum number of jobs queued or running at once
+        """
+        if max_workers < 0:
+            raise ValueError("max_workers must be non-negative")
+        if max_pending < 1:
+            raise ValueError("max_pending must be positive")
+        
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+    
+    @property
+    def pending(self) -> int:
+        """Number of jobs currently queued or running."""
+        return self._pending
+    
+    def _get_executor(self) -> Executor:
+        """Get the executor, creating it on first use.
+        
+        Returns:
+            Process pool executor, or a thread pool when max_workers is 0
+        """
+        if self._executor is None:
+            if self.max_workers == 0:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="report-render")
+            else:
+                # spawn avoids forking a process that already runs event loop threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+        return self._executor
+    
+    def _release(self, job: Future) -> None:
+        """Free the queue slot of a finished job (runs in the completing thread).
+        
+        Args:
+            job: Executor future of the job
+        """
+        with self._pending_lock:
+            self._pending -= 1
+    
+    async def render(self, format_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Render a report without blocking the event loop.
+        
+        Args:
+            format_name: Registered report format
+            data: Report data dictionary (must be picklable)
+        
+        Returns:
+            Dictionary with 'content', 'filename', and 'content_type'
+        
+        Raises:
+            ServiceUnavailableError: If the queue is full or the job times out
+        """
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                logger.warning(f"Report render queue full ({self._pending} pending), rejecting {format_name} job")
+                raise ServiceUnavailableError("Report rendering is busy, please try again later")
+            self._pending += 1
+        
+        try:
+            job = self._get_executor().submit(_render_in_worker, format_name, data)
+        except BaseException:
+            with self._pending_lock:
+                self._pending -= 1
+            raise
+        # The slot is held until the job itself ends, not until the request gives up
+        job.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            # A queued job is cancelled; a running one finishes in the background
+            logger.warning(f"Report rendering for {format_name} exceeded {self.timeout_seconds}s")
+            raise ServiceUnavailableError("Report rendering timed out")
+    
+    def shutdown(self) -> None:
+        """Shut down worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+__all__ = ["ReportRenderPool"]
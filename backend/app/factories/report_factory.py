@@ -4,14 +4,17 @@ This implementation follows the Open/Closed Principle (OCP) by allowing
 new report formats to be registered without modifying the factory.
 """
 
+import time
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Dict, Any, Type, TYPE_CHECKING
+from typing import Dict, Any, Iterable, Iterator, Optional, Type, TYPE_CHECKING
+from app.core.metrics import report_bytes, report_generation_duration, report_size
 
 if TYPE_CHECKING:
     from app.factories.pdf_generator import PDFReportGenerator
     from app.factories.html_generator import HTMLReportGenerator
     from app.factories.json_generator import JSONReportGenerator
+    from app.factories.render_pool import ReportRenderPool
 
 
 class ReportFormat(str, Enum):
@@ -24,6 +27,13 @@ class ReportFormat(str, Enum):
 class ReportGenerator(ABC):
     """Abstract base class for report generators."""
     
+    # Set by ReportFactory.register
+    format_name: str = ""
+    # CPU-bound generators render in the ReportFactory render pool
+    offload: bool = False
+    # Generators that can yield their content incrementally
+    supports_streaming: bool = False
+    
     @abstractmethod
     def generate(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a report from data.
@@ -35,6 +45,79 @@ class ReportGenerator(ABC):
             Dictionary with 'content', 'filename', and 'content_type'
         """
         pass
+    
+    async def generate_async(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate a report without blocking the event loop.
+        
+        Generators with ``offload = True`` are rendered in the render pool;
+        cheap generators run inline.
+        
+        Args:
+            data: Report data dictionary
+        
+        Returns:
+            Dictionary with 'content', 'filename', and 'content_type'
+        """
+        if not self.offload:
+            return self.generate(data)
+        return await ReportFactory.get_render_pool().render(self.format_name, data)
+    
+    def generate_stream(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate a report whose content is an iterator of chunks.
+        
+        Generators without streaming support return the full content.
+        
+        Args:
+            data: Report data dictionary
+        
+        Returns:
+            Dictionary with 'content', 'filename', and 'content_type'
+        """
+        return self.generate(data)
+    
+    async def render(self, data: Dict[str, Any], stream: bool = False) -> Dict[str, Any]:
+        """Generate a report and record its rendering time and size.
+        
+        Streamed content is measured as it is consumed, so the recorded
+        time covers the whole stream.
+        
+        Args:
+            data: Report data dictionary
+            stream: Return content as an iterator of chunks when the format supports it
+        
+        Returns:
+            Dictionary with 'content', 'filename', and 'content_type'
+        """
+        started = time.perf_counter()
+        if stream and self.supports_streaming:
+            report = self.generate_stream(data)
+            report["content"] = self._measure_stream(report["content"], started)
+            return report
+        
+        report = await self.generate_async(data)
+        self._record(time.perf_counter() - started, _content_size(report["content"]), "full")
+        return report
+    
+    def _measure_stream(self, chunks: Iterable[Any], started: float) -> Iterator[Any]:
+        """Pass chunks through, recording metrics when the stream ends."""
+        size = 0
+        for chunk in chunks:
+            size += _content_size(chunk)
+            yield chunk
+        self._record(time.perf_counter() - started, size, "stream")
+    
+    def _record(self, seconds: float, size: int, mode: str) -> None:
+        """Record one generated report."""
+        report_generation_duration.observe(seconds, self.format_name, mode)
+        report_size.observe(size, self.format_name)
+        report_bytes.inc(self.format_name, amount=size)
+
+
+def _content_size(content: Any) -> int:
+    """Size in bytes of report content or a content chunk."""
+    if isinstance(content, str):
+        return len(content.encode("utf-8"))
+    return len(content)
 
 
 class ReportFactory:
@@ -46,6 +129,7 @@ class ReportFactory:
     
     _registry: Dict[str, Type[ReportGenerator]] = {}
     _instances: Dict[str, ReportGenerator] = {}  # Cache for singleton instances
+    _render_pool: Optional["ReportRenderPool"] = None
     
     @classmethod
     def register(cls, format_name: str) -> callable:
@@ -61,6 +145,7 @@ class ReportFactory:
         """
         def decorator(generator_class: Type[ReportGenerator]) -> Type[ReportGenerator]:
             cls._registry[format_name.lower()] = generator_class
+            generator_class.format_name = format_name.lower()
             return generator_class
         return decorator
     
@@ -104,5 +189,32 @@ class ReportFactory:
             List of format names
         """
         return list(cls._registry.keys())
-
-
+    
+    @classmethod
+    def get_render_pool(cls) -> "ReportRenderPool":
+        """Get the shared render pool, creating it from settings on first use.
+        
+        Returns:
+            Render pool used by offloaded generators
+        """
+        if cls._render_pool is None:
+            from app.core.config import settings
+            from app.factories.render_pool import ReportRenderPool
+            
+            cls._render_pool = ReportRenderPool(
+                max_workers=settings.report_render_workers,
+                timeout_seconds=settings.report_render_timeout_seconds,
+                max_pending=settings.report_render_max_pending,
+            )
+        return cls._render_pool
+    
+    @classmethod
+    def set_render_pool(cls, render_pool: Optional["ReportRenderPool"]) -> None:
+        """Replace the shared render pool, shutting down the previous one.
+        
+        Args:
+            render_pool: New render pool, or None to recreate from settings
+        """
+        if cls._render_pool is not None and cls._render_pool is not render_pool:
+            cls._render_pool.shutdown()
+        cls._render_pool = render_pool
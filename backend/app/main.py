@@ -1,19 +1,49 @@
 """Main FastAPI application."""
 
+import secrets
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.cache import cache
 from app.core.config import settings
+from app.core.database import engine, log_pool_report, pool_config, replica_engine
 from app.core.exceptions import BaseAppException
+from app.core.fast_json import FastJSONResponse
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, registry as metrics_registry
+from app.core.sql_instrumentation import SQLInstrumentationMiddleware
 from app.core.rate_limit import ENABLE_RATE_LIMITING, limiter, RateLimitExceededException
 from app.api.v1 import api_router
+from app.api.v1.dependencies import NEXT_CURSOR_HEADER
+from app.core.security import bulk_password_hasher, password_hash_pool
+from app.factories import ReportFactory
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks."""
+    # Report the effective pool so connections per worker can be sized
+    await log_pool_report(engine, pool_config, settings.web_concurrency)
+    if replica_engine is not None:
+        await log_pool_report(replica_engine, pool_config, settings.web_concurrency, name="replica")
+    yield
+    # Stop report rendering workers
+    ReportFactory.set_render_pool(None)
+    # Stop password hashing threads and bulk hashing processes
+    password_hash_pool.shutdown()
+    bulk_password_hasher.shutdown()
+    # Close the result cache backend connection
+    await cache.close()
+
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     debug=settings.debug,
     description="Sistema de Información Académica SOFKA U - API Backend",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS - Must be added before routers
@@ -28,9 +58,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # Listed explicitly: browsers ignore the "*" wildcard on credentialed requests
+    expose_headers=[NEXT_CURSOR_HEADER, "Content-Disposition", "Server-Timing"],
 )
 
+# Count SQL statements per request (Server-Timing header and N+1 warnings)
+app.add_middleware(SQLInstrumentationMiddleware)
+# Request latency by route and role (outermost, so it times the whole stack)
+app.add_middleware(MetricsMiddleware)
+
 # Configure rate limiting (only if enabled)
 if ENABLE_RATE_LIMITING and limiter is not None:
     try:
@@ -78,3 +114,23 @@ async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Metrics of this worker in the Prometheus text format.
+    
+    Disabled unless ``METRICS_ENABLED`` is set; with ``METRICS_TOKEN`` the
+    scraper must send it as a bearer token.
+    """
+    if not settings.metrics_enabled:
+        return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content={"detail": "Not Found"})
+    if settings.metrics_token:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not secrets.compare_digest(token, settings.metrics_token):
+            return JSONResponse(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                content={"detail": "Not authenticated"},
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    return Response(content=metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
@@ -4,5 +4,7 @@ from app.models.user import User, UserRole
 from app.models.subject import Subject
 from app.models.enrollment import Enrollment
 from app.models.grade import Grade
+from app.models.enrollment_grade_stats import EnrollmentGradeStats
+from app.models.code_counter import CodeCounter
 
-__all__ = ["User", "UserRole", "Subject", "Enrollment", "Grade"]
+__all__ = ["User", "UserRole", "Subject", "Enrollment", "Grade", "EnrollmentGradeStats", "CodeCounter"]
@@ -0,0 +1,18 @@
+"""Institutional code counter model."""
+
+from sqlalchemy import Column, Integer, String
+from app.core.database import Base
+
+
+class CodeCounter(Base):
+    """Last sequential number handed out for a code prefix and year.
+    
+    Users are keyed by role prefix and year (``EST``, 2024); subjects have
+    no year in their code and use year 0.
+    """
+    
+    __tablename__ = "code_counters"
+    
+    prefix = Column(String(10), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
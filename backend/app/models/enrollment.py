@@ -13,7 +13,7 @@ class Enrollment(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     estudiante_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False)
+    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False, index=True)
     
     # Timestamps
     created_at = Column(
@@ -29,6 +29,7 @@ class Enrollment(Base):
     )
     
     # Unique constraint: a student can only be enrolled once per subject
+    # (its leading estudiante_id column also indexes lookups by student)
     __table_args__ = (
         UniqueConstraint("estudiante_id", "subject_id", name="uq_enrollment"),
     )
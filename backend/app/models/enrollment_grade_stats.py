@@ -0,0 +1,33 @@
+"""Enrollment grade statistics model."""
+
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class EnrollmentGradeStats(Base):
+    """Materialized grade aggregates of one enrollment.
+    
+    Kept current by GradeStatsRepository in the same transaction as every
+    grade write. Enrollments without grades have no row.
+    """
+    
+    __tablename__ = "enrollment_grade_stats"
+    
+    enrollment_id = Column(
+        Integer,
+        ForeignKey("enrollments.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    grade_count = Column(Integer, nullable=False)
+    grade_sum = Column(Numeric(12, 2), nullable=False)
+    grade_avg = Column(Numeric(7, 4), nullable=False)
+    grade_min = Column(Numeric(3, 2), nullable=False)
+    grade_max = Column(Numeric(3, 2), nullable=False)
+    
+    last_updated = Column(
+        DateTime,
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
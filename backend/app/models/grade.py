@@ -1,6 +1,6 @@
 """Grade model."""
 
-from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, Text, DateTime
+from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -31,6 +31,12 @@ class Grade(Base):
         nullable=False
     )
     
+    # (enrollment_id, periodo) also serves lookups by enrollment_id alone,
+    # so no separate single-column index is declared
+    __table_args__ = (
+        Index("ix_grades_enrollment_id_periodo", "enrollment_id", "periodo"),
+    )
+    
     # Relationships
     enrollment = relationship(
         "Enrollment",
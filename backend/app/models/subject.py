@@ -19,7 +19,7 @@ class Subject(Base):
     descripcion = Column(Text, nullable=True)
     
     # Foreign key to profesor
-    profesor_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    profesor_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     # Timestamps
     created_at = Column(
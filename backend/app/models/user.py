@@ -67,13 +67,21 @@ class User(Base):
     
     def calcular_edad(self) -> int:
         """Calculate age from fecha_nacimiento."""
-        if not self.fecha_nacimiento:
+        return User.edad_para(self.fecha_nacimiento)
+    
+    @staticmethod
+    def edad_para(fecha_nacimiento: date | None) -> int:
+        """Calculate the age of someone born on a date.
+        
+        Lets bulk inserts compute ``edad`` before any User instance exists.
+        """
+        if not fecha_nacimiento:
             return 0
         today = date.today()
-        age = today.year - self.fecha_nacimiento.year
+        age = today.year - fecha_nacimiento.year
         if (today.month, today.day) < (
-            self.fecha_nacimiento.month,
-            self.fecha_nacimiento.day,
+            fecha_nacimiento.month,
+            fecha_nacimiento.day,
         ):
             age -= 1
         return age
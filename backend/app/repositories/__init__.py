@@ -5,6 +5,8 @@ from app.repositories.user_repository import UserRepository
 from app.repositories.subject_repository import SubjectRepository
 from app.repositories.enrollment_repository import EnrollmentRepository
 from app.repositories.grade_repository import GradeRepository
+from app.repositories.grade_stats_repository import GradeStatsRepository
+from app.repositories.dashboard_repository import DashboardRepository
 
 __all__ = [
     "AbstractRepository",
@@ -12,4 +14,6 @@ __all__ = [
     "SubjectRepository",
     "EnrollmentRepository",
     "GradeRepository",
+    "GradeStatsRepository",
+    "DashboardRepository",
 ]
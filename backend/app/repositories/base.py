@@ -1,14 +1,18 @@
 """Base repository with common CRUD operations."""
 
-from typing import Generic, TypeVar, Type, Optional, Dict, Any
+from typing import Generic, TypeVar, Type, Optional, Dict, Any, Iterable, List, Sequence, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import DeclarativeBase
+from app.core import unit_of_work
+from app.core.decorators import handle_repository_errors
+from app.repositories.mixins import PaginationMixin
 
 ModelType = TypeVar("ModelType", bound=DeclarativeBase)
 
 
-class AbstractRepository(Generic[ModelType]):
+class AbstractRepository(Generic[ModelType], PaginationMixin):
     """Abstract base repository with common CRUD operations."""
     
     def __init__(self, db: AsyncSession, model: Type[ModelType]):
@@ -21,18 +25,19 @@ class AbstractRepository(Generic[ModelType]):
         self.db = db
         self.model = model
     
-    async def create(self, data: Dict[str, Any]) -> ModelType:
+    async def create(self, data: Dict[str, Any], commit: bool = True) -> ModelType:
         """Create a new record.
         
         Args:
             data: Dictionary with model attributes
+            commit: Commit the transaction (False only flushes, leaving the caller to commit)
         
         Returns:
             Created model instance
         """
         instance = self.model(**data)
         self.db.add(instance)
-        await self.db.commit()
+        await self._commit_or_flush(commit)
         await self.db.refresh(instance)
         return instance
     
@@ -49,6 +54,22 @@ class AbstractRepository(Generic[ModelType]):
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
+    async def get_existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        """Get which of the given IDs exist, with one query.
+        
+        Args:
+            ids: Record IDs to look up
+        
+        Returns:
+            Subset of the IDs that exist
+        """
+        ids = set(ids)
+        if not ids:
+            return set()
+        stmt = select(self.model.id).where(self.model.id.in_(ids))
+        result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+    
     async def get_all(self, skip: int = 0, limit: int = 100) -> list[ModelType]:
         """Get all records with pagination.
         
@@ -63,38 +84,139 @@ class AbstractRepository(Generic[ModelType]):
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
     
-    async def update(self, id: int, data: Dict[str, Any]) -> Optional[ModelType]:
+    async def get_page(
+        self, cursor: Optional[str] = None, limit: int = 100, skip: int = 0
+    ) -> Tuple[list[ModelType], Optional[str]]:
+        """Get records ordered by ID with keyset pagination.
+        
+        Args:
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return
+            skip: Number of records to skip
+        
+        Returns:
+            Tuple of (model instances, next_cursor)
+        """
+        return await self._paginate_keyset(
+            select(self.model), [self.model.id], cursor=cursor, limit=limit, skip=skip
+        )
+    
+    async def update(self, id: int, data: Dict[str, Any], commit: bool = True) -> Optional[ModelType]:
         """Update a record.
         
         Args:
             id: Record ID
             data: Dictionary with attributes to update
+            commit: Commit the transaction (False leaves the caller to commit)
         
         Returns:
             Updated model instance or None
         """
-        stmt = (
-            update(self.model)
-            .where(self.model.id == id)
-            .values(**data)
-            .execution_options(synchronize_session="fetch")
+        stmt = update(self.model).where(self.model.id == id).values(**data)
+        if not self._supports_update_returning():
+            await self.db.execute(stmt.execution_options(synchronize_session="fetch"))
+            await self._commit_or_flush(commit)
+            return await self.get_by_id(id)
+        
+        # One round trip: the updated row comes back with the UPDATE and
+        # refreshes the instance already in the session, if any
+        stmt = stmt.returning(self.model).execution_options(
+            synchronize_session="fetch", populate_existing=True
         )
-        await self.db.execute(stmt)
-        await self.db.commit()
-        return await self.get_by_id(id)
+        result = await self.db.execute(stmt)
+        instance = result.scalar_one_or_none()
+        await self._commit_or_flush(commit)
+        return instance
     
-    async def delete(self, id: int) -> bool:
+    async def delete(self, id: int, commit: bool = True) -> bool:
         """Delete a record.
         
         Args:
             id: Record ID
+            commit: Commit the transaction (False leaves the caller to commit)
         
         Returns:
             True if deleted, False if not found
         """
         stmt = delete(self.model).where(self.model.id == id)
         result = await self.db.execute(stmt)
-        await self.db.commit()
+        await self._commit_or_flush(commit)
         return result.rowcount > 0
+    
+    @handle_repository_errors
+    async def bulk_insert(self, rows: List[Dict[str, Any]], chunk_size: int = 500) -> int:
+        """Insert many records with multi-row INSERT statements.
+        
+        Runs in the current transaction and bypasses the ORM flush; the
+        caller commits.
+        
+        Args:
+            rows: Column values of the records
+            chunk_size: Rows per INSERT statement (bounds bound-parameter count)
+        
+        Returns:
+            Number of inserted records
+        """
+        for start in range(0, len(rows), chunk_size):
+            await self.db.execute(insert(self.model).values(rows[start:start + chunk_size]))
+        return len(rows)
+    
+    @handle_repository_errors
+    async def insert_ignore_conflicts(
+        self,
+        rows: List[Dict[str, Any]],
+        conflict_columns: Sequence[str],
+        returning: Sequence[Any],
+        chunk_size: int = 500,
+    ) -> List[Tuple[Any, ...]]:
+        """Insert many rows, skipping those that violate a unique constraint.
+        
+        Uses multi-row ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` on
+        PostgreSQL and SQLite. Runs in the current transaction; the caller
+        commits.
+        
+        Args:
+            rows: Column values of the rows to insert
+            conflict_columns: Columns of the unique constraint that may conflict
+            returning: Columns to return for each inserted row
+            chunk_size: Rows per INSERT statement (bounds bound-parameter count)
+        
+        Returns:
+            Returned column values of the rows actually inserted
+        """
+        dialect = self.db.get_bind().dialect.name
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        inserted: List[Tuple[Any, ...]] = []
+        for start in range(0, len(rows), chunk_size):
+            stmt = (
+                dialect_insert(self.model)
+                .values(rows[start:start + chunk_size])
+                .on_conflict_do_nothing(index_elements=list(conflict_columns))
+                .returning(*returning)
+            )
+            result = await self.db.execute(stmt)
+            inserted.extend(tuple(row) for row in result.all())
+        return inserted
+    
+    def _supports_update_returning(self) -> bool:
+        """Check whether the database returns rows from UPDATE statements.
+        
+        PostgreSQL and SQLite 3.35+ support ``UPDATE ... RETURNING``; other
+        databases fall back to a SELECT after the UPDATE.
+        """
+        return self.db.get_bind().dialect.update_returning
+    
+    async def _commit_or_flush(self, commit: bool) -> None:
+        """Commit the transaction, or only flush when the caller commits.
+        
+        Inside a request's unit of work the commit is left to the request.
+        
+        Args:
+            commit: Commit instead of flushing
+        """
+        if commit:
+            await unit_of_work.commit(self.db)
+        else:
+            await self.db.flush()
 
 
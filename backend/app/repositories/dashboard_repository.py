@@ -0,0 +1,139 @@
+"""Repository for dashboard aggregates.
+
+Every figure is computed in the database: per-subject numbers come from
+``enrollment_grade_stats`` joined to enrollments, so no grade rows are
+loaded to count or average them.
+"""
+
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.decorators import handle_repository_errors
+from app.models.enrollment import Enrollment
+from app.models.enrollment_grade_stats import EnrollmentGradeStats
+from app.models.grade import Grade
+from app.models.subject import Subject
+from app.models.user import User
+from app.repositories.grade_stats_repository import GradeStatsRepository
+
+
+class DashboardRepository:
+    """Aggregate queries behind the dashboard summary."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize dashboard repository.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    @handle_repository_errors
+    async def count_users(self) -> int:
+        """Count all users.
+
+        Returns:
+            Number of users
+        """
+        result = await self.db.execute(select(func.count(User.id)))
+        return result.scalar_one()
+
+    @handle_repository_errors
+    async def get_subject_summaries(self, condition: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """Get enrollment count, grade count and average per subject.
+
+        Subjects are outer joined to their enrollments, so subjects without
+        enrollments are included unless the condition filters on
+        enrollment columns.
+
+        Args:
+            condition: WHERE condition on Subject or Enrollment columns (None = all subjects)
+
+        Returns:
+            One dictionary per subject, ordered by name
+        """
+        stmt = (
+            select(
+                Subject.id,
+                Subject.nombre,
+                Subject.codigo_institucional,
+                func.count(Enrollment.id),
+                func.coalesce(func.sum(EnrollmentGradeStats.grade_count), 0),
+                func.sum(EnrollmentGradeStats.grade_sum),
+            )
+            .outerjoin(Enrollment, Enrollment.subject_id == Subject.id)
+            .outerjoin(EnrollmentGradeStats, EnrollmentGradeStats.enrollment_id == Enrollment.id)
+            .group_by(Subject.id, Subject.nombre, Subject.codigo_institucional)
+            .order_by(Subject.nombre, Subject.id)
+        )
+        if condition is not None:
+            stmt = stmt.where(condition)
+        result = await self.db.execute(stmt)
+        return [
+            {
+                "subject_id": subject_id,
+                "nombre": nombre,
+                "codigo_institucional": codigo,
+                "enrollments": enrollments,
+                "grades": grades,
+                "average": GradeStatsRepository.average(grade_sum, grades) if grades else None,
+            }
+            for subject_id, nombre, codigo, enrollments, grades, grade_sum in result.all()
+        ]
+
+    @handle_repository_errors
+    async def get_recent_grades(self, limit: int, condition: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """Get the most recently recorded grades.
+
+        Ordered by grade ID (insertion order), which walks the primary key
+        index instead of sorting the grades table.
+
+        Args:
+            limit: Maximum number of grades
+            condition: WHERE condition on Subject or Enrollment columns (None = all grades)
+
+        Returns:
+            One dictionary per grade with its subject and student names, newest first
+        """
+        stmt = (
+            select(
+                Grade.id,
+                Grade.nota,
+                Grade.periodo,
+                Grade.fecha,
+                Grade.created_at,
+                Subject.id,
+                Subject.nombre,
+                User.id,
+                User.nombre,
+                User.apellido,
+            )
+            .join(Enrollment, Grade.enrollment_id == Enrollment.id)
+            .join(Subject, Enrollment.subject_id == Subject.id)
+            .join(User, Enrollment.estudiante_id == User.id)
+            .order_by(Grade.id.desc())
+            .limit(limit)
+        )
+        if condition is not None:
+            stmt = stmt.where(condition)
+        result = await self.db.execute(stmt)
+        return [
+            {
+                "id": grade_id,
+                "nota": nota,
+                "periodo": periodo,
+                "fecha": fecha,
+                "created_at": created_at,
+                "subject_id": subject_id,
+                "subject_nombre": subject_nombre,
+                "estudiante_id": estudiante_id,
+                "estudiante_nombre": f"{nombre} {apellido}",
+            }
+            for (
+                grade_id, nota, periodo, fecha, created_at,
+                subject_id, subject_nombre, estudiante_id, nombre, apellido,
+            ) in result.all()
+        ]
+
+
+__all__ = ["DashboardRepository"]
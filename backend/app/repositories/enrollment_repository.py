@@ -1,8 +1,10 @@
 """Enrollment repository with eager loading support."""
 
-from typing import Optional, List
+from typing import Dict, Optional, List, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, desc
+from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.sql import Select
 from app.models.enrollment import Enrollment
 from app.repositories.base import AbstractRepository
 from app.repositories.mixins import EagerLoadMixin, PaginationMixin
@@ -70,6 +72,53 @@ class EnrollmentRepository(AbstractRepository[Enrollment], EagerLoadMixin, Pagin
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
     
+    @handle_repository_errors
+    async def get_estudiante_ids_by_subject(self, subject_id: int) -> Dict[int, int]:
+        """Get the students enrolled in a subject, keyed by enrollment.
+        
+        Selects only the two ID columns, so bulk writers can validate a
+        whole batch of rows against one subject with a single query.
+        
+        Args:
+            subject_id: Subject ID
+        
+        Returns:
+            Mapping of enrollment ID to estudiante ID
+        """
+        stmt = select(Enrollment.id, Enrollment.estudiante_id).where(
+            Enrollment.subject_id == subject_id
+        )
+        result = await self.db.execute(stmt)
+        return {enrollment_id: estudiante_id for enrollment_id, estudiante_id in result.all()}
+    
+    @handle_repository_errors
+    async def get_subject_ids_by_estudiante(self, estudiante_id: int) -> Set[int]:
+        """Get the IDs of the subjects a student is enrolled in.
+        
+        Args:
+            estudiante_id: Estudiante user ID
+        
+        Returns:
+            Set of subject IDs
+        """
+        stmt = select(Enrollment.subject_id).where(Enrollment.estudiante_id == estudiante_id)
+        result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+    
+    @handle_repository_errors
+    async def get_subject_id(self, enrollment_id: int) -> Optional[int]:
+        """Get the subject of an enrollment without loading the row.
+        
+        Args:
+            enrollment_id: Enrollment ID
+        
+        Returns:
+            Subject ID or None if the enrollment does not exist
+        """
+        stmt = select(Enrollment.subject_id).where(Enrollment.id == enrollment_id)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
     @handle_repository_errors
     async def get_by_estudiante_and_subject(
         self, estudiante_id: int, subject_id: int
@@ -153,6 +202,63 @@ class EnrollmentRepository(AbstractRepository[Enrollment], EagerLoadMixin, Pagin
         """
         skip, limit = self._validate_pagination(skip, limit)
         
+        stmt = self._build_many_with_relations_stmt(estudiante_id, subject_id, relations)
+        
+        # Order by id descending (most recent first) BEFORE pagination
+        stmt = stmt.order_by(desc(Enrollment.id))
+        stmt = stmt.offset(skip).limit(limit)
+        
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+    
+    @handle_repository_errors
+    async def get_page_with_relations(
+        self,
+        estudiante_id: Optional[int] = None,
+        subject_id: Optional[int] = None,
+        relations: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+    ) -> Tuple[List[Enrollment], Optional[str]]:
+        """Get a page of enrollments with keyset pagination.
+        
+        Same filters and ordering (most recent first) as
+        ``get_many_with_relations``, but seeks past the previous page
+        instead of scanning skipped rows.
+        
+        Args:
+            estudiante_id: Optional student ID to filter
+            subject_id: Optional subject ID to filter
+            relations: List of relation names to load
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return
+            skip: Number of records to skip
+        
+        Returns:
+            Tuple of (enrollments with loaded relationships, next_cursor)
+        """
+        stmt = self._build_many_with_relations_stmt(estudiante_id, subject_id, relations)
+        return await self._paginate_keyset(
+            stmt, [Enrollment.id], cursor=cursor, limit=limit, skip=skip, descending=True
+        )
+    
+    def _build_many_with_relations_stmt(
+        self,
+        estudiante_id: Optional[int],
+        subject_id: Optional[int],
+        relations: Optional[List[str]],
+    ) -> Select:
+        """Build the filtered enrollment query with eager loading options.
+        
+        Args:
+            estudiante_id: Optional student ID to filter
+            subject_id: Optional subject ID to filter
+            relations: List of relation names to load
+        
+        Returns:
+            Select statement without ordering or pagination
+        """
         if relations is None:
             relations = []
         
@@ -169,30 +275,16 @@ class EnrollmentRepository(AbstractRepository[Enrollment], EagerLoadMixin, Pagin
         use_joined = [r for r in relations if r in ['estudiante', 'subject']]
         select_relations = [r for r in relations if r == 'grades']
         
-        # Build query directly to ensure ordering happens BEFORE pagination
-        from sqlalchemy import select, desc
-        from sqlalchemy.orm import selectinload, joinedload
-        
         stmt = select(Enrollment)
         
         if condition is not None:
             stmt = stmt.where(condition)
         
         # Add eager loading options
-        if select_relations:
-            for relation in select_relations:
-                stmt = stmt.options(selectinload(getattr(Enrollment, relation)))
+        for relation in select_relations:
+            stmt = stmt.options(selectinload(getattr(Enrollment, relation)))
         
-        if use_joined:
-            for relation in use_joined:
-                stmt = stmt.options(joinedload(getattr(Enrollment, relation)))
+        for relation in use_joined:
+            stmt = stmt.options(joinedload(getattr(Enrollment, relation)))
         
-        # Order by id descending (most recent first) BEFORE pagination
-        stmt = stmt.order_by(desc(Enrollment.id))
-        stmt = stmt.offset(skip).limit(limit)
-        
-        result = await self.db.execute(stmt)
-        return list(result.scalars().all())
-
-
-
+        return stmt
@@ -1,12 +1,14 @@
 """Grade repository with eager loading support."""
 
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from app.models.grade import Grade
 from app.models.enrollment import Enrollment
 from app.repositories.base import AbstractRepository
 from app.repositories.mixins import EagerLoadMixin, PaginationMixin
+from app.repositories.grade_stats_repository import GradeStatsRepository
 from app.core.decorators import handle_repository_errors
 
 
@@ -62,18 +64,11 @@ class GradeRepository(AbstractRepository[Grade], EagerLoadMixin, PaginationMixin
         """
         skip, limit = self._validate_pagination(skip, limit)
         
-        # First get enrollments for this subject
-        enrollment_stmt = select(Enrollment.id).where(Enrollment.subject_id == subject_id)
-        enrollment_result = await self.db.execute(enrollment_stmt)
-        enrollment_ids = [row[0] for row in enrollment_result.all()]
-        
-        if not enrollment_ids:
-            return []
-        
-        # Then get grades for those enrollments
         stmt = (
             select(Grade)
-            .where(Grade.enrollment_id.in_(enrollment_ids))
+            .join(Enrollment, Grade.enrollment_id == Enrollment.id)
+            .where(Enrollment.subject_id == subject_id)
+            .order_by(Grade.id)
             .offset(skip)
             .limit(limit)
         )
@@ -96,18 +91,11 @@ class GradeRepository(AbstractRepository[Grade], EagerLoadMixin, PaginationMixin
         """
         skip, limit = self._validate_pagination(skip, limit)
         
-        # Get enrollments for this student
-        enrollment_stmt = select(Enrollment.id).where(Enrollment.estudiante_id == estudiante_id)
-        enrollment_result = await self.db.execute(enrollment_stmt)
-        enrollment_ids = [row[0] for row in enrollment_result.all()]
-        
-        if not enrollment_ids:
-            return []
-        
-        # Get grades for those enrollments
         stmt = (
             select(Grade)
-            .where(Grade.enrollment_id.in_(enrollment_ids))
+            .join(Enrollment, Grade.enrollment_id == Enrollment.id)
+            .where(Enrollment.estudiante_id == estudiante_id)
+            .order_by(Grade.id)
             .offset(skip)
             .limit(limit)
         )
@@ -143,6 +131,31 @@ class GradeRepository(AbstractRepository[Grade], EagerLoadMixin, PaginationMixin
             use_joined=use_joined
         )
     
+    @handle_repository_errors
+    async def get_with_owners(self, grade_id: int) -> Optional[Grade]:
+        """Get grade with its enrollment, student and subject in one query.
+        
+        Loads everything needed to authorize an edit (the subject's
+        profesor) and to serialize the result afterwards.
+        
+        Args:
+            grade_id: The grade ID
+        
+        Returns:
+            Grade with loaded enrollment.estudiante and enrollment.subject, or None
+        """
+        enrollment = joinedload(Grade.enrollment)
+        stmt = (
+            select(Grade)
+            .where(Grade.id == grade_id)
+            .options(
+                enrollment.joinedload(Enrollment.estudiante),
+                enrollment.joinedload(Enrollment.subject),
+            )
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
     @handle_repository_errors
     async def get_many_with_relations(
         self,
@@ -178,15 +191,10 @@ class GradeRepository(AbstractRepository[Grade], EagerLoadMixin, PaginationMixin
         elif enrollment_id:
             condition = Grade.enrollment_id == enrollment_id
         elif subject_id:
-            # Get enrollments for this subject first
-            enrollment_stmt = select(Enrollment.id).where(Enrollment.subject_id == subject_id)
-            enrollment_result = await self.db.execute(enrollment_stmt)
-            enrollment_ids = [row[0] for row in enrollment_result.all()]
-            
-            if not enrollment_ids:
-                return []
-            
-            condition = Grade.enrollment_id.in_(enrollment_ids)
+            # Semi-join on the subject's enrollments, evaluated in the same statement
+            condition = Grade.enrollment_id.in_(
+                select(Enrollment.id).where(Enrollment.subject_id == subject_id)
+            )
         
         # Use joinedload for nested many-to-one relationships
         # When using joinedload for nested relations, we need to include 'enrollment' in use_joined
@@ -206,25 +214,104 @@ class GradeRepository(AbstractRepository[Grade], EagerLoadMixin, PaginationMixin
             relations=filtered_relations if filtered_relations else None,
             use_joined=use_joined,
             skip=skip,
-            limit=limit
+            limit=limit,
+            order_by=[Grade.id],
         )
     
     @handle_repository_errors
     async def get_average_by_enrollment(self, enrollment_id: int) -> Optional[float]:
         """Get average grade for an enrollment.
         
+        Reads the materialized enrollment_grade_stats row instead of
+        aggregating the grades.
+        
         Args:
             enrollment_id: Enrollment ID
         
         Returns:
             Average grade or None if no grades exist
         """
-        stmt = select(func.avg(Grade.nota)).where(
-            Grade.enrollment_id == enrollment_id
+        stats = await GradeStatsRepository(self.db).get_by_enrollment(enrollment_id)
+        if stats is None:
+            return None
+        return GradeStatsRepository.average(stats.grade_sum, stats.grade_count)
+    
+    @handle_repository_errors
+    async def get_estudiante_and_subject_ids(self, grade_id: int) -> Optional[Tuple[int, int]]:
+        """Get the student and subject a grade belongs to.
+        
+        Args:
+            grade_id: Grade ID
+        
+        Returns:
+            Tuple of (estudiante_id, subject_id) or None if the grade does not exist
+        """
+        stmt = (
+            select(Enrollment.estudiante_id, Enrollment.subject_id)
+            .join(Grade, Grade.enrollment_id == Enrollment.id)
+            .where(Grade.id == grade_id)
         )
         result = await self.db.execute(stmt)
-        avg = result.scalar()
-        return float(avg) if avg is not None else None
-
-
-
+        row = result.first()
+        return (row[0], row[1]) if row else None
+    
+    @handle_repository_errors
+    async def get_report_data_by_estudiante(self, estudiante_id: int) -> Dict[int, Dict[str, Any]]:
+        """Get grades and averages for every enrollment of a student.
+        
+        Args:
+            estudiante_id: Student ID
+        
+        Returns:
+            Mapping of enrollment ID to {"grades": [...], "average": float | None}
+        """
+        return await self._load_report_data(Enrollment.estudiante_id == estudiante_id)
+    
+    @handle_repository_errors
+    async def get_report_data_by_subject(self, subject_id: int) -> Dict[int, Dict[str, Any]]:
+        """Get grades and averages for every enrollment of a subject.
+        
+        Args:
+            subject_id: Subject ID
+        
+        Returns:
+            Mapping of enrollment ID to {"grades": [...], "average": float | None}
+        """
+        return await self._load_report_data(Enrollment.subject_id == subject_id)
+    
+    async def _load_report_data(self, enrollment_condition: Any) -> Dict[int, Dict[str, Any]]:
+        """Load report grades and per-enrollment averages with two set-based queries.
+        
+        Replaces one grades query plus one AVG query per enrollment, so the
+        cost of a report no longer grows with the number of enrollments.
+        Averages come from the materialized enrollment_grade_stats rows.
+        
+        Args:
+            enrollment_condition: WHERE condition on Enrollment columns
+        
+        Returns:
+            Mapping of enrollment ID to {"grades": [...], "average": float | None}.
+            Enrollments without grades are not present in the mapping.
+        """
+        grades_stmt = (
+            select(Grade)
+            .join(Enrollment, Grade.enrollment_id == Enrollment.id)
+            .where(enrollment_condition)
+            .order_by(Grade.enrollment_id, Grade.id)
+        )
+        grades_result = await self.db.execute(grades_stmt)
+        
+        report_data: Dict[int, Dict[str, Any]] = {}
+        for grade in grades_result.scalars().all():
+            entry = report_data.setdefault(grade.enrollment_id, {"grades": [], "average": None})
+            entry["grades"].append(grade)
+        
+        if not report_data:
+            return report_data
+        
+        averages = await GradeStatsRepository(self.db).get_averages(enrollment_condition)
+        for enrollment_id, average in averages.items():
+            if enrollment_id in report_data:
+                report_data[enrollment_id]["average"] = average
+        
+        return report_data
@@ -0,0 +1,238 @@
+"""Repository for materialized enrollment grade statistics.
+
+Rows of ``enrollment_grade_stats`` are recomputed from the grades of the
+affected enrollments inside the transaction that changes those grades:
+
+- Grades added, changed or deleted through the ORM unit of work are picked
+  up by an ``after_flush`` hook, so ``GradeRepository.create`` (and any
+  code that adds Grade objects to a session) needs no extra call.
+- Bulk UPDATE/DELETE statements bypass the flush, so ``GradeService``
+  calls ``refresh`` explicitly after them.
+
+Each refresh locks the enrollment rows (``FOR NO KEY UPDATE`` on
+PostgreSQL) so concurrent writers of the same enrollment are serialized.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.enrollment import Enrollment
+from app.models.enrollment_grade_stats import EnrollmentGradeStats
+from app.models.grade import Grade
+from app.core.decorators import handle_repository_errors
+
+
+def _aggregate_select(condition: Optional[Any] = None):
+    """Build the INSERT ... SELECT source that aggregates grades per enrollment."""
+    stmt = select(
+        Grade.enrollment_id,
+        func.count(Grade.id),
+        func.sum(Grade.nota),
+        func.avg(Grade.nota),
+        func.min(Grade.nota),
+        func.max(Grade.nota),
+        func.now(),
+    )
+    if condition is not None:
+        stmt = stmt.where(condition)
+    return stmt.group_by(Grade.enrollment_id)
+
+
+_STATS_COLUMNS = [
+    EnrollmentGradeStats.enrollment_id,
+    EnrollmentGradeStats.grade_count,
+    EnrollmentGradeStats.grade_sum,
+    EnrollmentGradeStats.grade_avg,
+    EnrollmentGradeStats.grade_min,
+    EnrollmentGradeStats.grade_max,
+    EnrollmentGradeStats.last_updated,
+]
+
+
+def refresh_grade_stats(session: Session, enrollment_ids: Iterable[int]) -> None:
+    """Recompute the statistics rows of some enrollments (sync).
+
+    Runs on the session's current connection and transaction; it never
+    flushes or commits.
+
+    Args:
+        session: Synchronous session (``AsyncSession.sync_session`` in async code)
+        enrollment_ids: Enrollments whose grades changed
+    """
+    ids = sorted({enrollment_id for enrollment_id in enrollment_ids if enrollment_id is not None})
+    if not ids:
+        return
+
+    connection = session.connection()
+    # Lock in ID order so two writers cannot deadlock each other
+    connection.execute(
+        select(Enrollment.id)
+        .where(Enrollment.id.in_(ids))
+        .order_by(Enrollment.id)
+        .with_for_update(key_share=True)
+    )
+    connection.execute(
+        delete(EnrollmentGradeStats).where(EnrollmentGradeStats.enrollment_id.in_(ids))
+    )
+    connection.execute(
+        insert(EnrollmentGradeStats).from_select(
+            _STATS_COLUMNS, _aggregate_select(Grade.enrollment_id.in_(ids))
+        )
+    )
+
+
+def _grade_enrollment_ids(session: Session) -> Set[int]:
+    """Collect enrollments touched by Grade objects in a flush."""
+    ids: Set[int] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, Grade):
+            continue
+        ids.add(obj.enrollment_id)
+        # A grade moved to another enrollment changes the old one too
+        history = inspect(obj).attrs.enrollment_id.history
+        ids.update(history.deleted or ())
+    return ids
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_stats_after_flush(session: Session, flush_context: Any) -> None:
+    """Keep statistics current for grades written through the unit of work."""
+    enrollment_ids = _grade_enrollment_ids(session)
+    if enrollment_ids:
+        refresh_grade_stats(session, enrollment_ids)
+
+
+class GradeStatsRepository:
+    """Repository for EnrollmentGradeStats rows."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize grade stats repository.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    @handle_repository_errors
+    async def refresh(self, enrollment_ids: Iterable[int]) -> None:
+        """Recompute statistics of some enrollments in the current transaction.
+
+        Args:
+            enrollment_ids: Enrollments whose grades changed
+        """
+        ids = list(enrollment_ids)
+        await self.db.run_sync(refresh_grade_stats, ids)
+
+    @handle_repository_errors
+    async def get_by_enrollment(self, enrollment_id: int) -> Optional[EnrollmentGradeStats]:
+        """Get statistics of an enrollment.
+
+        Args:
+            enrollment_id: Enrollment ID
+
+        Returns:
+            Statistics row or None if the enrollment has no grades
+        """
+        stmt = select(EnrollmentGradeStats).where(
+            EnrollmentGradeStats.enrollment_id == enrollment_id
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @handle_repository_errors
+    async def get_averages(self, enrollment_condition: Any) -> Dict[int, float]:
+        """Get averages of the enrollments matching a condition.
+
+        Args:
+            enrollment_condition: WHERE condition on Enrollment columns
+
+        Returns:
+            Mapping of enrollment ID to average (enrollments without grades are omitted)
+        """
+        stmt = (
+            select(
+                EnrollmentGradeStats.enrollment_id,
+                EnrollmentGradeStats.grade_sum,
+                EnrollmentGradeStats.grade_count,
+            )
+            .join(Enrollment, EnrollmentGradeStats.enrollment_id == Enrollment.id)
+            .where(enrollment_condition)
+        )
+        result = await self.db.execute(stmt)
+        return {
+            enrollment_id: self.average(grade_sum, grade_count)
+            for enrollment_id, grade_sum, grade_count in result.all()
+        }
+
+    @staticmethod
+    def _to_cents(value: Any) -> Decimal:
+        """Normalize a grade sum for comparison (SQLite returns floats)."""
+        return Decimal(str(value)).quantize(Decimal("0.01"))
+
+    @handle_repository_errors
+    async def find_drift(self) -> List[int]:
+        """Find enrollments whose statistics do not match their grades.
+
+        Returns:
+            Sorted IDs of enrollments with missing, stale or orphaned statistics
+        """
+        actual = {
+            row[0]: (row[1], self._to_cents(row[2]))
+            for row in (await self.db.execute(
+                select(Grade.enrollment_id, func.count(Grade.id), func.sum(Grade.nota))
+                .group_by(Grade.enrollment_id)
+            )).all()
+        }
+        stored = {
+            row[0]: (row[1], self._to_cents(row[2]))
+            for row in (await self.db.execute(
+                select(
+                    EnrollmentGradeStats.enrollment_id,
+                    EnrollmentGradeStats.grade_count,
+                    EnrollmentGradeStats.grade_sum,
+                )
+            )).all()
+        }
+        drifted = {
+            enrollment_id
+            for enrollment_id in actual.keys() | stored.keys()
+            if actual.get(enrollment_id) != stored.get(enrollment_id)
+        }
+        return sorted(drifted)
+
+    @handle_repository_errors
+    async def rebuild(self) -> int:
+        """Recompute every statistics row from the grades table.
+
+        Runs in the current transaction; the caller commits.
+
+        Returns:
+            Number of enrollments with statistics after the rebuild
+        """
+        await self.db.execute(delete(EnrollmentGradeStats))
+        await self.db.execute(
+            insert(EnrollmentGradeStats).from_select(_STATS_COLUMNS, _aggregate_select())
+        )
+        result = await self.db.execute(select(func.count()).select_from(EnrollmentGradeStats))
+        return result.scalar_one()
+
+    @staticmethod
+    def average(grade_sum: Any, grade_count: int) -> float:
+        """Compute an average from stored sum and count.
+
+        Uses the exact sum rather than the rounded ``grade_avg`` column so
+        results match ``AVG(nota)`` over the grades.
+
+        Args:
+            grade_sum: Stored sum of grades
+            grade_count: Stored number of grades
+
+        Returns:
+            Average grade
+        """
+        return float(grade_sum) / grade_count
+
+
+__all__ = ["GradeStatsRepository", "refresh_grade_stats"]
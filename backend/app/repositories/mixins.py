@@ -4,10 +4,15 @@ These mixins provide reusable functionality for repositories,
 following DRY principle and reducing code duplication.
 """
 
-from typing import List, Optional, Any
-from sqlalchemy import select
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import List, Optional, Any, Sequence, Tuple
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
 
 class EagerLoadMixin:
@@ -101,6 +106,7 @@ class EagerLoadMixin:
         use_joined: Optional[List[str]] = None,
         skip: int = 0,
         limit: int = 100,
+        order_by: Optional[List[Any]] = None,
     ) -> List[Any]:
         """Get multiple entities with eager-loaded relationships.
         
@@ -111,6 +117,7 @@ class EagerLoadMixin:
             use_joined: List of relationship names to load with joinedload
             skip: Number of records to skip (pagination)
             limit: Maximum number of records to return
+            order_by: Optional ORDER BY columns, applied before pagination
             
         Returns:
             List of entities with loaded relationships
@@ -174,6 +181,9 @@ class EagerLoadMixin:
                     # Chain: model.first_rel -> related_model.nested_rel
                     stmt = stmt.options(joinedload(first_rel).joinedload(nested_rel))
 
+        if order_by:
+            stmt = stmt.order_by(*order_by)
+        
         stmt = stmt.offset(skip).limit(limit)
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
@@ -182,6 +192,9 @@ class EagerLoadMixin:
 class PaginationMixin:
     """Mixin to handle pagination in a standardized way.
     
+    Supports offset pagination (skip/limit) and keyset pagination with
+    opaque cursors (see ``_paginate_keyset``).
+    
     Uses class attributes that match values in app.core.config.settings.
     Class attributes can be overridden in subclasses for testing.
     
@@ -190,6 +203,8 @@ class PaginationMixin:
     they will be used automatically via the repository initialization.
     """
     
+    db: AsyncSession  # Must be provided by implementing class
+    
     # Class attributes (can be overridden in subclasses for testing)
     # These default values match Settings.default_page_size and Settings.max_page_size
     DEFAULT_PAGE_SIZE = 100
@@ -221,6 +236,115 @@ class PaginationMixin:
             limit = max_size
             
         return skip, limit
+    
+    @staticmethod
+    def encode_cursor(values: Sequence[Any]) -> str:
+        """Encode the sort key of the last row of a page as an opaque cursor.
+        
+        Args:
+            values: Sort key values (e.g. ``(id,)`` or ``(created_at, id)``)
+            
+        Returns:
+            URL-safe cursor string
+        """
+        payload = [
+            value.isoformat() if isinstance(value, (date, datetime)) else value
+            for value in values
+        ]
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+        """Decode a cursor produced by ``encode_cursor``.
+        
+        Args:
+            cursor: Cursor string from a previous page
+            columns: Sort key columns the cursor was built from
+            
+        Returns:
+            Sort key values converted to the column types
+            
+        Raises:
+            ValueError: If the cursor is malformed or does not match the columns
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        except (binascii.Error, UnicodeError, ValueError):
+            raise ValueError("Invalid cursor")
+        
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("Invalid cursor")
+        
+        decoded = []
+        for column, value in zip(columns, values):
+            python_type = column.type.python_type
+            try:
+                if python_type is datetime:
+                    value = datetime.fromisoformat(value)
+                elif python_type is date:
+                    value = date.fromisoformat(value)
+                elif python_type is int and not isinstance(value, int):
+                    raise ValueError
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            decoded.append(value)
+        return decoded
+    
+    async def _paginate_keyset(
+        self,
+        stmt: Select,
+        columns: Sequence[Any],
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        descending: bool = False,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """Execute a statement as one page of keyset (seek) pagination.
+        
+        Rows are ordered by ``columns``, which must form a unique key
+        (end with the primary key). With a cursor the query seeks past the
+        last row of the previous page, so deep pages cost the same as the
+        first one. ``skip`` is still applied for backward compatibility
+        with offset-based clients.
+        
+        Args:
+            stmt: Select statement with filters and loader options applied
+            columns: Sort key columns, e.g. ``[Model.id]`` or ``[Model.created_at, Model.id]``
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return
+            skip: Number of records to skip
+            descending: Order from newest to oldest
+            
+        Returns:
+            Tuple of (records, next_cursor); next_cursor is None on the last page
+            
+        Raises:
+            ValueError: If pagination parameters or the cursor are invalid
+        """
+        skip, limit = self._validate_pagination(skip, limit)
+        
+        if cursor:
+            values = self.decode_cursor(cursor, columns)
+            key = tuple_(*columns) if len(columns) > 1 else columns[0]
+            bound = tuple_(*values) if len(columns) > 1 else values[0]
+            stmt = stmt.where(key < bound if descending else key > bound)
+        
+        order = [column.desc() if descending else column.asc() for column in columns]
+        # Fetch one extra row to know whether another page exists
+        stmt = stmt.order_by(*order).offset(skip).limit(limit + 1)
+        
+        result = await self.db.execute(stmt)
+        rows = list(result.unique().scalars().all())
+        
+        if len(rows) <= limit:
+            return rows, None
+        
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = self.encode_cursor([getattr(last, column.key) for column in columns])
+        return rows, next_cursor
 
 
 class TimestampMixin:
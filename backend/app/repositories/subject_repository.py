@@ -1,8 +1,9 @@
 """Subject repository."""
 
-from typing import Optional
+from typing import Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import exists, select
+from sqlalchemy.orm import selectinload
 from app.models.subject import Subject
 from app.repositories.base import AbstractRepository
 
@@ -54,5 +55,61 @@ class SubjectRepository(AbstractRepository[Subject]):
         )
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
-
-
+    
+    async def get_ids_by_profesor(self, profesor_id: int) -> Set[int]:
+        """Get the IDs of every subject assigned to a profesor.
+        
+        Args:
+            profesor_id: Profesor user ID
+        
+        Returns:
+            Set of subject IDs
+        """
+        stmt = select(Subject.id).where(Subject.profesor_id == profesor_id)
+        result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+    
+    async def is_assigned_to(self, subject_id: int, profesor_id: int) -> bool:
+        """Check whether a subject is assigned to a profesor (single EXISTS query).
+        
+        Args:
+            subject_id: Subject ID
+            profesor_id: Profesor user ID
+        
+        Returns:
+            True if the subject exists and is assigned to the profesor
+        """
+        stmt = select(
+            exists().where(Subject.id == subject_id, Subject.profesor_id == profesor_id)
+        )
+        result = await self.db.execute(stmt)
+        return bool(result.scalar())
+    
+    async def get_profesor_id(self, subject_id: int) -> Optional[int]:
+        """Get the profesor assigned to a subject.
+        
+        Args:
+            subject_id: Subject ID
+        
+        Returns:
+            Profesor user ID or None if the subject does not exist
+        """
+        stmt = select(Subject.profesor_id).where(Subject.id == subject_id)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    async def get_page_with_profesor(
+        self, cursor: Optional[str] = None, limit: int = 100, skip: int = 0
+    ) -> Tuple[list[Subject], Optional[str]]:
+        """Get subjects ordered by ID with their profesor, using keyset pagination.
+        
+        Args:
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return
+            skip: Number of records to skip
+        
+        Returns:
+            Tuple of (subjects with loaded profesor, next_cursor)
+        """
+        stmt = select(Subject).options(selectinload(Subject.profesor))
+        return await self._paginate_keyset(stmt, [Subject.id], cursor=cursor, limit=limit, skip=skip)
@@ -1,9 +1,9 @@
 """User repository."""
 
-from typing import Optional
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.repositories.base import AbstractRepository
 
 
@@ -65,5 +65,56 @@ class UserRepository(AbstractRepository[User]):
         )
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
-
-
+    
+    async def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Get which of the given emails are already registered, with one query.
+        
+        Args:
+            emails: Email addresses
+        
+        Returns:
+            Subset of the emails that belong to a user
+        """
+        emails = set(emails)
+        if not emails:
+            return set()
+        stmt = select(User.email).where(User.email.in_(emails))
+        result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+    
+    async def get_roles_by_ids(self, ids: Iterable[int]) -> Dict[int, UserRole]:
+        """Get the role of each of the given users, with one query.
+        
+        Args:
+            ids: User IDs
+        
+        Returns:
+            Mapping of user ID to role (missing users are omitted)
+        """
+        ids = set(ids)
+        if not ids:
+            return {}
+        stmt = select(User.id, User.role).where(User.id.in_(ids))
+        result = await self.db.execute(stmt)
+        return {user_id: role for user_id, role in result.all()}
+    
+    async def get_by_roles_page(
+        self,
+        roles: Sequence[str],
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+    ) -> Tuple[list[User], Optional[str]]:
+        """Get users with any of the given roles, ordered by ID, with keyset pagination.
+        
+        Args:
+            roles: User roles to include
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of records to return
+            skip: Number of records to skip
+        
+        Returns:
+            Tuple of (users, next_cursor)
+        """
+        stmt = select(User).where(User.role.in_(list(roles)))
+        return await self._paginate_keyset(stmt, [User.id], cursor=cursor, limit=limit, skip=skip)
@@ -0,0 +1,27 @@
+"""Schemas shared by bulk upload endpoints."""
+
+from pydantic import BaseModel, Field
+
+
+class BulkRowError(BaseModel):
+    """Validation error of one uploaded row."""
+    row: int = Field(..., ge=1, description="1-based position of the row in the upload")
+    error: str
+
+
+def format_row_error(error: Exception) -> str:
+    """Render a row validation error as a single line.
+    
+    Args:
+        error: pydantic ValidationError or ValueError raised for the row
+    
+    Returns:
+        Error message (pydantic errors as 'field: message; ...')
+    """
+    errors = getattr(error, "errors", None)
+    if callable(errors):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+            for item in errors()
+        )
+    return str(error)
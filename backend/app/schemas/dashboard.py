@@ -0,0 +1,45 @@
+"""Dashboard schemas."""
+
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import List, Optional
+from decimal import Decimal
+
+
+class DashboardCounts(BaseModel):
+    """Totals shown on the dashboard cards (scoped to the user's role)."""
+    users: Optional[int] = None  # Admin only
+    subjects: int
+    enrollments: int
+    grades: int
+
+
+class DashboardSubject(BaseModel):
+    """Enrollment and grade figures of one subject."""
+    subject_id: int
+    nombre: str
+    codigo_institucional: str
+    enrollments: int
+    grades: int
+    average: Optional[float] = None  # None when the subject has no grades
+
+
+class DashboardRecentGrade(BaseModel):
+    """A recently recorded grade."""
+    id: int
+    nota: Decimal
+    periodo: str
+    fecha: date
+    created_at: datetime
+    subject_id: int
+    subject_nombre: str
+    estudiante_id: int
+    estudiante_nombre: str
+
+
+class DashboardSummary(BaseModel):
+    """Role-aware dashboard statistics."""
+    role: str
+    counts: DashboardCounts
+    subjects: List[DashboardSubject] = []
+    recent_grades: List[DashboardRecentGrade] = []
@@ -1,8 +1,9 @@
 """Enrollment schemas."""
 
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from app.schemas.bulk import BulkRowError
 
 
 class EnrollmentBase(BaseModel):
@@ -16,6 +17,16 @@ class EnrollmentCreate(EnrollmentBase):
     pass
 
 
+class EnrollmentBulkResult(BaseModel):
+    """Outcome of a bulk enrollment upload."""
+    received: int
+    created: int
+    skipped: int
+    failed: int
+    atomic: bool
+    errors: List[BulkRowError] = []
+
+
 # Schemas anidados simplificados para las relaciones
 class EstudianteInfo(BaseModel):
     """Información básica del estudiante."""
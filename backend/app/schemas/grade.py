@@ -1,9 +1,10 @@
 """Grade schemas."""
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
+from app.schemas.bulk import BulkRowError
 
 
 class GradeBase(BaseModel):
@@ -27,6 +28,35 @@ class GradeUpdate(BaseModel):
     observaciones: Optional[str] = None
 
 
+class GradeBulkRow(BaseModel):
+    """One row of a bulk grade upload.
+    
+    The period and subject come from the request; a row identifies the
+    enrollment directly or through the student enrolled in the subject.
+    """
+    enrollment_id: Optional[int] = None
+    estudiante_id: Optional[int] = None
+    nota: Decimal = Field(..., ge=0, le=5, description="Nota entre 0 y 5")
+    fecha: date
+    observaciones: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def check_target(self) -> "GradeBulkRow":
+        """Require exactly one of enrollment_id and estudiante_id."""
+        if (self.enrollment_id is None) == (self.estudiante_id is None):
+            raise ValueError("Provide either enrollment_id or estudiante_id")
+        return self
+
+
+class GradeBulkResult(BaseModel):
+    """Outcome of a bulk grade upload."""
+    received: int
+    inserted: int
+    failed: int
+    atomic: bool
+    errors: List[BulkRowError] = []
+
+
 # Schemas anidados para relaciones
 class EstudianteBasicInfo(BaseModel):
     """Info básica del estudiante."""
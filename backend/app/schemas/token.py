@@ -1,7 +1,8 @@
 """Token schemas."""
 
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from app.models.user import UserRole
 
 
 class Token(BaseModel):
@@ -14,4 +15,14 @@ class TokenData(BaseModel):
     """Token data schema."""
     email: Optional[str] = None
     role: Optional[str] = None
+    user_id: Optional[int] = None
+
+
+class Principal(BaseModel):
+    """Authenticated identity built from token claims or a loaded user."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    email: str
+    role: UserRole
 
@@ -2,9 +2,10 @@
 
 from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 from app.models.user import UserRole
 from app.core.sanitizers import validate_email
+from app.schemas.bulk import BulkRowError
 
 
 class UserBase(BaseModel):
@@ -56,3 +57,21 @@ class UserResponse(UserBase):
     
     model_config = ConfigDict(from_attributes=True)
 
+
+
+class UserBulkCreated(BaseModel):
+    """User created (or, in a dry run, that would be created) by a bulk import."""
+    row: int
+    email: str
+    codigo_institucional: str
+
+
+class UserBulkResult(BaseModel):
+    """Outcome of a bulk user import."""
+    received: int
+    created: int
+    failed: int
+    dry_run: bool
+    atomic: bool
+    users: List[UserBulkCreated] = []
+    errors: List[BulkRowError] = []
@@ -7,6 +7,8 @@ from app.services.grade_service import GradeService
 from app.services.admin_service import AdminService
 from app.services.profesor_service import ProfesorService
 from app.services.estudiante_service import EstudianteService
+from app.services.dashboard_service import DashboardService
+from app.services.permission_service import PermissionService
 
 __all__ = [
     "UserService",
@@ -16,4 +18,6 @@ __all__ = [
     "AdminService",
     "ProfesorService",
     "EstudianteService",
+    "DashboardService",
+    "PermissionService",
 ]
@@ -4,6 +4,8 @@ from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User, UserRole
 from app.models.subject import Subject
+from app.core.read_replica import reads_from_replica
+from app.core.report_cache import report_cache
 from app.services.user_service import UserService
 from app.services.subject_service import SubjectService
 from app.services.grade_service import GradeService
@@ -202,6 +204,9 @@ class AdminService:
             "subjects": [],
         }
         
+        # Load grades and averages for all enrollments at once
+        report_grades = await self.grade_service.get_report_grades_by_estudiante(estudiante.id)
+        
         # Add enrollment and grade data (subjects already loaded via eager loading)
         for enrollment in enrollments:
             # Subject already loaded via eager loading
@@ -209,11 +214,7 @@ class AdminService:
             if not subject:
                 continue
             
-            grades = await self.grade_service.get_grades_by_enrollment(enrollment.id)
-            try:
-                average = await self.grade_service.calculate_average(enrollment.id)
-            except ValueError:
-                average = None
+            grades, average = report_grades.get(enrollment.id, ([], None))
             
             report_data["subjects"].append({
                 "subject": {
@@ -250,13 +251,38 @@ class AdminService:
             report_data["general_average"] = None
     
     async def generate_student_report(
-        self, estudiante_id: int, format: str = "json"
+        self, estudiante_id: int, format: str = "json", stream: bool = False
     ) -> dict:
         """Generate report for a student using Factory Method.
         
+        Non-streamed reports are served from the report cache until the student,
+        their subjects, grades or enrollments change.
+        
+        Args:
+            estudiante_id: Estudiante user ID
+            format: Report format (pdf, html, json)
+            stream: Return content as an iterator of chunks when the format supports it
+        
+        Returns:
+            Report with content, filename, and content_type
+        """
+        if stream:
+            return await self._render_student_report(estudiante_id, format, stream=True)
+        return await report_cache.get_or_generate(
+            "student", "estudiante", estudiante_id, format,
+            lambda: self._render_student_report(estudiante_id, format),
+            store=not reads_from_replica(self.db),
+        )
+    
+    async def _render_student_report(
+        self, estudiante_id: int, format: str, stream: bool = False
+    ) -> dict:
+        """Build student report data and render it in the requested format.
+        
         Args:
             estudiante_id: Estudiante user ID
             format: Report format (pdf, html, json)
+            stream: Return content as an iterator of chunks when the format supports it
         
         Returns:
             Report with content, filename, and content_type
@@ -281,5 +307,4 @@ class AdminService:
         
         # Use Factory Method to generate report
         generator = ReportFactory.create_generator(format)
-        return generator.generate(report_data)
-
+        return await generator.render(report_data, stream=stream)
@@ -0,0 +1,76 @@
+"""Dashboard service with role-aware statistics."""
+
+from typing import Any, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import cache
+from app.core.config import settings
+from app.models.enrollment import Enrollment
+from app.models.subject import Subject
+from app.models.user import UserRole
+from app.repositories.dashboard_repository import DashboardRepository
+
+
+class DashboardService:
+    """Service for dashboard statistics."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize dashboard service.
+
+        Args:
+            db: Database session
+        """
+        self.repository = DashboardRepository(db)
+        self.db = db
+
+    async def get_summary(self, user_id: int, role: UserRole) -> Dict[str, Any]:
+        """Get the dashboard statistics visible to a user.
+
+        - Admin: every user, subject, enrollment and grade
+        - Profesor: their assigned subjects
+        - Estudiante: their enrollments and own grades
+
+        Args:
+            user_id: Current user ID
+            role: Current user role
+
+        Returns:
+            Dictionary matching ``DashboardSummary``
+        """
+        role = UserRole(role)
+        # Admins share one summary
+        return await self._build_summary(role, None if role == UserRole.ADMIN else user_id)
+
+    @cache.cached(namespace="dashboard.summary", ttl_seconds=settings.dashboard_cache_ttl_seconds)
+    async def _build_summary(self, role: UserRole, user_id: Optional[int]) -> Dict[str, Any]:
+        """Run the aggregate queries of a summary (cached for a short TTL).
+
+        Args:
+            role: User role
+            user_id: User ID (None for admins)
+
+        Returns:
+            Dictionary matching ``DashboardSummary``
+        """
+        if role == UserRole.ESTUDIANTE:
+            condition = Enrollment.estudiante_id == user_id
+        elif role == UserRole.PROFESOR:
+            condition = Subject.profesor_id == user_id
+        else:
+            condition = None
+
+        subjects = await self.repository.get_subject_summaries(condition)
+        counts = {
+            "users": await self.repository.count_users() if role == UserRole.ADMIN else None,
+            "subjects": len(subjects),
+            "enrollments": sum(subject["enrollments"] for subject in subjects),
+            "grades": sum(subject["grades"] for subject in subjects),
+        }
+        recent_grades = await self.repository.get_recent_grades(
+            settings.dashboard_recent_grades, condition
+        )
+        return {
+            "role": role.value,
+            "counts": counts,
+            "subjects": subjects,
+            "recent_grades": recent_grades,
+        }
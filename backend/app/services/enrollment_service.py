@@ -1,12 +1,20 @@
 """Enrollment service with business logic."""
 
+from typing import Any, AsyncIterable, Dict, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.enrollment_repository import EnrollmentRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.subject_repository import SubjectRepository
-from app.schemas.enrollment import EnrollmentCreate
+from app.schemas.bulk import BulkRowError, format_row_error
+from app.schemas.enrollment import EnrollmentBulkResult, EnrollmentCreate
+from app.services.grade_service import enrollment_cache_tag
 from app.models.enrollment import Enrollment
 from app.models.user import UserRole
+from app.core import unit_of_work
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.report_cache import report_cache
+from app.utils.bulk_ingest import BulkFormatError
 
 
 class EnrollmentService:
@@ -58,7 +66,138 @@ class EnrollmentService:
         
         # Create enrollment
         enrollment_dict = enrollment_data.model_dump()
-        return await self.repository.create(enrollment_dict)
+        enrollment = await self.repository.create(enrollment_dict)
+        await unit_of_work.after_commit(
+            self.db, report_cache.invalidate_enrollment, enrollment.estudiante_id, enrollment.subject_id
+        )
+        return enrollment
+    
+    async def bulk_create_enrollments(
+        self, records: AsyncIterable[Dict[str, Any]], atomic: bool = True
+    ) -> EnrollmentBulkResult:
+        """Create many enrollments with set-based validation.
+        
+        Students and subjects of the whole batch are checked with one query
+        each, and rows are written with multi-row
+        ``INSERT ... ON CONFLICT DO NOTHING``, so existing enrollments (and
+        repeats within the batch) are skipped rather than failing.
+        
+        Args:
+            records: Raw rows with estudiante_id and subject_id
+            atomic: Create nothing if any row fails validation
+        
+        Returns:
+            Created, skipped and failed counts with per-row errors
+        
+        Raises:
+            BulkFormatError: If the body is malformed or exceeds the row limit
+        """
+        received, rows, errors = await self._parse_bulk_rows(records)
+        values, valid = await self._resolve_bulk_rows(rows, errors)
+        errors.sort(key=lambda error: error.row)
+        
+        created: List[Tuple[int, int]] = []
+        skipped = 0
+        if values and not (atomic and errors):
+            created = await self._insert_bulk_enrollments(values)
+            skipped = valid - len(created)
+        
+        return EnrollmentBulkResult(
+            received=received,
+            created=len(created),
+            skipped=skipped,
+            failed=len(errors),
+            atomic=atomic,
+            errors=errors,
+        )
+    
+    async def _parse_bulk_rows(
+        self, records: AsyncIterable[Dict[str, Any]]
+    ) -> Tuple[int, List[Tuple[int, EnrollmentCreate]], List[BulkRowError]]:
+        """Validate the shape of uploaded rows.
+        
+        Args:
+            records: Raw rows with estudiante_id and subject_id
+        
+        Returns:
+            Number of rows received, valid (row number, data) pairs and row errors
+        
+        Raises:
+            BulkFormatError: If the upload exceeds the row limit
+        """
+        rows: List[Tuple[int, EnrollmentCreate]] = []
+        errors: List[BulkRowError] = []
+        received = 0
+        async for record in records:
+            received += 1
+            if received > settings.bulk_upload_max_rows:
+                raise BulkFormatError(f"Upload exceeds {settings.bulk_upload_max_rows} rows")
+            try:
+                rows.append((received, EnrollmentCreate.model_validate(record)))
+            except ValueError as e:
+                errors.append(BulkRowError(row=received, error=format_row_error(e)))
+        return received, rows, errors
+    
+    async def _resolve_bulk_rows(
+        self, rows: List[Tuple[int, EnrollmentCreate]], errors: List[BulkRowError]
+    ) -> Tuple[List[Dict[str, int]], int]:
+        """Check students and subjects of the batch with one query each.
+        
+        Args:
+            rows: Valid (row number, data) pairs
+            errors: Row errors, extended in place
+        
+        Returns:
+            Distinct enrollment values to insert and the number of valid rows
+        """
+        roles = await self.user_repository.get_roles_by_ids(row.estudiante_id for _, row in rows)
+        subject_ids = await self.subject_repository.get_existing_ids(row.subject_id for _, row in rows)
+        
+        values: List[Dict[str, int]] = []
+        seen: Set[Tuple[int, int]] = set()
+        valid = 0
+        for row_number, row in rows:
+            error = self._bulk_row_error(row, roles.get(row.estudiante_id), subject_ids)
+            if error:
+                errors.append(BulkRowError(row=row_number, error=error))
+                continue
+            valid += 1
+            key = (row.estudiante_id, row.subject_id)
+            if key not in seen:
+                seen.add(key)
+                values.append({"estudiante_id": row.estudiante_id, "subject_id": row.subject_id})
+        return values, valid
+    
+    @staticmethod
+    def _bulk_row_error(row: EnrollmentCreate, role: Optional[UserRole], subject_ids: Set[int]) -> Optional[str]:
+        """Get why a row cannot be enrolled (None if it can)."""
+        if role is None:
+            return f"Estudiante {row.estudiante_id} not found"
+        if role != UserRole.ESTUDIANTE:
+            return f"User {row.estudiante_id} is not an Estudiante"
+        if row.subject_id not in subject_ids:
+            return f"Subject {row.subject_id} not found"
+        return None
+    
+    async def _insert_bulk_enrollments(self, values: List[Dict[str, int]]) -> List[Tuple[int, int]]:
+        """Insert enrollments, skipping existing ones, and invalidate their reports.
+        
+        Args:
+            values: Distinct enrollment values
+        
+        Returns:
+            (estudiante_id, subject_id) of the enrollments created
+        """
+        created: List[Tuple[int, int]] = await self.repository.insert_ignore_conflicts(
+            values,
+            conflict_columns=["estudiante_id", "subject_id"],
+            returning=[Enrollment.estudiante_id, Enrollment.subject_id],
+            chunk_size=settings.bulk_insert_chunk_size,
+        )
+        await unit_of_work.commit(self.db)
+        for estudiante_id, subject_id in created:
+            await unit_of_work.after_commit(self.db, report_cache.invalidate_enrollment, estudiante_id, subject_id)
+        return created
     
     async def get_enrollment_by_id(self, enrollment_id: int) -> Enrollment | None:
         """Get enrollment by ID.
@@ -110,6 +249,17 @@ class EnrollmentService:
         Returns:
             True if deleted, False if not found
         """
-        return await self.repository.delete(enrollment_id)
+        enrollment = await self.repository.get_by_id(enrollment_id)
+        if not enrollment:
+            return False
+        
+        deleted = await self.repository.delete(enrollment_id)
+        if deleted:
+            await unit_of_work.after_commit(
+                self.db, report_cache.invalidate_enrollment, enrollment.estudiante_id, enrollment.subject_id
+            )
+            # Grades are deleted with the enrollment
+            await unit_of_work.after_commit(self.db, cache.invalidate_tags, enrollment_cache_tag(enrollment_id))
+        return deleted
 
 
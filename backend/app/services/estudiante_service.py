@@ -2,6 +2,8 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
+from app.core.read_replica import reads_from_replica
+from app.core.report_cache import report_cache
 from app.services.user_service import UserService
 from app.services.grade_service import GradeService
 from app.repositories.enrollment_repository import EnrollmentRepository
@@ -130,17 +132,18 @@ class EstudianteService:
             "subjects": [],
         }
         
+        # Load grades and averages for all enrollments at once
+        report_grades = await self.grade_service.get_report_grades_by_estudiante(
+            self.estudiante_user.id
+        )
+        
         for enrollment in enrollments:
             # Subject already loaded via eager loading
             subject = getattr(enrollment, 'subject', None)
             if not subject:
                 continue
             
-            grades = await self.grade_service.get_grades_by_enrollment(enrollment.id)
-            try:
-                average = await self.grade_service.calculate_average(enrollment.id)
-            except ValueError:
-                average = None
+            grades, average = report_grades.get(enrollment.id, ([], None))
             
             report_data["subjects"].append({
                 "subject": {
@@ -177,11 +180,33 @@ class EstudianteService:
         else:
             report_data["general_average"] = None
     
-    async def generate_general_report(self, format: str = "pdf") -> dict:
+    async def generate_general_report(self, format: str = "pdf", stream: bool = False) -> dict:
         """Generate general report with all subjects and grades using Factory Method.
         
+        Non-streamed reports are served from the report cache until the estudiante,
+        their subjects, grades or enrollments change.
+        
+        Args:
+            format: Report format (pdf, html, json)
+            stream: Return content as an iterator of chunks when the format supports it
+        
+        Returns:
+            Report with content, filename, and content_type
+        """
+        if stream:
+            return await self._render_general_report(format, stream=True)
+        return await report_cache.get_or_generate(
+            "general", "estudiante", self.estudiante_user.id, format,
+            lambda: self._render_general_report(format),
+            store=not reads_from_replica(self.db),
+        )
+    
+    async def _render_general_report(self, format: str, stream: bool = False) -> dict:
+        """Build general report data and render it in the requested format.
+        
         Args:
             format: Report format (pdf, html, json)
+            stream: Return content as an iterator of chunks when the format supports it
         
         Returns:
             Report with content, filename, and content_type
@@ -202,7 +227,7 @@ class EstudianteService:
         
         # Use Factory Method to generate report
         generator = ReportFactory.create_generator(format)
-        return generator.generate(report_data)
+        return await generator.render(report_data, stream=stream)
     
     async def update_profile(self, user_data: UserUpdate) -> User:
         """Update estudiante's own profile.
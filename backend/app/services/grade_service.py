@@ -1,11 +1,29 @@
 """Grade service with business logic."""
 
 from decimal import Decimal
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.grade_repository import GradeRepository
 from app.repositories.enrollment_repository import EnrollmentRepository
-from app.schemas.grade import GradeCreate, GradeUpdate
+from app.repositories.grade_stats_repository import GradeStatsRepository
+from app.schemas.bulk import BulkRowError, format_row_error
+from app.schemas.grade import GradeBulkResult, GradeBulkRow, GradeCreate, GradeUpdate
 from app.models.grade import Grade
+from app.core import unit_of_work
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.report_cache import report_cache
+from app.utils.bulk_ingest import BulkFormatError
+
+
+# Cache tag of results derived from an enrollment's grades
+ENROLLMENT_CACHE_TAG = "enrollment:{enrollment_id}"
+
+
+def enrollment_cache_tag(enrollment_id: int) -> str:
+    """Cache tag of results derived from an enrollment's grades."""
+    return ENROLLMENT_CACHE_TAG.format(enrollment_id=enrollment_id)
 
 
 class GradeService:
@@ -19,6 +37,7 @@ class GradeService:
         """
         self.repository = GradeRepository(db)
         self.enrollment_repository = EnrollmentRepository(db)
+        self.stats_repository = GradeStatsRepository(db)
         self.db = db
     
     async def create_grade(self, grade_data: GradeCreate) -> Grade:
@@ -42,10 +61,15 @@ class GradeService:
         if not enrollment:
             raise ValueError("Enrollment not found")
         
-        # Create grade
+        # Create grade (enrollment stats are refreshed by the flush hook before commit)
         grade_dict = grade_data.model_dump()
         # Keep as Decimal for Numeric column
-        return await self.repository.create(grade_dict)
+        grade = await self.repository.create(grade_dict)
+        await unit_of_work.after_commit(
+            self.db, report_cache.invalidate_enrollment, enrollment.estudiante_id, enrollment.subject_id
+        )
+        await unit_of_work.after_commit(self.db, cache.invalidate_tags, enrollment_cache_tag(enrollment.id))
+        return grade
     
     async def get_grade_by_id(self, grade_id: int) -> Grade | None:
         """Get grade by ID.
@@ -80,7 +104,15 @@ class GradeService:
         
         update_dict = grade_data.model_dump(exclude_unset=True)
         # Keep as Decimal for Numeric column
-        return await self.repository.update(grade_id, update_dict)
+        grade = await self.repository.update(grade_id, update_dict, commit=False)
+        if grade and 'nota' in update_dict:
+            # Bulk UPDATE bypasses the flush hook; refresh stats in the same transaction
+            await self.stats_repository.refresh([grade.enrollment_id])
+        await unit_of_work.commit(self.db)
+        if grade:
+            await unit_of_work.after_commit(self.db, cache.invalidate_tags, enrollment_cache_tag(grade.enrollment_id))
+            await self._invalidate_reports(grade)
+        return grade
     
     async def delete_grade(self, grade_id: int) -> bool:
         """Delete grade.
@@ -91,7 +123,179 @@ class GradeService:
         Returns:
             True if deleted, False if not found
         """
-        return await self.repository.delete(grade_id)
+        # Resolve the owners before the row is gone
+        grade = await self.repository.get_by_id(grade_id)
+        if not grade:
+            return False
+        owner_ids = await self.repository.get_estudiante_and_subject_ids(grade_id)
+        deleted = await self.repository.delete(grade_id, commit=False)
+        if deleted:
+            # Bulk DELETE bypasses the flush hook; refresh stats in the same transaction
+            await self.stats_repository.refresh([grade.enrollment_id])
+        await unit_of_work.commit(self.db)
+        if deleted:
+            await unit_of_work.after_commit(self.db, cache.invalidate_tags, enrollment_cache_tag(grade.enrollment_id))
+        if deleted and owner_ids:
+            await unit_of_work.after_commit(self.db, report_cache.invalidate_enrollment, *owner_ids)
+        return deleted
+    
+    async def bulk_create_grades(
+        self,
+        subject_id: int,
+        periodo: str,
+        records: AsyncIterable[Dict[str, Any]],
+        atomic: bool = True,
+    ) -> GradeBulkResult:
+        """Create many grades of one subject and period.
+        
+        Rows are validated one by one, their enrollments are checked against
+        the subject with a single query and the valid rows are written with
+        multi-row INSERT statements in one transaction.
+        
+        Args:
+            subject_id: Subject every row belongs to
+            periodo: Academic period applied to every row
+            records: Raw rows (e.g. from ``app.utils.bulk_ingest.iter_records``)
+            atomic: Insert nothing if any row fails; otherwise insert the valid rows
+        
+        Returns:
+            Counts and per-row errors
+        
+        Raises:
+            BulkFormatError: If the body is malformed or exceeds the row limit
+        """
+        received, rows, errors = await self._parse_bulk_rows(records)
+        
+        # One query validates every row against the subject's enrollments
+        estudiantes_by_enrollment = await self.enrollment_repository.get_estudiante_ids_by_subject(subject_id)
+        enrollments_by_estudiante = {
+            estudiante_id: enrollment_id
+            for enrollment_id, estudiante_id in estudiantes_by_enrollment.items()
+        }
+        values: List[Dict[str, Any]] = []
+        for row_number, row in rows:
+            enrollment_id, error = self._resolve_bulk_enrollment(
+                row, subject_id, estudiantes_by_enrollment, enrollments_by_estudiante
+            )
+            if error:
+                errors.append(BulkRowError(row=row_number, error=error))
+                continue
+            values.append({
+                "enrollment_id": enrollment_id,
+                "nota": row.nota,
+                "periodo": periodo,
+                "fecha": row.fecha,
+                "observaciones": row.observaciones,
+            })
+        
+        errors.sort(key=lambda error: error.row)
+        inserted = 0
+        if values and not (atomic and errors):
+            inserted = await self._insert_bulk_grades(subject_id, values, estudiantes_by_enrollment)
+        
+        return GradeBulkResult(
+            received=received,
+            inserted=inserted,
+            failed=len(errors),
+            atomic=atomic,
+            errors=errors,
+        )
+    
+    async def _parse_bulk_rows(
+        self, records: AsyncIterable[Dict[str, Any]]
+    ) -> Tuple[int, List[Tuple[int, GradeBulkRow]], List[BulkRowError]]:
+        """Validate the shape of uploaded rows.
+        
+        Args:
+            records: Raw rows
+        
+        Returns:
+            Number of rows received, valid (row number, data) pairs and row errors
+        
+        Raises:
+            BulkFormatError: If the upload exceeds the row limit
+        """
+        rows: List[Tuple[int, GradeBulkRow]] = []
+        errors: List[BulkRowError] = []
+        received = 0
+        async for record in records:
+            received += 1
+            if received > settings.bulk_upload_max_rows:
+                raise BulkFormatError(f"Upload exceeds {settings.bulk_upload_max_rows} rows")
+            try:
+                rows.append((received, GradeBulkRow.model_validate(record)))
+            except ValueError as e:
+                errors.append(BulkRowError(row=received, error=format_row_error(e)))
+        return received, rows, errors
+    
+    @staticmethod
+    def _resolve_bulk_enrollment(
+        row: GradeBulkRow,
+        subject_id: int,
+        estudiantes_by_enrollment: Dict[int, int],
+        enrollments_by_estudiante: Dict[int, int],
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """Find the subject enrollment a row refers to.
+        
+        Args:
+            row: Validated row (by enrollment_id or estudiante_id)
+            subject_id: Subject of the upload
+            estudiantes_by_enrollment: Estudiante ID by enrollment ID of the subject
+            enrollments_by_estudiante: Enrollment ID by estudiante ID of the subject
+        
+        Returns:
+            Enrollment ID and None, or None and the row error
+        """
+        if row.enrollment_id is not None:
+            if row.enrollment_id not in estudiantes_by_enrollment:
+                return None, f"Enrollment {row.enrollment_id} does not belong to subject {subject_id}"
+            return row.enrollment_id, None
+        enrollment_id = enrollments_by_estudiante.get(row.estudiante_id)
+        if enrollment_id is None:
+            return None, f"Estudiante {row.estudiante_id} is not enrolled in subject {subject_id}"
+        return enrollment_id, None
+    
+    async def _insert_bulk_grades(
+        self, subject_id: int, values: List[Dict[str, Any]], estudiantes_by_enrollment: Dict[int, int]
+    ) -> int:
+        """Insert grades, refresh their statistics and invalidate dependent caches.
+        
+        Args:
+            subject_id: Subject of the upload
+            values: Grade column values
+            estudiantes_by_enrollment: Estudiante ID by enrollment ID of the subject
+        
+        Returns:
+            Number of grades inserted
+        """
+        inserted: int = await self.repository.bulk_insert(values, settings.bulk_insert_chunk_size)
+        enrollment_ids = {value["enrollment_id"] for value in values}
+        # Multi-row INSERT bypasses the flush hook; refresh stats in the same transaction
+        await self.stats_repository.refresh(enrollment_ids)
+        await unit_of_work.commit(self.db)
+        for enrollment_id in enrollment_ids:
+            await unit_of_work.after_commit(
+                self.db, report_cache.invalidate_enrollment, estudiantes_by_enrollment[enrollment_id], subject_id
+            )
+        await unit_of_work.after_commit(
+            self.db, cache.invalidate_tags, *(enrollment_cache_tag(enrollment_id) for enrollment_id in enrollment_ids)
+        )
+        return inserted
+    
+    async def _invalidate_reports(self, grade: Grade) -> None:
+        """Invalidate cached reports of the student and subject of a grade.
+        
+        Reuses the grade's enrollment when it is already loaded.
+        
+        Args:
+            grade: Grade instance
+        """
+        if 'enrollment' not in inspect(grade).unloaded and grade.enrollment is not None:
+            owner_ids = (grade.enrollment.estudiante_id, grade.enrollment.subject_id)
+        else:
+            owner_ids = await self.repository.get_estudiante_and_subject_ids(grade.id)
+        if owner_ids:
+            await unit_of_work.after_commit(self.db, report_cache.invalidate_enrollment, *owner_ids)
     
     async def get_grades_by_enrollment(
         self, enrollment_id: int, skip: int = 0, limit: int = 100
@@ -108,9 +312,30 @@ class GradeService:
         """
         return await self.repository.get_by_enrollment(enrollment_id, skip, limit)
     
+    async def get_grades_by_estudiante_and_subject(self, estudiante_id: int, subject_id: int) -> list[Grade]:
+        """Get an estudiante's grades in a subject.
+        
+        Args:
+            estudiante_id: Estudiante user ID
+            subject_id: Subject ID
+        
+        Returns:
+            List of grades
+        
+        Raises:
+            ValueError: If the estudiante is not enrolled in the subject
+        """
+        enrollment = await self.enrollment_repository.get_by_estudiante_and_subject(estudiante_id, subject_id)
+        if not enrollment:
+            raise ValueError("Estudiante is not enrolled in this subject")
+        return await self.get_grades_by_enrollment(enrollment.id)
+    
+    @cache.cached(namespace="grades.average", tags=(ENROLLMENT_CACHE_TAG,))
     async def calculate_average(self, enrollment_id: int) -> Decimal:
         """Calculate average grade for an enrollment.
         
+        Cached per enrollment until one of its grades changes.
+        
         Args:
             enrollment_id: Enrollment ID
         
@@ -123,6 +348,52 @@ class GradeService:
         average = await self.repository.get_average_by_enrollment(enrollment_id)
         if average is None:
             raise ValueError("No grades found for this enrollment")
-        # Round to 2 decimal places
+        return self._round_average(average)
+    
+    async def get_report_grades_by_estudiante(
+        self, estudiante_id: int
+    ) -> dict[int, tuple[list[Grade], Decimal | None]]:
+        """Get grades and averages for all enrollments of a student.
+        
+        Args:
+            estudiante_id: Estudiante user ID
+        
+        Returns:
+            Mapping of enrollment ID to (grades, average). Enrollments
+            without grades are not included.
+        """
+        report_data = await self.repository.get_report_data_by_estudiante(estudiante_id)
+        return self._to_report_grades(report_data)
+    
+    async def get_report_grades_by_subject(
+        self, subject_id: int
+    ) -> dict[int, tuple[list[Grade], Decimal | None]]:
+        """Get grades and averages for all enrollments of a subject.
+        
+        Args:
+            subject_id: Subject ID
+        
+        Returns:
+            Mapping of enrollment ID to (grades, average). Enrollments
+            without grades are not included.
+        """
+        report_data = await self.repository.get_report_data_by_subject(subject_id)
+        return self._to_report_grades(report_data)
+    
+    def _to_report_grades(
+        self, report_data: dict
+    ) -> dict[int, tuple[list[Grade], Decimal | None]]:
+        """Convert repository report data into (grades, rounded average) tuples."""
+        return {
+            enrollment_id: (
+                entry["grades"],
+                self._round_average(entry["average"]) if entry["average"] is not None else None,
+            )
+            for enrollment_id, entry in report_data.items()
+        }
+    
+    @staticmethod
+    def _round_average(average: float) -> Decimal:
+        """Round an average to 2 decimal places."""
         return Decimal(str(round(average, 2)))
 
@@ -0,0 +1,73 @@
+"""Permission service for profesor-to-subject checks."""
+
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.permission_cache import subject_assignment_cache
+from app.core.read_replica import reads_from_replica
+from app.repositories.enrollment_repository import EnrollmentRepository
+from app.repositories.subject_repository import SubjectRepository
+
+
+class PermissionService:
+    """Service answering whether a profesor may act on a subject.
+
+    Assignments come from ``subject_assignment_cache``: a cached profesor
+    is checked with a set lookup, an uncached one costs a single query for
+    the IDs of their subjects. A subject missing from the cached set is
+    confirmed with one EXISTS query (it may have been assigned in another
+    worker process) before access is denied. Sets loaded from the read
+    replica may lag behind the primary and are not cached.
+
+    A cached positive may be stale for up to the cache TTL when the subject
+    was reassigned in another worker process. Reads accept that; write
+    paths pass ``for_write=True`` so the positive is confirmed with the
+    same EXISTS query and a former profesor loses write access at once.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """Initialize permission service.
+
+        Args:
+            db: Database session
+        """
+        self.subject_repo = SubjectRepository(db)
+        self.enrollment_repo = EnrollmentRepository(db)
+        self.db = db
+
+    async def profesor_teaches(self, profesor_id: int, subject_id: int, for_write: bool = False) -> bool:
+        """Check whether a subject is assigned to a profesor.
+
+        Args:
+            profesor_id: Profesor user ID
+            subject_id: Subject ID
+            for_write: Confirm a cached positive against the database
+
+        Returns:
+            True if the subject exists and is assigned to the profesor
+        """
+        subject_ids = subject_assignment_cache.get(profesor_id)
+        if subject_ids is None:
+            generation = subject_assignment_cache.generation
+            loaded_ids = await self.subject_repo.get_ids_by_profesor(profesor_id)
+            if not reads_from_replica(self.db):
+                subject_assignment_cache.set(profesor_id, loaded_ids, generation)
+            return subject_id in loaded_ids
+        if subject_id in subject_ids and not for_write:
+            return True
+
+        assigned = await self.subject_repo.is_assigned_to(subject_id, profesor_id)
+        if assigned != (subject_id in subject_ids):
+            # Reassigned since the set was cached
+            subject_assignment_cache.invalidate_profesores(profesor_id)
+        return assigned
+
+    async def get_enrollment_subject_id(self, enrollment_id: int) -> Optional[int]:
+        """Get the subject of an enrollment.
+
+        Args:
+            enrollment_id: Enrollment ID
+
+        Returns:
+            Subject ID or None if the enrollment does not exist
+        """
+        return await self.enrollment_repo.get_subject_id(enrollment_id)
@@ -1,15 +1,19 @@
 """Profesor service with profesor-specific business logic."""
 
+from typing import Any, AsyncIterable, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User
 from app.models.subject import Subject
 from app.models.grade import Grade
+from app.core.read_replica import reads_from_replica
+from app.core.report_cache import report_cache
 from app.services.subject_service import SubjectService
 from app.services.grade_service import GradeService
+from app.services.permission_service import PermissionService
 from app.services.user_service import UserService
 from app.repositories.enrollment_repository import EnrollmentRepository
 from app.repositories.subject_repository import SubjectRepository
-from app.schemas.grade import GradeCreate
+from app.schemas.grade import GradeBulkResult, GradeCreate
 from app.schemas.user import UserUpdate
 
 
@@ -30,6 +34,7 @@ class ProfesorService:
         self.user_service = UserService(db)
         self.enrollment_repo = EnrollmentRepository(db)
         self.subject_repo = SubjectRepository(db)
+        self.permissions = PermissionService(db)
     
     async def get_assigned_subjects(self) -> list[Subject]:
         """Get all subjects assigned to this profesor.
@@ -52,8 +57,7 @@ class ProfesorService:
             ValueError: If subject is not assigned to this profesor
         """
         # Verify subject is assigned to this profesor
-        subject = await self.subject_repo.get_by_id(subject_id)
-        if not subject or subject.profesor_id != self.profesor_user.id:
+        if not await self.permissions.profesor_teaches(self.profesor_user.id, subject_id):
             raise ValueError("Subject is not assigned to this profesor")
         
         # Get enrollments with eager-loaded estudiante relationships (batch query)
@@ -86,8 +90,7 @@ class ProfesorService:
             ValueError: If subject is not assigned to this profesor or enrollment invalid
         """
         # Verify subject is assigned to this profesor
-        subject = await self.subject_repo.get_by_id(subject_id)
-        if not subject or subject.profesor_id != self.profesor_user.id:
+        if not await self.permissions.profesor_teaches(self.profesor_user.id, subject_id, for_write=True):
             raise ValueError("Subject is not assigned to this profesor")
         
         # Verify enrollment exists and is for this subject
@@ -98,6 +101,34 @@ class ProfesorService:
         # Create grade
         return await self.grade_service.create_grade(grade_data)
     
+    async def bulk_create_grades(
+        self,
+        subject_id: int,
+        periodo: str,
+        records: AsyncIterable[Dict[str, Any]],
+        atomic: bool = True,
+    ) -> GradeBulkResult:
+        """Create many grades for an assigned subject.
+        
+        The assignment is checked once for the whole batch.
+        
+        Args:
+            subject_id: Subject ID (must be assigned to this profesor)
+            periodo: Academic period applied to every row
+            records: Raw rows
+            atomic: Insert nothing if any row fails
+        
+        Returns:
+            Counts and per-row errors
+        
+        Raises:
+            ValueError: If subject is not assigned to this profesor
+        """
+        if not await self.permissions.profesor_teaches(self.profesor_user.id, subject_id, for_write=True):
+            raise ValueError("Subject is not assigned to this profesor")
+        
+        return await self.grade_service.bulk_create_grades(subject_id, periodo, records, atomic)
+    
     async def get_subject_with_students(self, subject_id: int) -> dict:
         """Get subject with list of enrolled students.
         
@@ -140,17 +171,16 @@ class ProfesorService:
             "students": [],
         }
         
+        # Load grades and averages for all enrollments at once
+        report_grades = await self.grade_service.get_report_grades_by_subject(subject.id)
+        
         for enrollment in enrollments:
             # Estudiante already loaded via eager loading
             estudiante = getattr(enrollment, 'estudiante', None)
             if not estudiante:
                 continue
             
-            grades = await self.grade_service.get_grades_by_enrollment(enrollment.id)
-            try:
-                average = await self.grade_service.calculate_average(enrollment.id)
-            except ValueError:
-                average = None
+            grades, average = report_grades.get(enrollment.id, ([], None))
             
             report_data["students"].append({
                 "estudiante": {
@@ -166,27 +196,51 @@ class ProfesorService:
         return report_data
     
     async def generate_subject_report(
-        self, subject_id: int, format: str = "pdf"
+        self, subject_id: int, format: str = "pdf", stream: bool = False
     ) -> dict:
         """Generate report of grades for a subject using Factory Method.
         
+        Non-streamed reports are served from the report cache until the subject,
+        its students, grades or enrollments change. Assignment is always verified
+        before the cache is consulted.
+        
         Args:
             subject_id: Subject ID
             format: Report format (pdf, html, json)
+            stream: Return content as an iterator of chunks when the format supports it
         
         Returns:
             Report with content, filename, and content_type
         """
-        from app.factories import ReportFactory  # Import from __init__.py to ensure generators are registered
-        
         # Verify subject is assigned
         subject = await self.subject_repo.get_by_id(subject_id)
         if not subject or subject.profesor_id != self.profesor_user.id:
             raise ValueError("Subject is not assigned to this profesor")
         
+        if stream:
+            return await self._render_subject_report(subject, format, stream=True)
+        return await report_cache.get_or_generate(
+            "subject", "subject", subject_id, format,
+            lambda: self._render_subject_report(subject, format),
+            store=not reads_from_replica(self.db),
+        )
+    
+    async def _render_subject_report(self, subject: Subject, format: str, stream: bool = False) -> dict:
+        """Build subject report data and render it in the requested format.
+        
+        Args:
+            subject: Subject instance (already verified as assigned)
+            format: Report format (pdf, html, json)
+            stream: Return content as an iterator of chunks when the format supports it
+        
+        Returns:
+            Report with content, filename, and content_type
+        """
+        from app.factories import ReportFactory  # Import from __init__.py to ensure generators are registered
+        
         # Get enrollments with eager-loaded estudiante relationships (batch query)
         enrollments = await self.enrollment_repo.get_many_with_relations(
-            subject_id=subject_id,
+            subject_id=subject.id,
             relations=['estudiante']
         )
         
@@ -195,7 +249,7 @@ class ProfesorService:
         
         # Use Factory Method to generate report
         generator = ReportFactory.create_generator(format)
-        return generator.generate(report_data)
+        return await generator.render(report_data, stream=stream)
     
     async def update_profile(self, user_data: UserUpdate) -> User:
         """Update profesor's own profile.
@@ -1,6 +1,10 @@
 """Subject service with business logic."""
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import unit_of_work
+from app.core.permission_cache import subject_assignment_cache
+from app.core.report_cache import report_cache
+from app.repositories.enrollment_repository import EnrollmentRepository
 from app.repositories.subject_repository import SubjectRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.subject import SubjectCreate, SubjectUpdate
@@ -80,7 +84,9 @@ class SubjectService:
         # Create subject
         subject_dict = subject_data.model_dump(exclude={'codigo_institucional'})
         subject_dict['codigo_institucional'] = codigo_institucional
-        return await self.repository.create(subject_dict)
+        subject = await self.repository.create(subject_dict)
+        await unit_of_work.after_commit(self.db, subject_assignment_cache.invalidate_profesores, subject.profesor_id)
+        return subject
     
     async def get_subject_by_id(self, subject_id: int) -> Subject | None:
         """Get subject by ID.
@@ -117,7 +123,19 @@ class SubjectService:
             await self._validate_profesor(subject_data.profesor_id)
         
         update_dict = subject_data.model_dump(exclude_unset=True)
-        return await self.repository.update(subject_id, update_dict)
+        previous_profesor_id = None
+        if update_dict.get('profesor_id') is not None:
+            previous_profesor_id = await self.repository.get_profesor_id(subject_id)
+        
+        subject = await self.repository.update(subject_id, update_dict)
+        await self._invalidate_reports(subject_id)
+        if previous_profesor_id is not None and previous_profesor_id != update_dict['profesor_id']:
+            # Reassigned: both profesores' permission sets changed
+            await unit_of_work.after_commit(
+                self.db, subject_assignment_cache.invalidate_profesores,
+                previous_profesor_id, update_dict['profesor_id'],
+            )
+        return subject
     
     async def delete_subject(self, subject_id: int) -> bool:
         """Delete subject.
@@ -128,7 +146,28 @@ class SubjectService:
         Returns:
             True if deleted, False if not found
         """
-        return await self.repository.delete(subject_id)
+        profesor_id = await self.repository.get_profesor_id(subject_id)
+        # Read enrollments before the delete cascades them away
+        await self._invalidate_reports(subject_id)
+        deleted = await self.repository.delete(subject_id)
+        if deleted:
+            await unit_of_work.after_commit(self.db, subject_assignment_cache.invalidate_profesores, profesor_id)
+        return deleted
+    
+    async def _invalidate_reports(self, subject_id: int) -> None:
+        """Drop cached reports showing a subject once the transaction commits.
+        
+        Covers the subject report and the student reports of everyone
+        enrolled in the subject.
+        
+        Args:
+            subject_id: Subject ID
+        """
+        estudiantes = await EnrollmentRepository(self.db).get_estudiante_ids_by_subject(subject_id)
+        await unit_of_work.after_commit(self.db, report_cache.invalidate, "subject", subject_id)
+        await unit_of_work.after_commit(
+            self.db, report_cache.invalidate_many, "estudiante", set(estudiantes.values())
+        )
     
     async def get_subjects_by_profesor(
         self, profesor_id: int, skip: int = 0, limit: int = 100
@@ -1,11 +1,25 @@
 """User service with business logic."""
 
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.enrollment_repository import EnrollmentRepository
 from app.repositories.user_repository import UserRepository
-from app.schemas.user import UserCreate, UserUpdate
-from app.models.user import User
-from app.utils.codigo_generator import generar_codigo_institucional
-from app.core.security import get_password_hash
+from app.schemas.bulk import BulkRowError, format_row_error
+from app.schemas.user import UserBulkCreated, UserBulkResult, UserCreate, UserUpdate
+from app.models.user import User, UserRole
+from app.utils.bulk_ingest import BulkFormatError
+from app.utils.codigo_generator import generar_codigo_institucional, reservar_codigos_institucionales
+from app.core import unit_of_work
+from app.core.config import settings
+from app.core.security import bulk_password_hasher, get_password_hash_async
+from app.core.principal_cache import principal_cache
+from app.core.report_cache import report_cache
+
+# Roles that can be created through the API (admins are provisioned separately)
+CREATABLE_ROLES = (UserRole.ESTUDIANTE, UserRole.PROFESOR)
+
+# Called with (stage, done, total); stages are "validated", "hashed" and "inserted"
+ImportProgress = Callable[[str, int, int], None]
 
 
 class UserService:
@@ -37,33 +51,227 @@ class UserService:
         if existing_user:
             raise ValueError("Email already registered")
         
+        # Hash before generating the code so the code counter stays locked only briefly
+        password_hash = await get_password_hash_async(user_data.password)
+        
         # Generate institutional code
         codigo = await generar_codigo_institucional(self.db, user_data.role.value)
         
         # Create user data dict
         user_dict = {
             "email": user_data.email,
-            "password_hash": get_password_hash(user_data.password),
+            "password_hash": password_hash,
             "role": user_data.role,
             "nombre": user_data.nombre,
             "apellido": user_data.apellido,
             "codigo_institucional": codigo,
             "fecha_nacimiento": user_data.fecha_nacimiento,
+            "edad": User.edad_para(user_data.fecha_nacimiento),
             "numero_contacto": user_data.numero_contacto,
             "programa_academico": user_data.programa_academico,
             "ciudad_residencia": user_data.ciudad_residencia,
             "area_ensenanza": user_data.area_ensenanza,
         }
         
-        # Create user
-        user = await self.repository.create(user_dict)
+        # Create user (age included, so a single INSERT)
+        return await self.repository.create(user_dict)
+    
+    async def bulk_import_users(
+        self,
+        records: AsyncIterable[Dict[str, Any]],
+        dry_run: bool = False,
+        atomic: bool = True,
+        progress: Optional[ImportProgress] = None,
+    ) -> UserBulkResult:
+        """Import many estudiantes and profesores at once.
+        
+        Emails are checked for the whole batch with one query, institutional
+        codes are reserved in one block per role, passwords are hashed in
+        the bulk hashing process pool, ``edad`` is computed up front and
+        rows are written with multi-row INSERTs in a single transaction.
         
-        # Calculate and set age
-        user.edad = user.calcular_edad()
-        await self.db.commit()
-        await self.db.refresh(user)
+        Args:
+            records: Raw rows with the UserCreate fields
+            dry_run: Validate and preview codes without hashing or inserting
+            atomic: Import nothing if any row fails validation
+            progress: Optional progress callback
         
-        return user
+        Returns:
+            Created users (or the preview in a dry run) and per-row errors
+        
+        Raises:
+            BulkFormatError: If the body is malformed or exceeds the row limit
+        """
+        received, rows, errors = await self._parse_import_rows(records)
+        rows = await self._drop_registered_emails(rows, errors)
+        errors.sort(key=lambda error: error.row)
+        if progress:
+            progress("validated", received, received)
+        
+        # A dry run still previews the valid rows
+        if not rows or (atomic and errors and not dry_run):
+            return UserBulkResult(
+                received=received, created=0, failed=len(errors),
+                dry_run=dry_run, atomic=atomic, errors=errors,
+            )
+        
+        # Hash before reserving codes so the code counters stay locked only briefly
+        hashes = [] if dry_run else await self._hash_import_passwords(rows, progress)
+        codigos = await self._reserve_import_codes(rows)
+        users = [
+            UserBulkCreated(row=row_number, email=user_data.email, codigo_institucional=codigos[row_number])
+            for row_number, user_data in rows
+        ]
+        
+        if dry_run:
+            # Give the previewed codes back
+            await self.db.rollback()
+            return UserBulkResult(
+                received=received, created=0, failed=len(errors),
+                dry_run=True, atomic=atomic, users=users, errors=errors,
+            )
+        
+        created = await self._insert_imported_users(rows, hashes, codigos, progress)
+        return UserBulkResult(
+            received=received, created=created, failed=len(errors),
+            dry_run=False, atomic=atomic, users=users, errors=errors,
+        )
+    
+    async def _parse_import_rows(
+        self, records: AsyncIterable[Dict[str, Any]]
+    ) -> Tuple[int, List[Tuple[int, UserCreate]], List[BulkRowError]]:
+        """Validate uploaded rows and reject repeated emails.
+        
+        Args:
+            records: Raw rows with the UserCreate fields
+        
+        Returns:
+            Number of rows received, valid (row number, data) pairs and row errors
+        
+        Raises:
+            BulkFormatError: If the upload exceeds the row limit
+        """
+        rows: List[Tuple[int, UserCreate]] = []
+        errors: List[BulkRowError] = []
+        seen_emails: Set[str] = set()
+        received = 0
+        async for record in records:
+            received += 1
+            if received > settings.bulk_upload_max_rows:
+                raise BulkFormatError(f"Upload exceeds {settings.bulk_upload_max_rows} rows")
+            try:
+                user_data = UserCreate.model_validate(record)
+            except ValueError as e:
+                errors.append(BulkRowError(row=received, error=format_row_error(e)))
+                continue
+            if user_data.role not in CREATABLE_ROLES:
+                errors.append(BulkRowError(row=received, error="Invalid role for user creation"))
+            elif user_data.email in seen_emails:
+                errors.append(BulkRowError(row=received, error="Email repeated in this upload"))
+            else:
+                seen_emails.add(user_data.email)
+                rows.append((received, user_data))
+        return received, rows, errors
+    
+    async def _drop_registered_emails(
+        self, rows: List[Tuple[int, UserCreate]], errors: List[BulkRowError]
+    ) -> List[Tuple[int, UserCreate]]:
+        """Reject rows whose email is already registered (one query for the batch).
+        
+        Args:
+            rows: Valid (row number, data) pairs
+            errors: Row errors, extended in place
+        
+        Returns:
+            Rows with new emails
+        """
+        existing = await self.repository.get_existing_emails({user_data.email for _, user_data in rows})
+        if not existing:
+            return rows
+        kept = []
+        for row_number, user_data in rows:
+            if user_data.email in existing:
+                errors.append(BulkRowError(row=row_number, error="Email already registered"))
+            else:
+                kept.append((row_number, user_data))
+        return kept
+    
+    async def _hash_import_passwords(
+        self, rows: List[Tuple[int, UserCreate]], progress: Optional[ImportProgress]
+    ) -> List[str]:
+        """Hash the passwords of imported rows in the bulk hashing pool.
+        
+        Args:
+            rows: Valid (row number, data) pairs
+            progress: Optional progress callback
+        
+        Returns:
+            Password hashes in row order
+        """
+        return await bulk_password_hasher.hash_all(
+            [user_data.password for _, user_data in rows],
+            progress=(lambda done, total: progress("hashed", done, total)) if progress else None,
+        )
+    
+    async def _reserve_import_codes(self, rows: List[Tuple[int, UserCreate]]) -> Dict[int, str]:
+        """Reserve one block of consecutive institutional codes per role.
+        
+        Args:
+            rows: Valid (row number, data) pairs
+        
+        Returns:
+            Institutional code by row number
+        """
+        codigos: Dict[int, str] = {}
+        for role in CREATABLE_ROLES:
+            role_rows = [row_number for row_number, user_data in rows if user_data.role == role]
+            if role_rows:
+                block = await reservar_codigos_institucionales(self.db, role.value, len(role_rows))
+                codigos.update(zip(role_rows, block))
+        return codigos
+    
+    async def _insert_imported_users(
+        self,
+        rows: List[Tuple[int, UserCreate]],
+        hashes: List[str],
+        codigos: Dict[int, str],
+        progress: Optional[ImportProgress],
+    ) -> int:
+        """Insert imported users with multi-row INSERTs.
+        
+        Args:
+            rows: Valid (row number, data) pairs
+            hashes: Password hashes in row order
+            codigos: Institutional code by row number
+            progress: Optional progress callback
+        
+        Returns:
+            Number of users inserted
+        """
+        values = [
+            {
+                "email": user_data.email,
+                "password_hash": password_hash,
+                "role": user_data.role,
+                "nombre": user_data.nombre,
+                "apellido": user_data.apellido,
+                "codigo_institucional": codigos[row_number],
+                "fecha_nacimiento": user_data.fecha_nacimiento,
+                "edad": User.edad_para(user_data.fecha_nacimiento),
+                "numero_contacto": user_data.numero_contacto,
+                "programa_academico": user_data.programa_academico,
+                "ciudad_residencia": user_data.ciudad_residencia,
+                "area_ensenanza": user_data.area_ensenanza,
+            }
+            for (row_number, user_data), password_hash in zip(rows, hashes)
+        ]
+        chunk_size = settings.bulk_insert_chunk_size
+        for start in range(0, len(values), chunk_size):
+            await self.repository.bulk_insert(values[start:start + chunk_size], chunk_size)
+            if progress:
+                progress("inserted", min(start + chunk_size, len(values)), len(values))
+        await unit_of_work.commit(self.db)
+        return len(values)
     
     async def get_user_by_id(self, user_id: int) -> User | None:
         """Get user by ID.
@@ -107,7 +315,10 @@ class UserService:
                 user.fecha_nacimiento = update_dict["fecha_nacimiento"]
                 update_dict["edad"] = user.calcular_edad()
         
-        return await self.repository.update(user_id, update_dict)
+        user = await self.repository.update(user_id, update_dict)
+        await unit_of_work.after_commit(self.db, principal_cache.invalidate_user, user_id)
+        await self._invalidate_reports(user_id)
+        return user
     
     async def delete_user(self, user_id: int) -> bool:
         """Delete user.
@@ -118,7 +329,24 @@ class UserService:
         Returns:
             True if deleted, False if not found
         """
-        return await self.repository.delete(user_id)
+        # Read enrollments before the delete cascades them away
+        await self._invalidate_reports(user_id)
+        deleted = await self.repository.delete(user_id)
+        await unit_of_work.after_commit(self.db, principal_cache.invalidate_user, user_id)
+        return deleted
+    
+    async def _invalidate_reports(self, user_id: int) -> None:
+        """Drop cached reports showing a user once the transaction commits.
+        
+        Covers the user's own student report and the reports of every
+        subject listing them.
+        
+        Args:
+            user_id: User ID
+        """
+        subject_ids = await EnrollmentRepository(self.db).get_subject_ids_by_estudiante(user_id)
+        await unit_of_work.after_commit(self.db, report_cache.invalidate, "estudiante", user_id)
+        await unit_of_work.after_commit(self.db, report_cache.invalidate_many, "subject", subject_ids)
     
     async def get_users_by_role(self, role: str, skip: int = 0, limit: int = 100) -> list[User]:
         """Get users by role.
@@ -132,5 +360,28 @@ class UserService:
             List of users
         """
         return await self.repository.get_by_role(role, skip, limit)
+    
+    async def get_users_page(
+        self,
+        roles: list[str],
+        cursor: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> tuple[list[User], str | None]:
+        """Get a page of users with the given roles using keyset pagination.
+        
+        Args:
+            roles: User roles to include
+            cursor: Cursor returned with the previous page
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+        
+        Returns:
+            Tuple of (users, next_cursor)
+        
+        Raises:
+            ValueError: If the cursor or pagination parameters are invalid
+        """
+        return await self.repository.get_by_roles_page(roles, cursor=cursor, limit=limit, skip=skip)
 
 
@@ -0,0 +1,307 @@
+"""Streaming parsers for bulk upload request bodies.
+
+Bulk endpoints accept either a CSV document with a header row or a JSON
+array of objects. The body is consumed chunk by chunk and records are
+yielded as soon as they are complete, so an upload is never held in
+memory as a whole.
+"""
+
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+CSV_CONTENT_TYPE = "text/csv"
+JSON_CONTENT_TYPE = "application/json"
+SUPPORTED_CONTENT_TYPES = (CSV_CONTENT_TYPE, JSON_CONTENT_TYPE)
+
+# Upper bound for a single CSV line or JSON element still waiting to be completed
+MAX_RECORD_BYTES = 64 * 1024
+
+
+class BulkFormatError(ValueError):
+    """Raised when a bulk upload body is malformed or of an unsupported type."""
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """Extract the media type of a Content-Type header.
+
+    Args:
+        content_type: Content-Type header value
+
+    Returns:
+        Lower-cased media type without parameters ('' if missing)
+    """
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], content_type: Optional[str]
+) -> AsyncIterator[Dict[str, Any]]:
+    """Parse a streamed bulk upload body into records.
+
+    Args:
+        chunks: Body chunks (e.g. ``Request.stream()``)
+        content_type: Content-Type header of the request
+
+    Yields:
+        One dictionary per CSV row or JSON array element
+
+    Raises:
+        BulkFormatError: If the content type is unsupported or the body is malformed
+    """
+    kind = media_type(content_type)
+    if kind == CSV_CONTENT_TYPE:
+        parser = iter_csv_records(chunks)
+    elif kind == JSON_CONTENT_TYPE:
+        parser = iter_json_records(chunks)
+    else:
+        raise BulkFormatError(
+            f"Unsupported content type '{kind}'; use {' or '.join(SUPPORTED_CONTENT_TYPES)}"
+        )
+    async for record in parser:
+        yield record
+
+
+async def _iter_text(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode UTF-8 body chunks (a leading BOM is dropped)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        async for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise BulkFormatError("Body is not valid UTF-8") from e
+    if text:
+        yield text
+
+
+class _CsvRows:
+    """Incremental CSV splitter yielding data rows keyed by the header row."""
+
+    def __init__(self) -> None:
+        """Initialize an empty splitter."""
+        self.header: Optional[List[str]] = None
+        self.pending = ""
+
+    def feed(self, text: str) -> Iterator[Dict[str, Any]]:
+        """Add decoded text and yield the rows it completes.
+
+        Raises:
+            BulkFormatError: If a row is malformed or grows beyond ``MAX_RECORD_BYTES``
+        """
+        self.pending += text
+        for line in self._complete_lines():
+            record = self._parse(line)
+            if record is not None:
+                yield record
+        if len(self.pending) > MAX_RECORD_BYTES:
+            raise BulkFormatError(f"CSV row exceeds {MAX_RECORD_BYTES} bytes")
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """Parse the last row once the body has ended.
+
+        Raises:
+            BulkFormatError: If a quoted field is unterminated or there is no header row
+        """
+        if self.pending.count('"') % 2:
+            raise BulkFormatError("Unterminated quoted field in CSV")
+        record = self._parse(self.pending)
+        self.pending = ""
+        if self.header is None:
+            raise BulkFormatError("CSV body has no header row")
+        return record
+
+    def _complete_lines(self) -> Iterator[str]:
+        """Remove and yield the complete lines of the pending text."""
+        # A record is complete at a newline outside quotes (even number of quotes so far)
+        start = 0
+        while True:
+            newline = self.pending.find("\n", start)
+            if newline == -1:
+                return
+            candidate = self.pending[:newline + 1]
+            if candidate.count('"') % 2:
+                start = newline + 1
+                continue
+            self.pending = self.pending[newline + 1:]
+            start = 0
+            yield candidate
+
+    def _parse(self, line: str) -> Optional[Dict[str, Any]]:
+        """Parse one line; the first non-empty line is the header."""
+        if not line.strip():
+            return None
+        try:
+            values = next(csv.reader([line]))
+        except csv.Error as e:
+            raise BulkFormatError(f"Malformed CSV row: {e}") from e
+        if self.header is None:
+            self.header = [name.strip() for name in values]
+            return None
+        return {
+            name: (value.strip() or None)
+            for name, value in zip(self.header, values)
+        }
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Dict[str, Any]]:
+    """Parse a streamed CSV document with a header row.
+
+    Empty cells are returned as None so optional fields validate as missing.
+
+    Args:
+        chunks: Body chunks
+
+    Yields:
+        One dictionary per data row, keyed by header name
+
+    Raises:
+        BulkFormatError: If the header is missing or a row is malformed
+    """
+    rows = _CsvRows()
+    async for text in _iter_text(chunks):
+        for record in rows.feed(text):
+            yield record
+    last = rows.finish()
+    if last is not None:
+        yield last
+
+
+class _JsonArrayReader:
+    """Incremental tokenizer of a JSON array of objects.
+
+    Only the structural tokens of the array are scanned by hand; each
+    element is decoded with ``json.JSONDecoder.raw_decode`` once the buffer
+    holds all of it.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        """Initialize the reader.
+
+        Args:
+            chunks: Body chunks
+        """
+        self._text = _iter_text(chunks).__aiter__()
+        self._decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        # Next expected token: "[" -> "value or ]" -> "separator" (, or ]) -> "value" -> ...
+        self.expecting = "["
+        self.index = 0
+
+    async def elements(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the array elements, then check that nothing follows the array."""
+        while self.expecting != "end":
+            char = await self._next_char()
+            if self._consume_punctuation(char):
+                continue
+            element = await self._decode_element()
+            if element is not None:
+                yield element
+        await self._expect_end()
+
+    def _skip_whitespace(self) -> None:
+        """Move past whitespace in the buffer."""
+        while self.position < len(self.buffer) and self.buffer[self.position] in " \t\r\n":
+            self.position += 1
+
+    async def _more(self) -> bool:
+        """Append the next decoded chunk to the buffer (False at the end of the body)."""
+        try:
+            text = await self._text.__anext__()
+        except StopAsyncIteration:
+            return False
+        self.buffer = self.buffer[self.position:] + text
+        self.position = 0
+        return True
+
+    async def _next_char(self) -> str:
+        """Get the next non-whitespace character, reading more of the body as needed."""
+        self._skip_whitespace()
+        while self.position >= len(self.buffer):
+            if not await self._more():
+                raise BulkFormatError("JSON body must be a complete array of objects")
+            self._skip_whitespace()
+        return self.buffer[self.position]
+
+    def _advance(self, expecting: str) -> None:
+        """Consume one structural character."""
+        self.position += 1
+        self.expecting = expecting
+
+    def _consume_punctuation(self, char: str) -> bool:
+        """Consume '[', ',' or ']' if expected; False when an element starts here.
+
+        Raises:
+            BulkFormatError: If the character is not valid at this point
+        """
+        if self.expecting == "[":
+            if char != "[":
+                raise BulkFormatError("JSON body must be an array of objects")
+            self._advance("value or ]")
+            return True
+        if char == "]" and self.expecting in ("value or ]", "separator"):
+            self._advance("end")
+            return True
+        if self.expecting == "separator":
+            if char != ",":
+                raise BulkFormatError(f"Expected ',' or ']' after element {self.index} of the JSON array")
+            self._advance("value")
+            return True
+        if char != "{":
+            raise BulkFormatError(f"Element {self.index + 1} of the JSON array is not an object")
+        return False
+
+    async def _decode_element(self) -> Optional[Dict[str, Any]]:
+        """Decode the object at the current position (None if more of the body was needed)."""
+        element: Dict[str, Any]
+        try:
+            element, end = self._decoder.raw_decode(self.buffer, self.position)
+        except json.JSONDecodeError as e:
+            if len(self.buffer) - self.position > MAX_RECORD_BYTES:
+                raise BulkFormatError(f"JSON element exceeds {MAX_RECORD_BYTES} bytes") from e
+            if not await self._more():
+                raise BulkFormatError(f"Malformed JSON: {e.msg}") from e
+            return None
+        self.position = end
+        self.index += 1
+        self.expecting = "separator"
+        return element
+
+    async def _expect_end(self) -> None:
+        """Check that only whitespace follows the closing bracket."""
+        self._skip_whitespace()
+        while self.position >= len(self.buffer) and await self._more():
+            self._skip_whitespace()
+        if self.position < len(self.buffer):
+            raise BulkFormatError("Unexpected data after the JSON array")
+
+
+async def iter_json_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Dict[str, Any]]:
+    """Parse a streamed JSON array of objects.
+
+    Args:
+        chunks: Body chunks
+
+    Yields:
+        One dictionary per array element
+
+    Raises:
+        BulkFormatError: If the body is not an array of objects
+    """
+    async for element in _JsonArrayReader(chunks).elements():
+        yield element
+
+
+__all__ = [
+    "BulkFormatError",
+    "CSV_CONTENT_TYPE",
+    "JSON_CONTENT_TYPE",
+    "iter_csv_records",
+    "iter_json_records",
+    "iter_records",
+    "media_type",
+]
@@ -1,11 +1,111 @@
-"""Utility for generating institutional codes."""
+"""Utility for generating institutional codes.
+
+Sequential numbers come from the ``code_counters`` table, one row per
+(prefix, year). Each allocation is a single atomic ``UPDATE ... RETURNING``
+(an ``INSERT ... ON CONFLICT DO UPDATE`` the first time a prefix and year
+are used), so its cost does not grow with the users or subjects tables and
+concurrent requests on any number of workers never get the same number.
+The counter row stays locked until the caller's transaction ends, and a
+rolled-back transaction gives its numbers back.
+"""
 
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import InstrumentedAttribute
+from app.models.code_counter import CodeCounter
 from app.models.user import User
 from app.models.subject import Subject
 
+USER_CODE_PREFIXES = {
+    "Estudiante": "EST",
+    "Profesor": "PROF",
+    "Admin": "ADM",
+}
+
+# Counter year used for codes without a year (subjects)
+SUBJECT_CODE_YEAR = 0
+
+_counters = CodeCounter.__table__
+
+
+async def _max_existing_sequential(
+    db: AsyncSession, codigo_column: InstrumentedAttribute, code_prefix: str
+) -> int:
+    """Find the highest sequential number already used with a code prefix.
+    
+    Only runs the first time a counter is created, so counters start after
+    codes that were assigned before the counter existed.
+    
+    Args:
+        db: Database session
+        codigo_column: Code column of the table the codes belong to
+        code_prefix: Code text before the sequential number (e.g. 'EST-2024-')
+    
+    Returns:
+        Highest sequential number, or 0 if none
+    """
+    result = await db.execute(select(codigo_column).where(codigo_column.like(f"{code_prefix}%")))
+    sequentials = [
+        int(suffix)
+        for suffix in (codigo[len(code_prefix):] for codigo in result.scalars())
+        if suffix.isdigit()
+    ]
+    return max(sequentials, default=0)
+
+
+async def reservar_bloque(
+    db: AsyncSession,
+    prefix: str,
+    year: int,
+    cantidad: int,
+    codigo_column: InstrumentedAttribute,
+) -> int:
+    """Atomically reserve consecutive sequential numbers for a prefix and year.
+    
+    Args:
+        db: Database session (the reservation joins its transaction)
+        prefix: Code prefix (e.g. 'EST')
+        year: Code year, or SUBJECT_CODE_YEAR for codes without one
+        cantidad: Number of sequential numbers to reserve
+        codigo_column: Code column used to seed a new counter from existing codes
+    
+    Returns:
+        First number of the block; the block is [first, first + cantidad - 1]
+    
+    Raises:
+        ValueError: If cantidad is not positive
+    """
+    if cantidad < 1:
+        raise ValueError("cantidad must be positive")
+    
+    stmt = (
+        update(_counters)
+        .where(_counters.c.prefix == prefix, _counters.c.year == year)
+        .values(last_value=_counters.c.last_value + cantidad)
+        .returning(_counters.c.last_value)
+    )
+    last_value = (await db.execute(stmt)).scalar_one_or_none()
+    
+    if last_value is None:
+        # First use of this prefix/year; another worker may create it concurrently
+        code_prefix = f"{prefix}-{year}-" if year != SUBJECT_CODE_YEAR else f"{prefix}-"
+        seed = await _max_existing_sequential(db, codigo_column, code_prefix)
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = (
+            dialect_insert(_counters)
+            .values(prefix=prefix, year=year, last_value=seed + cantidad)
+            .on_conflict_do_update(
+                index_elements=[_counters.c.prefix, _counters.c.year],
+                set_={"last_value": _counters.c.last_value + cantidad},
+            )
+            .returning(_counters.c.last_value)
+        )
+        last_value = (await db.execute(stmt)).scalar_one()
+    
+    return last_value - cantidad + 1
+
 
 async def generar_codigo_institucional(
     db: AsyncSession, role: str
@@ -19,27 +119,35 @@ async def generar_codigo_institucional(
     Returns:
         Generated institutional code in format: {PREFIX}-{YEAR}-{SEQUENTIAL}
     """
-    prefixes = {
-        "Estudiante": "EST",
-        "Profesor": "PROF",
-        "Admin": "ADM",
-    }
+    codigos = await reservar_codigos_institucionales(db, role, 1)
+    return codigos[0]
+
+
+async def reservar_codigos_institucionales(
+    db: AsyncSession, role: str, cantidad: int
+) -> list[str]:
+    """Reserve a block of consecutive institutional codes for a role.
     
-    prefix = prefixes.get(role, "USR")
-    current_year = datetime.now().year
+    Bulk imports reserve the whole block with one counter update.
     
-    # Get the count of users with the same role and year
-    stmt = select(func.count(User.id)).where(
-        User.role == role,
-        User.codigo_institucional.like(f"{prefix}-{current_year}-%")
-    )
-    result = await db.execute(stmt)
-    count = result.scalar() or 0
+    Args:
+        db: Database session
+        role: User role (Estudiante, Profesor, Admin)
+        cantidad: Number of codes to reserve
     
-    # Generate sequential number with 4 digits
-    sequential = str(count + 1).zfill(4)
+    Returns:
+        Codes in format {PREFIX}-{YEAR}-{SEQUENTIAL}, in ascending order
+    """
+    prefix = USER_CODE_PREFIXES.get(role, "USR")
+    current_year = datetime.now().year
     
-    return f"{prefix}-{current_year}-{sequential}"
+    first = await reservar_bloque(db, prefix, current_year, cantidad, User.codigo_institucional)
+    
+    # Sequential numbers with 4 digits
+    return [
+        f"{prefix}-{current_year}-{str(number).zfill(4)}"
+        for number in range(first, first + cantidad)
+    ]
 
 
 async def generar_codigo_materia(
@@ -72,15 +180,11 @@ async def generar_codigo_materia(
     else:
         prefix = "MAT"
     
-    # Get the count of subjects with the same prefix
-    stmt = select(func.count(Subject.id)).where(
-        Subject.codigo_institucional.like(f"{prefix}-%")
-    )
-    result = await db.execute(stmt)
-    count = result.scalar() or 0
+    # Subject codes carry no year
+    first = await reservar_bloque(db, prefix, SUBJECT_CODE_YEAR, 1, Subject.codigo_institucional)
     
     # Generate sequential number with 3 digits
-    sequential = str(count + 1).zfill(3)
+    sequential = str(first).zfill(3)
     
     return f"{prefix}-{sequential}"
 
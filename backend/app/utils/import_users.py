@@ -0,0 +1,88 @@
+"""Import a cohort of users from a CSV or JSON file.
+
+Usage:
+    python -m app.utils.import_users estudiantes.csv             # import
+    python -m app.utils.import_users estudiantes.csv --dry-run   # validate only
+    python -m app.utils.import_users profesores.json --best-effort
+
+The file has the ``POST /users`` fields (email, password, role, nombre,
+apellido, fecha_nacimiento, ...); CSV files need a header row. Progress
+is printed to stderr. Exits with status 1 when any row fails.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.services.user_service import UserService
+from app.utils.bulk_ingest import BulkFormatError, CSV_CONTENT_TYPE, JSON_CONTENT_TYPE, iter_records
+
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+async def _read_chunks(path: Path) -> AsyncIterator[bytes]:
+    """Read a file in chunks."""
+    with path.open("rb") as handle:
+        while chunk := handle.read(_READ_CHUNK_BYTES):
+            yield chunk
+
+
+def _print_progress(stage: str, done: int, total: int) -> None:
+    """Print import progress to stderr."""
+    print(f"{stage}: {done}/{total}", file=sys.stderr)
+
+
+async def _run(path: Path, dry_run: bool, atomic: bool) -> int:
+    """Import the file and print the result.
+
+    Args:
+        path: CSV or JSON file
+        dry_run: Validate and preview codes without creating users
+        atomic: Create nothing if any row fails
+
+    Returns:
+        Process exit status
+    """
+    from app.core.database import engine
+    from app.core.security import bulk_password_hasher
+
+    content_type = JSON_CONTENT_TYPE if path.suffix.lower() == ".json" else CSV_CONTENT_TYPE
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_factory() as db:
+            result = await UserService(db).bulk_import_users(
+                iter_records(_read_chunks(path), content_type),
+                dry_run=dry_run,
+                atomic=atomic,
+                progress=_print_progress,
+            )
+    except BulkFormatError as e:
+        print(f"import users: {e}", file=sys.stderr)
+        return 2
+    finally:
+        bulk_password_hasher.shutdown()
+        await engine.dispose()
+
+    print(json.dumps(result.model_dump(), indent=2, ensure_ascii=False))
+    return 1 if result.failed else 0
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Import estudiantes and profesores from CSV or JSON")
+    parser.add_argument("path", type=Path, help="CSV (with header row) or JSON array file")
+    parser.add_argument("--dry-run", action="store_true", help="validate and preview codes only")
+    parser.add_argument(
+        "--best-effort",
+        action="store_true",
+        help="import the valid rows even if some rows fail",
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_run(args.path, args.dry_run, not args.best_effort)))
+
+
+if __name__ == "__main__":
+    main()
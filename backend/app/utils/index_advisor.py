@@ -0,0 +1,317 @@
+"""Index advisor for repository hot queries.
+
+Runs the repository methods behind the most frequent endpoints and reports,
+captures the SQL they emit and runs EXPLAIN on each statement. Plans that
+read a whole table (``SCAN <table>`` in SQLite, ``Seq Scan`` in PostgreSQL)
+are flagged, since they usually point to a missing index.
+
+Usage:
+    python -m app.utils.index_advisor          # configured database (must have data)
+    python -m app.utils.index_advisor --seed   # in-memory SQLite with synthetic data
+
+Exits with status 1 when a sequential scan is found. PostgreSQL may still
+prefer a sequential scan on small tables, so run it against a database of
+realistic size.
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models.user import User, UserRole
+from app.models.subject import Subject
+from app.models.enrollment import Enrollment
+from app.models.grade import Grade
+from app.repositories.grade_repository import GradeRepository
+from app.repositories.enrollment_repository import EnrollmentRepository
+from app.repositories.subject_repository import SubjectRepository
+from app.repositories.user_repository import UserRepository
+
+# SQLite reports full table scans as "SCAN <table>" (without "USING ... INDEX"),
+# PostgreSQL as "Seq Scan on <table>"
+_SQLITE_SCAN = re.compile(r"^\s*SCAN (?:TABLE )?(\w+)(?!.*USING)")
+_POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+
+HotQuery = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Any]]
+
+HOT_QUERIES: Dict[str, HotQuery] = {
+    "UserRepository.get_by_email": lambda db, s: UserRepository(db).get_by_email(s["email"]),
+    "UserRepository.get_by_role": lambda db, s: UserRepository(db).get_by_role(UserRole.ESTUDIANTE.value),
+    "SubjectRepository.get_by_profesor": lambda db, s: SubjectRepository(db).get_by_profesor(s["profesor_id"]),
+    "EnrollmentRepository.get_by_estudiante": lambda db, s: EnrollmentRepository(db).get_by_estudiante(s["estudiante_id"]),
+    "EnrollmentRepository.get_by_subject": lambda db, s: EnrollmentRepository(db).get_by_subject(s["subject_id"]),
+    "GradeRepository.get_by_enrollment": lambda db, s: GradeRepository(db).get_by_enrollment(s["enrollment_id"]),
+    "GradeRepository.get_by_subject": lambda db, s: GradeRepository(db).get_by_subject(s["subject_id"]),
+    "GradeRepository.get_by_estudiante": lambda db, s: GradeRepository(db).get_by_estudiante(s["estudiante_id"]),
+    "GradeRepository.get_many_with_relations(subject_id)": lambda db, s: GradeRepository(db).get_many_with_relations(
+        subject_id=s["subject_id"]
+    ),
+    "GradeRepository.get_report_data_by_subject": lambda db, s: GradeRepository(db).get_report_data_by_subject(
+        s["subject_id"]
+    ),
+    "GradeRepository.get_report_data_by_estudiante": lambda db, s: GradeRepository(db).get_report_data_by_estudiante(
+        s["estudiante_id"]
+    ),
+}
+
+
+def find_sequential_scans(plan: List[str]) -> List[str]:
+    """Find tables read with a full sequential scan in a query plan.
+
+    Args:
+        plan: Plan lines from EXPLAIN (SQLite or PostgreSQL)
+
+    Returns:
+        Names of scanned tables, in plan order
+    """
+    tables = []
+    for line in plan:
+        match = _SQLITE_SCAN.match(line) or _POSTGRES_SCAN.search(line)
+        if match:
+            tables.append(match.group(1))
+    return tables
+
+
+async def seed_database(
+    db: AsyncSession,
+    profesores: int = 20,
+    subjects_per_profesor: int = 5,
+    estudiantes: int = 1000,
+    enrollments_per_estudiante: int = 5,
+    grades_per_enrollment: int = 3,
+) -> None:
+    """Fill an empty database with synthetic data.
+
+    Args:
+        db: Database session
+        profesores: Number of profesores
+        subjects_per_profesor: Subjects taught by each profesor
+        estudiantes: Number of estudiantes
+        enrollments_per_estudiante: Subjects each estudiante is enrolled in
+        grades_per_enrollment: Grades per enrollment
+    """
+    users = [
+        {
+            "email": f"prof{i}@seed.local",
+            "password_hash": "seed",
+            "role": UserRole.PROFESOR,
+            "nombre": "Profesor",
+            "apellido": str(i),
+            "codigo_institucional": f"PROF-SEED-{i:05d}",
+            "fecha_nacimiento": date(1980, 1, 1),
+        }
+        for i in range(profesores)
+    ] + [
+        {
+            "email": f"est{i}@seed.local",
+            "password_hash": "seed",
+            "role": UserRole.ESTUDIANTE,
+            "nombre": "Estudiante",
+            "apellido": str(i),
+            "codigo_institucional": f"EST-SEED-{i:05d}",
+            "fecha_nacimiento": date(2000, 1, 1),
+        }
+        for i in range(estudiantes)
+    ]
+    await db.execute(insert(User), users)
+
+    profesor_ids = list((await db.execute(
+        select(User.id).where(User.role == UserRole.PROFESOR).order_by(User.id)
+    )).scalars())
+    estudiante_ids = list((await db.execute(
+        select(User.id).where(User.role == UserRole.ESTUDIANTE).order_by(User.id)
+    )).scalars())
+
+    await db.execute(insert(Subject), [
+        {
+            "nombre": f"Materia {p}-{n}",
+            "codigo_institucional": f"MAT-SEED-{p:04d}-{n:02d}",
+            "numero_creditos": 3,
+            "profesor_id": profesor_id,
+        }
+        for p, profesor_id in enumerate(profesor_ids)
+        for n in range(subjects_per_profesor)
+    ])
+    subject_ids = list((await db.execute(select(Subject.id).order_by(Subject.id))).scalars())
+
+    per_student = min(enrollments_per_estudiante, len(subject_ids))
+    await db.execute(insert(Enrollment), [
+        {"estudiante_id": estudiante_id, "subject_id": subject_ids[(e + k) % len(subject_ids)]}
+        for e, estudiante_id in enumerate(estudiante_ids)
+        for k in range(per_student)
+    ])
+    enrollment_ids = list((await db.execute(select(Enrollment.id).order_by(Enrollment.id))).scalars())
+
+    await db.execute(insert(Grade), [
+        {
+            "enrollment_id": enrollment_id,
+            "nota": (enrollment_id + g) % 5 + 0.5,
+            "periodo": f"2024-{g % 2 + 1}",
+            "fecha": date(2024, 6, 1),
+        }
+        for enrollment_id in enrollment_ids
+        for g in range(grades_per_enrollment)
+    ])
+    await db.commit()
+
+
+async def _sample_ids(db: AsyncSession) -> Dict[str, Any]:
+    """Pick existing IDs to run the hot queries with.
+
+    Raises:
+        ValueError: If the database has no enrollments with grades
+    """
+    row = (await db.execute(
+        select(
+            Enrollment.id, Enrollment.estudiante_id, Enrollment.subject_id,
+            Subject.profesor_id, User.email,
+        )
+        .join(Subject, Enrollment.subject_id == Subject.id)
+        .join(User, Enrollment.estudiante_id == User.id)
+        .where(Enrollment.id == select(func.min(Grade.enrollment_id)).scalar_subquery())
+    )).first()
+    if row is None:
+        raise ValueError("Database has no grades; seed it first (use --seed for a synthetic database)")
+    return {
+        "enrollment_id": row[0],
+        "estudiante_id": row[1],
+        "subject_id": row[2],
+        "profesor_id": row[3],
+        "email": row[4],
+    }
+
+
+async def _explain(db: AsyncSession, statement: str, parameters: Any) -> List[str]:
+    """Run EXPLAIN for a captured statement.
+
+    Args:
+        db: Database session
+        statement: SQL statement as sent to the driver
+        parameters: Driver parameters of the statement
+
+    Returns:
+        Plan lines
+    """
+    connection = await db.connection()
+    if connection.dialect.name == "sqlite":
+        result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in result.all()]
+    result = await connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return [row[0] for row in result.all()]
+
+
+async def run_advisor(db: AsyncSession) -> List[Dict[str, Any]]:
+    """Run every hot query and EXPLAIN the statements it issues.
+
+    Args:
+        db: Database session on a database with data
+
+    Returns:
+        One entry per statement with 'query', 'statement', 'plan' and 'sequential_scans'
+
+    Raises:
+        ValueError: If the database has no data to build the queries from
+    """
+    sample = await _sample_ids(db)
+    sync_engine = db.bind.sync_engine if isinstance(db.bind, AsyncEngine) else db.bind
+    reports = []
+
+    for name, query in HOT_QUERIES.items():
+        captured: List[Tuple[str, Any]] = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        event.listen(sync_engine, "before_cursor_execute", capture)
+        try:
+            await query(db, sample)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", capture)
+
+        for statement, parameters in captured:
+            plan = await _explain(db, statement, parameters)
+            reports.append({
+                "query": name,
+                "statement": statement,
+                "plan": plan,
+                "sequential_scans": find_sequential_scans(plan),
+            })
+
+    return reports
+
+
+def format_report(reports: List[Dict[str, Any]]) -> str:
+    """Format advisor results for the terminal.
+
+    Args:
+        reports: Result of ``run_advisor``
+
+    Returns:
+        Human-readable report
+    """
+    lines = []
+    for report in reports:
+        status = "SEQ SCAN: " + ", ".join(report["sequential_scans"]) if report["sequential_scans"] else "ok"
+        lines.append(f"[{status}] {report['query']}")
+        lines.extend(f"    {line}" for line in report["plan"])
+    flagged = sum(1 for report in reports if report["sequential_scans"])
+    lines.append(f"{len(reports)} statements explained, {flagged} with sequential scans")
+    return "\n".join(lines)
+
+
+async def _run(seed: bool) -> int:
+    """Run the advisor and print the report.
+
+    Args:
+        seed: Use an in-memory SQLite database with synthetic data
+
+    Returns:
+        Process exit status
+    """
+    if seed:
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    else:
+        from app.core.database import engine
+
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_factory() as db:
+            if seed:
+                await seed_database(db)
+            reports = await run_advisor(db)
+    except ValueError as e:
+        print(f"index advisor: {e}", file=sys.stderr)
+        return 2
+    finally:
+        await engine.dispose()
+
+    print(format_report(reports))
+    return 1 if any(report["sequential_scans"] for report in reports) else 0
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="EXPLAIN repository hot queries and flag sequential scans")
+    parser.add_argument(
+        "--seed",
+        action="store_true",
+        help="run against an in-memory SQLite database with synthetic data",
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_run(args.seed)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Rebuild or check the materialized enrollment grade statistics.
+
+Usage:
+    python -m app.utils.rebuild_grade_stats           # recompute every row
+    python -m app.utils.rebuild_grade_stats --check   # report drift only
+
+With ``--check`` the command exits with status 1 when any enrollment's
+statistics do not match its grades, so it can run as a periodic job.
+"""
+
+import argparse
+import asyncio
+import sys
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.repositories.grade_stats_repository import GradeStatsRepository
+
+
+async def _run(check: bool) -> int:
+    """Check or rebuild the statistics table.
+
+    Args:
+        check: Only report drifted enrollments instead of rebuilding
+
+    Returns:
+        Process exit status
+    """
+    from app.core.database import engine
+
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_factory() as db:
+            repository = GradeStatsRepository(db)
+            drifted = await repository.find_drift()
+            if check:
+                if drifted:
+                    print(f"{len(drifted)} enrollments with stale statistics: {drifted}")
+                    return 1
+                print("enrollment grade statistics are up to date")
+                return 0
+
+            rows = await repository.rebuild()
+            await db.commit()
+            print(f"rebuilt statistics for {rows} enrollments ({len(drifted)} were stale)")
+            return 0
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Rebuild materialized enrollment grade statistics")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="report enrollments whose statistics drifted and exit 1 if any",
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_run(args.check)))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,5 +18,8 @@ async def create_tables():
 asyncio.run(create_tables())
 "
 
+echo "Applying migrations..."
+alembic upgrade head
+
 echo "Starting application..."
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000
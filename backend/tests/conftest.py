@@ -1,16 +1,44 @@
 """Pytest configuration and fixtures."""
 
 import pytest
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
+from app.core import unit_of_work
+from app.core.cache import cache
+from app.core.config import settings
 from app.core.database import Base, get_db
+from app.core.permission_cache import subject_assignment_cache
+from app.core.principal_cache import principal_cache
+from app.core.read_replica import recent_writers
+from app.core.report_cache import report_cache
 from app.main import app
 
 
+# Fail any request that repeats a statement shape past the threshold (N+1)
+settings.sql_repeat_action = "raise"
+
 # Test database URL (using in-memory SQLite for testing)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
+@pytest.fixture(autouse=True)
+async def clear_process_caches():
+    """Start every test with empty result, report and principal caches (IDs repeat across test databases)."""
+    await cache.clear()
+    report_cache.clear()
+    principal_cache.clear()
+    subject_assignment_cache.clear()
+    recent_writers.clear()
+    yield
+    await cache.clear()
+    report_cache.clear()
+    principal_cache.clear()
+    subject_assignment_cache.clear()
+    recent_writers.clear()
+
+
 @pytest.fixture
 async def db_session():
     """Create a test database session."""
@@ -37,14 +65,30 @@ async def db_session():
     await engine.dispose()
 
 
+@pytest.fixture
+def count_queries(db_session):
+    """Collect SQL statements executed on the test engine."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
 @pytest.fixture
 async def client(db_session):
     """Create a test client."""
     from httpx import AsyncClient
     from app.core.database import get_db
     
-    async def override_get_db():
-        yield db_session
+    async def override_get_db(request: Request):
+        # Same unit of work as get_db, on the shared test session
+        async with unit_of_work.scope(db_session, request):
+            yield db_session
     
     app.dependency_overrides[get_db] = override_get_db
     
@@ -0,0 +1,129 @@
+"""Integration tests for the dashboard summary endpoint."""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User, UserRole
+from app.models.subject import Subject
+from app.models.enrollment import Enrollment
+from app.models.grade import Grade
+from app.core.security import create_access_token
+
+
+# ==================== Fixtures ====================
+
+def make_user(email: str, role: UserRole, codigo: str) -> User:
+    """Build a user of a role."""
+    return User(
+        email=email,
+        password_hash="hash",
+        role=role,
+        nombre=email.split("@")[0].capitalize(),
+        apellido="Test",
+        codigo_institucional=codigo,
+        fecha_nacimiento=date(1990, 1, 1),
+    )
+
+
+@pytest.fixture
+async def dashboard_data(db_session: AsyncSession):
+    """Two profesores with three subjects and two estudiantes with four grades."""
+    admin = make_user("admin@test.com", UserRole.ADMIN, "ADM-1")
+    ana = make_user("ana@test.com", UserRole.PROFESOR, "PROF-1")
+    beto = make_user("beto@test.com", UserRole.PROFESOR, "PROF-2")
+    carla = make_user("carla@test.com", UserRole.ESTUDIANTE, "EST-1")
+    dario = make_user("dario@test.com", UserRole.ESTUDIANTE, "EST-2")
+    db_session.add_all([admin, ana, beto, carla, dario])
+    await db_session.flush()
+
+    algebra = Subject(nombre="Álgebra", codigo_institucional="MAT-1", numero_creditos=3, profesor_id=ana.id)
+    biologia = Subject(nombre="Biología", codigo_institucional="BIO-1", numero_creditos=3, profesor_id=ana.id)
+    calculo = Subject(nombre="Cálculo", codigo_institucional="MAT-2", numero_creditos=4, profesor_id=beto.id)
+    db_session.add_all([algebra, biologia, calculo])
+    await db_session.flush()
+
+    carla_algebra = Enrollment(estudiante_id=carla.id, subject_id=algebra.id)
+    dario_algebra = Enrollment(estudiante_id=dario.id, subject_id=algebra.id)
+    carla_calculo = Enrollment(estudiante_id=carla.id, subject_id=calculo.id)
+    db_session.add_all([carla_algebra, dario_algebra, carla_calculo])
+    await db_session.flush()
+
+    for enrollment, nota in (
+        (carla_algebra, "4.0"),
+        (carla_algebra, "3.0"),
+        (dario_algebra, "5.0"),
+        (carla_calculo, "2.0"),
+    ):
+        db_session.add(Grade(enrollment_id=enrollment.id, nota=Decimal(nota), periodo="2024-1", fecha=date(2024, 3, 1)))
+        await db_session.flush()
+    await db_session.commit()
+
+    return {"admin": admin, "ana": ana, "carla": carla, "algebra": algebra, "calculo": calculo}
+
+
+def auth_headers(user: User) -> dict:
+    """Bearer token headers of a user."""
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+
+# ==================== Tests ====================
+
+@pytest.mark.asyncio
+async def test_admin_summary(client, dashboard_data, count_queries):
+    """Test the admin summary covers everything with a few aggregate queries."""
+    response = await client.get("/api/v1/dashboard/summary", headers=auth_headers(dashboard_data["admin"]))
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["role"] == "Admin"
+    assert summary["counts"] == {"users": 5, "subjects": 3, "enrollments": 3, "grades": 4}
+    averages = {subject["nombre"]: subject["average"] for subject in summary["subjects"]}
+    assert averages == {"Álgebra": 4.0, "Biología": None, "Cálculo": 2.0}
+    assert [grade["nota"] for grade in summary["recent_grades"]] == ["2.00", "5.00", "3.00", "4.00"]
+    assert summary["recent_grades"][0]["estudiante_nombre"] == "Carla Test"
+    # User lookup, user count, subject aggregates and recent grades
+    assert len(count_queries) <= 4
+
+
+@pytest.mark.asyncio
+async def test_profesor_summary(client, dashboard_data):
+    """Test a profesor only sees their assigned subjects."""
+    response = await client.get("/api/v1/dashboard/summary", headers=auth_headers(dashboard_data["ana"]))
+
+    summary = response.json()
+    assert summary["counts"] == {"users": None, "subjects": 2, "enrollments": 2, "grades": 3}
+    enrollments = {subject["nombre"]: subject["enrollments"] for subject in summary["subjects"]}
+    assert enrollments == {"Álgebra": 2, "Biología": 0}
+    assert {grade["subject_id"] for grade in summary["recent_grades"]} == {dashboard_data["algebra"].id}
+
+
+@pytest.mark.asyncio
+async def test_estudiante_summary(client, dashboard_data):
+    """Test an estudiante sees their enrollments and own averages."""
+    response = await client.get("/api/v1/dashboard/summary", headers=auth_headers(dashboard_data["carla"]))
+
+    summary = response.json()
+    assert summary["counts"] == {"users": None, "subjects": 2, "enrollments": 2, "grades": 3}
+    averages = {subject["subject_id"]: subject["average"] for subject in summary["subjects"]}
+    assert averages == {dashboard_data["algebra"].id: 3.5, dashboard_data["calculo"].id: 2.0}
+    assert {grade["estudiante_id"] for grade in summary["recent_grades"]} == {dashboard_data["carla"].id}
+
+
+@pytest.mark.asyncio
+async def test_summary_is_cached(client, dashboard_data, count_queries):
+    """Test repeated summaries within the TTL skip the aggregate queries."""
+    headers = auth_headers(dashboard_data["admin"])
+    await client.get("/api/v1/dashboard/summary", headers=headers)
+    count_queries.clear()
+
+    response = await client.get("/api/v1/dashboard/summary", headers=headers)
+    assert response.json()["counts"]["grades"] == 4
+    assert not [statement for statement in count_queries if "enrollment_grade_stats" in statement]
+
+
+@pytest.mark.asyncio
+async def test_summary_requires_authentication(client):
+    """Test anonymous requests are rejected."""
+    response = await client.get("/api/v1/dashboard/summary")
+    assert response.status_code == 401
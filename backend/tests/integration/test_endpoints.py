@@ -451,3 +451,62 @@ async def test_update_profile(client, db_session: AsyncSession):
     assert data["nombre"] == "Updated"
     assert data["numero_contacto"] == "0987654321"
 
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_users_as_admin(client, db_session: AsyncSession):
+    """Admin imports a CSV cohort; codes come in one block and edad is set."""
+    from sqlalchemy import select
+    from app.core.security import verify_password
+
+    codigo_admin = await generar_codigo_institucional(db_session, "Admin")
+    admin = User(
+        email="admin.bulk@example.com",
+        password_hash=get_password_hash("admin123"),
+        role=UserRole.ADMIN,
+        nombre="Admin",
+        apellido="Bulk",
+        codigo_institucional=codigo_admin,
+        fecha_nacimiento=date(1975, 1, 1),
+    )
+    db_session.add(admin)
+    await db_session.commit()
+    token = create_access_token({"sub": admin.email, "role": admin.role.value})
+    body = (
+        "email,password,role,nombre,apellido,fecha_nacimiento,programa_academico,area_ensenanza\n"
+        "ana.bulk@example.com,secret1,Estudiante,Ana,Uno,2000-01-01,Ingeniería,\n"
+        "luis.bulk@example.com,secret2,Estudiante,Luis,Dos,2001-02-02,Derecho,\n"
+        "marta.bulk@example.com,secret3,Profesor,Marta,Tres,1980-03-03,,Física\n"
+    )
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "text/csv"}
+
+    response = await client.post("/api/v1/users/bulk?dry_run=true", content=body.encode(), headers=headers)
+    assert response.status_code == 200
+    preview = response.json()
+    assert (preview["created"], preview["dry_run"]) == (0, True)
+    assert len(preview["users"]) == 3
+    assert (await db_session.execute(
+        select(User).where(User.email == "ana.bulk@example.com")
+    )).scalar_one_or_none() is None
+
+    response = await client.post("/api/v1/users/bulk", content=body.encode(), headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 3
+    codes = [user["codigo_institucional"] for user in data["users"]]
+    year = date.today().year
+    assert codes == [f"EST-{year}-0001", f"EST-{year}-0002", f"PROF-{year}-0001"]
+    assert codes == [user["codigo_institucional"] for user in preview["users"]]
+
+    ana = (await db_session.execute(
+        select(User).where(User.email == "ana.bulk@example.com")
+    )).scalar_one()
+    assert ana.edad == User.edad_para(date(2000, 1, 1))
+    assert verify_password("secret1", ana.password_hash)
+
+    # Re-importing reports every email as already registered and creates nothing
+    response = await client.post("/api/v1/users/bulk", content=body.encode(), headers=headers)
+    assert response.status_code == 422
+    data = response.json()
+    assert (data["created"], data["failed"]) == (0, 3)
+    assert {error["error"] for error in data["errors"]} == {"Email already registered"}
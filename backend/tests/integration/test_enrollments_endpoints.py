@@ -371,6 +371,66 @@ async def test_get_enrollments_with_pagination(client, db_session: AsyncSession,
     assert len(data2) <= 2
 
 
+@pytest.mark.asyncio
+async def test_get_enrollments_with_cursor_pagination(client, db_session: AsyncSession, test_data_enrollments):
+    """Test walking all enrollments with the X-Next-Cursor header."""
+    admin = test_data_enrollments["admin"]
+    subject = test_data_enrollments["subject"]
+    
+    for i in range(5):
+        codigo_est = await generar_codigo_institucional(db_session, "Estudiante")
+        est = User(
+            email=f"cursor{i}@enrollments.com",
+            password_hash="hash",
+            role=UserRole.ESTUDIANTE,
+            nombre=f"Cursor{i}",
+            apellido="Test",
+            codigo_institucional=codigo_est,
+            fecha_nacimiento=date(2000, 1, 1),
+        )
+        db_session.add(est)
+        await db_session.commit()
+        await db_session.refresh(est)
+        db_session.add(Enrollment(estudiante_id=est.id, subject_id=subject.id))
+    await db_session.commit()
+    
+    token = create_access_token({"sub": admin.email, "role": admin.role.value})
+    headers = {"Authorization": f"Bearer {token}", "Origin": "http://localhost:3000"}
+    
+    seen = []
+    url = "/api/v1/enrollments?limit=2"
+    while True:
+        response = await client.get(url, headers=headers)
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        url = f"/api/v1/enrollments?limit=2&cursor={next_cursor}"
+    
+    all_response = await client.get("/api/v1/enrollments", headers=headers)
+    expected = [item["id"] for item in all_response.json()]
+    assert seen == expected
+    assert seen == sorted(seen, reverse=True)
+    assert "X-Next-Cursor" not in all_response.headers
+    # Cross-origin frontends can only read the cursor if it is exposed explicitly
+    assert "X-Next-Cursor" in all_response.headers["Access-Control-Expose-Headers"].split(", ")
+
+
+@pytest.mark.asyncio
+async def test_get_enrollments_with_invalid_cursor(client, db_session: AsyncSession, test_data_enrollments):
+    """Test that an invalid cursor is rejected."""
+    admin = test_data_enrollments["admin"]
+    token = create_access_token({"sub": admin.email, "role": admin.role.value})
+    
+    response = await client.get(
+        "/api/v1/enrollments?cursor=garbage",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    
+    assert response.status_code in (400, 422)
+
+
 @pytest.mark.asyncio
 async def test_get_enrollments_empty_list(client, db_session: AsyncSession, test_data_enrollments):
     """Test get enrollments returns empty list when no enrollments exist."""
@@ -1163,3 +1223,101 @@ async def test_create_enrollment_not_found_after_create(client, db_session: Asyn
         # Line 122 handles NotFoundError if enrollment_with_relations is None
         # This is an edge case that shouldn't happen in normal flow
 
+
+
+# ==================== BULK ENROLLMENT Tests ====================
+
+async def _make_estudiantes(db_session: AsyncSession, count: int) -> list:
+    estudiantes = [
+        User(
+            email=f"bulk{i}@enrollments.com",
+            password_hash="hash",
+            role=UserRole.ESTUDIANTE,
+            nombre="Bulk",
+            apellido=str(i),
+            codigo_institucional=f"EST-BULK-{i:03d}",
+            fecha_nacimiento=date(2001, 1, 1),
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(estudiantes)
+    await db_session.commit()
+    return estudiantes
+
+
+@pytest.mark.asyncio
+async def test_bulk_enrollments_creates_and_skips(client, db_session: AsyncSession, test_data_enrollments, count_queries):
+    """Existing and repeated enrollments are skipped; queries do not grow with the batch."""
+    from sqlalchemy import select, func
+
+    admin = test_data_enrollments["admin"]
+    subject = test_data_enrollments["subject"]
+    existing = test_data_enrollments["estudiante"]
+    db_session.add(Enrollment(estudiante_id=existing.id, subject_id=subject.id))
+    await db_session.commit()
+    estudiantes = await _make_estudiantes(db_session, 20)
+    token = create_access_token({"sub": admin.email, "role": admin.role.value})
+
+    rows = [{"estudiante_id": e.id, "subject_id": subject.id} for e in estudiantes]
+    rows += [{"estudiante_id": existing.id, "subject_id": subject.id}, rows[0]]
+    queries_before = len(count_queries)
+    response = await client.post(
+        "/api/v1/enrollments/bulk",
+        json=rows,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "received": 22, "created": 20, "skipped": 2, "failed": 0, "atomic": True, "errors": [],
+    }
+    # Principal lookup, one role query, one subject query, one INSERT
+    assert len(count_queries) - queries_before <= 5
+    total = await db_session.execute(
+        select(func.count(Enrollment.id)).where(Enrollment.subject_id == subject.id)
+    )
+    assert total.scalar_one() == 21
+
+
+@pytest.mark.asyncio
+async def test_bulk_enrollments_reports_failures(client, db_session: AsyncSession, test_data_enrollments):
+    """Invalid rows are reported; atomic mode creates nothing, best-effort creates the rest."""
+    admin = test_data_enrollments["admin"]
+    profesor = test_data_enrollments["profesor"]
+    estudiante = test_data_enrollments["estudiante"]
+    subject = test_data_enrollments["subject"]
+    token = create_access_token({"sub": admin.email, "role": admin.role.value})
+    body = (
+        "estudiante_id,subject_id\n"
+        f"{estudiante.id},{subject.id}\n"
+        f"{profesor.id},{subject.id}\n"
+        f"{estudiante.id},999999\n"
+        f"999999,{subject.id}\n"
+        "abc,1\n"
+    )
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "text/csv"}
+
+    response = await client.post("/api/v1/enrollments/bulk", content=body.encode(), headers=headers)
+    assert response.status_code == 422
+    data = response.json()
+    assert (data["created"], data["skipped"], data["failed"]) == (0, 0, 4)
+    assert [error["row"] for error in data["errors"]] == [2, 3, 4, 5]
+    assert "not an Estudiante" in data["errors"][0]["error"]
+
+    response = await client.post(
+        "/api/v1/enrollments/bulk?atomic=false", content=body.encode(), headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["skipped"], data["failed"]) == (1, 0, 4)
+
+
+@pytest.mark.asyncio
+async def test_bulk_enrollments_as_profesor_forbidden(client, db_session: AsyncSession, test_data_enrollments):
+    """Only admins can bulk enroll."""
+    profesor = test_data_enrollments["profesor"]
+    token = create_access_token({"sub": profesor.email, "role": profesor.role.value})
+    response = await client.post(
+        "/api/v1/enrollments/bulk", json=[], headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 403
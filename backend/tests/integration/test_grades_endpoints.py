@@ -641,6 +641,40 @@ async def test_update_grade_as_admin_with_serialization(client, db_session: Asyn
     assert "enrollment" in data
 
 
+@pytest.mark.asyncio
+async def test_update_grade_issues_two_statements(client, db_session: AsyncSession, test_data, count_queries):
+    """Test an update authorizes, writes and serializes with two statements."""
+    profesor = test_data["profesor"]
+    
+    grade = Grade(
+        enrollment_id=test_data["enrollment"].id,
+        nota=Decimal("4.0"),
+        periodo="2024-1",
+        fecha=date.today(),
+    )
+    db_session.add(grade)
+    await db_session.commit()
+    
+    token = create_access_token({"sub": profesor.email, "role": profesor.role.value})
+    headers = {"Authorization": f"Bearer {token}"}
+    # Warm the authenticated user cache
+    await client.get(f"/api/v1/grades/{grade.id}", headers=headers)
+    count_queries.clear()
+    
+    response = await client.put(
+        f"/api/v1/grades/{grade.id}",
+        json={"observaciones": "Revisada"},
+        headers=headers,
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["observaciones"] == "Revisada"
+    assert data["enrollment"]["subject"]["id"] == test_data["subject"].id
+    # Grade with its owners, then UPDATE ... RETURNING
+    assert len(count_queries) == 2
+
+
 @pytest.mark.asyncio
 async def test_update_grade_as_profesor_unauthorized_subject(client, db_session: AsyncSession, test_data):
     """Test profesor cannot update grade for unassigned subject."""
@@ -1197,3 +1231,145 @@ async def test_get_grade_by_id_enrollment_not_belongs_to_estudiante(client, db_s
     data = response.json()
     assert "Cannot access other student's grades" in data.get("detail", "")
 
+
+
+# ==================== BULK UPLOAD Tests ====================
+
+async def _count_grades(db_session: AsyncSession, enrollment_id: int) -> int:
+    from sqlalchemy import select, func
+    result = await db_session.execute(
+        select(func.count(Grade.id)).where(Grade.enrollment_id == enrollment_id)
+    )
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_bulk_grades_csv_as_profesor(client, db_session: AsyncSession, test_data):
+    """Profesor uploads a CSV; rows resolve by enrollment or estudiante and update stats."""
+    from app.repositories.grade_stats_repository import GradeStatsRepository
+
+    profesor = test_data["profesor"]
+    subject = test_data["subject"]
+    enrollment = test_data["enrollment"]
+    token = create_access_token({"sub": profesor.email, "role": profesor.role.value})
+
+    body = (
+        "enrollment_id,estudiante_id,nota,fecha,observaciones\n"
+        f"{enrollment.id},,4.5,2024-06-01,\"Parcial, primer corte\"\n"
+        f",{test_data['estudiante'].id},3.5,2024-06-15,\n"
+    )
+    response = await client.post(
+        f"/api/v1/grades/bulk?subject_id={subject.id}&periodo=2024-1",
+        content=body.encode(),
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"received": 2, "inserted": 2, "failed": 0, "atomic": True, "errors": []}
+    assert await _count_grades(db_session, enrollment.id) == 2
+    stats = await GradeStatsRepository(db_session).get_by_enrollment(enrollment.id)
+    await db_session.refresh(stats)
+    assert stats.grade_count == 2
+    assert stats.grade_sum == Decimal("8.00")
+
+
+@pytest.mark.asyncio
+async def test_bulk_grades_atomic_rejects_whole_batch(client, db_session: AsyncSession, test_data):
+    """With atomic=true one bad row prevents every insert."""
+    admin = test_data["admin"]
+    enrollment = test_data["enrollment"]
+    token = create_access_token({"sub": admin.email, "role": admin.role.value})
+
+    response = await client.post(
+        f"/api/v1/grades/bulk?subject_id={test_data['subject'].id}&periodo=2024-1",
+        json=[
+            {"enrollment_id": enrollment.id, "nota": 4.0, "fecha": "2024-06-01"},
+            {"enrollment_id": enrollment.id, "nota": 7.0, "fecha": "2024-06-01"},
+            {"enrollment_id": 999999, "nota": 3.0, "fecha": "2024-06-01"},
+        ],
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 422
+    data = response.json()
+    assert data["inserted"] == 0
+    assert data["failed"] == 2
+    assert [error["row"] for error in data["errors"]] == [2, 3]
+    assert data["errors"][0]["error"].startswith("nota:")
+    assert "does not belong to subject" in data["errors"][1]["error"]
+    assert await _count_grades(db_session, enrollment.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_grades_best_effort_inserts_valid_rows(client, db_session: AsyncSession, test_data):
+    """With atomic=false valid rows are inserted and failures reported."""
+    admin = test_data["admin"]
+    enrollment = test_data["enrollment"]
+    token = create_access_token({"sub": admin.email, "role": admin.role.value})
+
+    response = await client.post(
+        f"/api/v1/grades/bulk?subject_id={test_data['subject'].id}&periodo=2024-1&atomic=false",
+        json=[
+            {"enrollment_id": enrollment.id, "nota": 4.0, "fecha": "2024-06-01"},
+            {"estudiante_id": test_data["admin"].id, "nota": 3.0, "fecha": "2024-06-01"},
+        ],
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["inserted"], data["failed"]) == (1, 1)
+    assert data["errors"][0]["row"] == 2
+    assert await _count_grades(db_session, enrollment.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_grades_rejects_bad_bodies(client, db_session: AsyncSession, test_data):
+    """Unsupported content types and malformed bodies fail before any insert."""
+    admin = test_data["admin"]
+    token = create_access_token({"sub": admin.email, "role": admin.role.value})
+    url = f"/api/v1/grades/bulk?subject_id={test_data['subject'].id}&periodo=2024-1"
+
+    response = await client.post(
+        url, content=b"x", headers={"Authorization": f"Bearer {token}", "Content-Type": "text/plain"}
+    )
+    assert response.status_code == 415
+
+    response = await client.post(
+        url,
+        content=b'[{"enrollment_id": 1,',
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+    )
+    assert response.status_code == 400
+
+    response = await client.post(
+        "/api/v1/grades/bulk?subject_id=999999&periodo=2024-1",
+        json=[],
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bulk_grades_profesor_unassigned_subject(client, db_session: AsyncSession, test_data):
+    """Profesores cannot upload grades for subjects they do not teach."""
+    other = User(
+        email="otro.profesor@test.com",
+        password_hash=get_password_hash("prof123"),
+        role=UserRole.PROFESOR,
+        nombre="Otro",
+        apellido="Profesor",
+        codigo_institucional="PROF-BULK-OTHER",
+        fecha_nacimiento=date(1980, 1, 1),
+    )
+    db_session.add(other)
+    await db_session.commit()
+    token = create_access_token({"sub": other.email, "role": other.role.value})
+
+    response = await client.post(
+        f"/api/v1/grades/bulk?subject_id={test_data['subject'].id}&periodo=2024-1",
+        json=[{"enrollment_id": test_data["enrollment"].id, "nota": 4.0, "fecha": "2024-06-01"}],
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
+    assert await _count_grades(db_session, test_data["enrollment"].id) == 0
@@ -426,6 +426,21 @@ async def test_get_general_report_html_format(client: AsyncClient, test_data_rep
     assert len(response.content) > 0
 
 
+@pytest.mark.asyncio
+async def test_get_general_report_html_streamed(client: AsyncClient, test_data_reports_endpoints, estudiante_token):
+    """Test get_general_report streams HTML with the same content as the buffered render."""
+    response = await client.get(
+        "/api/v1/reports/general",
+        params={"format": "html", "stream": True},
+        headers={"Authorization": f"Bearer {estudiante_token}"},
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert "attachment" in response.headers.get("content-disposition", "")
+    assert "</html>" in response.text
+
+
 @pytest.mark.asyncio
 async def test_get_general_report_unauthorized_admin(client: AsyncClient, admin_token):
     """Test get_general_report as admin (should be forbidden)."""
@@ -0,0 +1,57 @@
+"""Tests for streaming bulk upload parsers."""
+
+import pytest
+from app.utils.bulk_ingest import BulkFormatError, iter_records, media_type
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def _parse(data: str, content_type: str, size: int = 3):
+    return [record async for record in iter_records(_chunks(data.encode(), size), content_type)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 3, 1024])
+async def test_csv_records_across_chunk_boundaries(size):
+    """Quoted commas and newlines survive arbitrary chunking; empty cells become None."""
+    body = '﻿enrollment_id,nota,observaciones\r\n1,4.5,"dos\nlineas, con coma"\r\n\r\n2,3,\n'
+    records = await _parse(body, "text/csv; charset=utf-8", size)
+    assert records == [
+        {"enrollment_id": "1", "nota": "4.5", "observaciones": "dos\nlineas, con coma"},
+        {"enrollment_id": "2", "nota": "3", "observaciones": None},
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 3, 1024])
+async def test_json_records_across_chunk_boundaries(size):
+    """Array elements are yielded one by one whatever the chunk size."""
+    body = ' [ {"a": 1}, {"b": "x,]}"} ]\n'
+    assert await _parse(body, "application/json", size) == [{"a": 1}, {"b": "x,]}"}]
+    assert await _parse("[]", "application/json", size) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body, content_type, message", [
+    ('{"a": 1}', "application/json", "array"),
+    ("[1]", "application/json", "not an object"),
+    ('[{"a": 1} {"b": 2}]', "application/json", "Expected ','"),
+    ('[{"a": 1},]', "application/json", "not an object"),
+    ('[{"a": 1}', "application/json", "complete array"),
+    ('[{"a": 1}] []', "application/json", "after the JSON array"),
+    ('a,b\n1,"x', "text/csv", "Unterminated"),
+    ("", "text/csv", "header"),
+    ("a", "text/plain", "Unsupported content type"),
+])
+async def test_malformed_bodies(body, content_type, message):
+    """Malformed bodies raise BulkFormatError with a descriptive message."""
+    with pytest.raises(BulkFormatError, match=message):
+        await _parse(body, content_type)
+
+
+def test_media_type():
+    assert media_type("Text/CSV; charset=utf-8") == "text/csv"
+    assert media_type(None) == ""
@@ -0,0 +1,278 @@
+"""Tests for the async result cache."""
+
+import asyncio
+import pytest
+from datetime import date
+from decimal import Decimal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import (
+    Cache,
+    LocalKeyValueStore,
+    MemoryCacheBackend,
+    SharedCacheBackend,
+    cache as app_cache,
+    create_cache_backend,
+    make_key,
+)
+from app.models.enrollment import Enrollment
+from app.models.subject import Subject
+from app.models.user import User, UserRole
+from app.schemas.grade import GradeCreate, GradeUpdate
+from app.services.grade_service import GradeService
+
+
+def _memory_cache(max_entries: int = 100, ttl: float = 60.0) -> Cache:
+    return Cache(MemoryCacheBackend(max_entries=max_entries), default_ttl_seconds=ttl)
+
+
+class CountingService:
+    """Service whose calls are counted, cached through a test cache."""
+
+    test_cache = _memory_cache()
+
+    def __init__(self, db=None):
+        self.db = db
+        self.calls = 0
+
+    @test_cache.cached(namespace="counting", tags=("item:{item_id}",))
+    async def get(self, item_id: int, scale: int = 1) -> int:
+        self.calls += 1
+        return item_id * scale
+
+
+@pytest.fixture(autouse=True)
+async def clear_test_cache():
+    """Start every test with an empty test cache."""
+    await CountingService.test_cache.clear()
+
+
+class TestKeys:
+    """Tests for cache key building."""
+
+    def test_keys_keep_argument_types(self):
+        """Test values that print alike but differ in type give different keys."""
+        assert make_key("ns", 5) != make_key("ns", "5")
+        assert make_key("ns", 1) != make_key("ns", True)
+        assert make_key("ns", Decimal("1.5")) != make_key("ns", 1.5)
+
+    def test_keys_encode_structured_values(self):
+        """Test dates, enums, containers and pydantic models are supported."""
+        key = make_key(
+            "ns",
+            date(2024, 1, 1),
+            UserRole.ESTUDIANTE,
+            (1, 2),
+            {"b": 2, "a": 1},
+            GradeUpdate(nota=Decimal("4.5")),
+        )
+        assert key.startswith("ns:date:2024-01-01,UserRole.ESTUDIANTE,[int:1,int:2]")
+        assert make_key("ns", {"a": 1, "b": 2}) == make_key("ns", {"b": 2, "a": 1})
+
+    def test_long_keys_are_hashed(self):
+        """Test long keys are replaced by a digest."""
+        key = make_key("ns", "x" * 500)
+        assert len(key) == len("ns:") + 64
+
+    def test_unsupported_values_are_rejected(self):
+        """Test objects without a stable representation cannot be keys."""
+        with pytest.raises(TypeError):
+            make_key("ns", object())
+
+    @pytest.mark.asyncio
+    async def test_instances_and_sessions_share_entries(self, db_session: AsyncSession):
+        """Test self and sessions are not part of the key."""
+        first, second = CountingService(db_session), CountingService()
+        assert await first.get(3) == 3
+        assert await second.get(3) == 3
+        assert first.calls + second.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_positional_and_keyword_calls_share_entries(self):
+        """Test arguments are bound by name (defaults included)."""
+        service = CountingService()
+        await service.get(3)
+        await service.get(item_id=3)
+        await service.get(3, scale=1)
+        assert service.calls == 1
+        assert await service.get(3, scale=2) == 6
+        assert service.calls == 2
+
+
+class TestCache:
+    """Tests for loading, invalidation and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_load_once(self):
+        """Test single-flight: concurrent callers of one key share one load."""
+        cache = _memory_cache()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get_or_load("ns:k", loader) for _ in range(5)))
+        assert results == ["value"] * 5
+        assert calls == 1
+        stats = cache.stats()["totals"]
+        assert stats["misses"] == 1
+        assert stats["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_loader_errors_are_not_cached(self):
+        """Test a failing load is retried by the next caller."""
+        cache = _memory_cache()
+
+        async def failing():
+            raise ValueError("boom")
+
+        async def working():
+            return 1
+
+        with pytest.raises(ValueError):
+            await cache.get_or_load("ns:k", failing)
+        assert await cache.get_or_load("ns:k", working) == 1
+
+    @pytest.mark.asyncio
+    async def test_tag_invalidation(self):
+        """Test invalidating a tag reloads only the entries stored under it."""
+        service = CountingService()
+        await service.get(1)
+        await service.get(2)
+        await CountingService.test_cache.invalidate_tags("item:1")
+        await service.get(1)
+        await service.get(2)
+        assert service.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_is_not_lost(self):
+        """Test a value loaded before an invalidation is not served after it."""
+        cache = _memory_cache()
+
+        async def racing_loader():
+            await cache.invalidate_tags("t")
+            return "old"
+
+        async def fresh_loader():
+            return "new"
+
+        assert await cache.get_or_load("ns:k", racing_loader, tags=["t"]) == "old"
+        assert await cache.get_or_load("ns:k", fresh_loader, tags=["t"]) == "new"
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_and_ttl(self):
+        """Test the memory backend drops least recently used and expired entries."""
+        cache = _memory_cache(max_entries=2, ttl=0.05)
+
+        async def value(v):
+            return v
+
+        await cache.get_or_load("ns:a", lambda: value("a"))
+        await cache.get_or_load("ns:b", lambda: value("b"))
+        await cache.get_or_load("ns:a", lambda: value("stale"))
+        await cache.get_or_load("ns:c", lambda: value("c"))
+        assert await cache.get_or_load("ns:a", lambda: value("reloaded")) == "a"
+        assert await cache.get_or_load("ns:b", lambda: value("reloaded")) == "reloaded"
+        assert cache.backend.evictions == 2
+
+        await asyncio.sleep(0.06)
+        assert await cache.get_or_load("ns:a", lambda: value("expired")) == "expired"
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_caching(self):
+        """Test a TTL of 0 always calls the loader."""
+        cache = _memory_cache(ttl=0)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        await cache.get_or_load("ns:k", loader)
+        await cache.get_or_load("ns:k", loader)
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_backend_is_seen_by_every_worker(self):
+        """Test two caches on one shared store share values and invalidations."""
+        store = LocalKeyValueStore()
+        worker_a = Cache(SharedCacheBackend(store), default_ttl_seconds=60)
+        worker_b = Cache(SharedCacheBackend(store), default_ttl_seconds=60)
+
+        async def value(v):
+            return v
+
+        await worker_a.get_or_load("ns:k", lambda: value({"n": 1}), tags=["t"])
+        assert await worker_b.get_or_load("ns:k", lambda: value("miss"), tags=["t"]) == {"n": 1}
+
+        await worker_b.invalidate_tags("t")
+        assert await worker_a.get_or_load("ns:k", lambda: value("reloaded"), tags=["t"]) == "reloaded"
+
+        await worker_a.clear()
+        assert [key async for key in store.scan_iter()] == []
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_falls_back_to_loader(self):
+        """Test an unavailable backend does not fail the call."""
+
+        class BrokenStore(LocalKeyValueStore):
+            async def get(self, key):
+                raise ConnectionError("down")
+
+        cache = Cache(SharedCacheBackend(BrokenStore()), default_ttl_seconds=60)
+
+        async def loader():
+            return 7
+
+        assert await cache.get_or_load("ns:k", loader) == 7
+        assert cache.stats()["namespaces"]["ns"]["errors"] == 1
+
+    def test_create_cache_backend(self):
+        """Test backend selection from settings values."""
+        assert isinstance(create_cache_backend("memory", max_entries=10), MemoryCacheBackend)
+        shared = create_cache_backend("shared", max_entries=10)
+        assert isinstance(shared.client, LocalKeyValueStore)
+        with pytest.raises(ValueError):
+            create_cache_backend("disk", max_entries=10)
+
+
+@pytest.mark.asyncio
+async def test_grade_average_is_cached_until_grades_change(db_session: AsyncSession):
+    """Test GradeService.calculate_average is served from cache and invalidated on writes."""
+    profesor = User(
+        email="cache.prof@test.com", password_hash="hash", role=UserRole.PROFESOR,
+        nombre="Cache", apellido="Profesor", codigo_institucional="PROF-CACHE",
+        fecha_nacimiento=date(1980, 1, 1),
+    )
+    estudiante = User(
+        email="cache.est@test.com", password_hash="hash", role=UserRole.ESTUDIANTE,
+        nombre="Cache", apellido="Estudiante", codigo_institucional="EST-CACHE",
+        fecha_nacimiento=date(2000, 1, 1),
+    )
+    db_session.add_all([profesor, estudiante])
+    await db_session.flush()
+    subject = Subject(
+        codigo_institucional="MAT-CACHE", nombre="Cálculo", numero_creditos=3, profesor_id=profesor.id,
+    )
+    db_session.add(subject)
+    await db_session.flush()
+    enrollment = Enrollment(estudiante_id=estudiante.id, subject_id=subject.id)
+    db_session.add(enrollment)
+    await db_session.commit()
+
+    service = GradeService(db_session)
+    grade = await service.create_grade(GradeCreate(
+        enrollment_id=enrollment.id, nota=Decimal("4.0"), periodo="2024-1", fecha=date(2024, 6, 1),
+    ))
+    assert await service.calculate_average(enrollment.id) == Decimal("4.0")
+    assert await GradeService(db_session).calculate_average(enrollment.id) == Decimal("4.0")
+
+    await service.update_grade(grade.id, GradeUpdate(nota=Decimal("3.0")))
+    assert await service.calculate_average(enrollment.id) == Decimal("3.0")
+
+    namespace = app_cache.stats()["namespaces"]["grades.average"]
+    assert namespace["hits"] == 1
+    assert namespace["misses"] == 2
@@ -0,0 +1,136 @@
+"""Tests for counter-based institutional code allocation."""
+
+import asyncio
+import pytest
+from datetime import date, datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.core.database import Base
+from app.models.code_counter import CodeCounter
+from app.models.subject import Subject
+from app.models.user import User, UserRole
+from app.utils.codigo_generator import (
+    SUBJECT_CODE_YEAR,
+    generar_codigo_institucional,
+    generar_codigo_materia,
+    reservar_bloque,
+    reservar_codigos_institucionales,
+)
+
+
+YEAR = datetime.now().year
+
+
+@pytest.mark.asyncio
+async def test_codes_are_sequential(db_session: AsyncSession):
+    """Test consecutive allocations increment the counter."""
+    first = await generar_codigo_institucional(db_session, "Estudiante")
+    second = await generar_codigo_institucional(db_session, "Estudiante")
+    profesor = await generar_codigo_institucional(db_session, "Profesor")
+
+    assert first == f"EST-{YEAR}-0001"
+    assert second == f"EST-{YEAR}-0002"
+    assert profesor == f"PROF-{YEAR}-0001"
+
+
+@pytest.mark.asyncio
+async def test_block_reservation_is_consecutive(db_session: AsyncSession):
+    """Test a block reserves consecutive codes with one counter update."""
+    await generar_codigo_institucional(db_session, "Estudiante")
+    codigos = await reservar_codigos_institucionales(db_session, "Estudiante", 3)
+    siguiente = await generar_codigo_institucional(db_session, "Estudiante")
+
+    assert codigos == [f"EST-{YEAR}-{n:04d}" for n in (2, 3, 4)]
+    assert siguiente == f"EST-{YEAR}-0005"
+    counter = await db_session.get(CodeCounter, ("EST", YEAR))
+    assert counter.last_value == 5
+
+
+@pytest.mark.asyncio
+async def test_new_counter_starts_after_existing_codes(db_session: AsyncSession):
+    """Test a counter created on first use continues after codes already assigned."""
+    db_session.add(User(
+        email="legacy@test.com",
+        password_hash="hash",
+        role=UserRole.ESTUDIANTE,
+        nombre="Legacy",
+        apellido="Estudiante",
+        codigo_institucional=f"EST-{YEAR}-0041",
+        fecha_nacimiento=date(2000, 1, 1),
+    ))
+    await db_session.commit()
+
+    assert await generar_codigo_institucional(db_session, "Estudiante") == f"EST-{YEAR}-0042"
+
+
+@pytest.mark.asyncio
+async def test_subject_codes_use_yearless_counter(db_session: AsyncSession):
+    """Test subject codes share one counter per prefix without a year."""
+    profesor = User(
+        email="prof.codes@test.com",
+        password_hash="hash",
+        role=UserRole.PROFESOR,
+        nombre="Prof",
+        apellido="Codes",
+        codigo_institucional="PROF-CODES",
+        fecha_nacimiento=date(1980, 1, 1),
+    )
+    db_session.add(profesor)
+    await db_session.flush()
+    db_session.add(Subject(
+        nombre="Matemáticas", codigo_institucional="MATE-007", numero_creditos=3, profesor_id=profesor.id,
+    ))
+    await db_session.commit()
+
+    assert await generar_codigo_materia(db_session, "Matemáticas Discretas") == "MATE-008"
+    counter = await db_session.get(CodeCounter, ("MATE", SUBJECT_CODE_YEAR))
+    assert counter.last_value == 8
+
+
+@pytest.mark.asyncio
+async def test_rollback_returns_reserved_numbers(db_session: AsyncSession):
+    """Test numbers reserved in a rolled-back transaction are reused."""
+    await generar_codigo_institucional(db_session, "Admin")
+    await db_session.commit()
+    await generar_codigo_institucional(db_session, "Admin")
+    await db_session.rollback()
+
+    assert await generar_codigo_institucional(db_session, "Admin") == f"ADM-{YEAR}-0002"
+
+
+@pytest.mark.asyncio
+async def test_reservar_bloque_rejects_empty_block(db_session: AsyncSession):
+    """Test a non-positive block size is rejected."""
+    with pytest.raises(ValueError):
+        await reservar_bloque(db_session, "EST", YEAR, 0, User.codigo_institucional)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sessions_get_distinct_codes(tmp_path):
+    """Test allocations from separate connections never collide."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'codes.db'}",
+        connect_args={"timeout": 30},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def allocate() -> list:
+        async with session_factory() as session:
+            codigos = await reservar_codigos_institucionales(session, "Estudiante", 2)
+            await session.commit()
+            return codigos
+
+    try:
+        results = await asyncio.gather(*(allocate() for _ in range(10)))
+        async with session_factory() as session:
+            last_value = (await session.execute(
+                select(CodeCounter.last_value).where(CodeCounter.prefix == "EST")
+            )).scalar_one()
+    finally:
+        await engine.dispose()
+
+    codigos = [codigo for block in results for codigo in block]
+    assert len(set(codigos)) == 20
+    assert last_value == 20
@@ -10,7 +10,6 @@ from app.core.decorators import (
     log_execution_time,
     retry_on_db_lock,
     validate_not_none,
-    cache_result,
 )
 from app.core.exceptions import ValidationError, NotFoundError, ConflictError
 
@@ -317,261 +316,6 @@ class TestValidateNotNone:
             await function_with_defaults(None)
 
 
-class TestCacheResult:
-    """Tests for @cache_result decorator."""
-
-    @pytest.mark.asyncio
-    async def test_caches_result_for_first_call(self):
-        """Test that result is cached on first call."""
-        call_count = 0
-
-        @cache_result(ttl_seconds=300)
-        async def expensive_function(value: int):
-            nonlocal call_count
-            call_count += 1
-            return value * 2
-
-        result1 = await expensive_function(5)
-        assert result1 == 10
-        assert call_count == 1
-
-        # Second call should use cache
-        result2 = await expensive_function(5)
-        assert result2 == 10
-        assert call_count == 1  # Should not call again
-
-    @pytest.mark.asyncio
-    async def test_cache_expires_after_ttl(self):
-        """Test that cache expires after TTL."""
-        call_count = 0
-
-        @cache_result(ttl_seconds=0.1)  # Very short TTL
-        async def timed_function(value: int):
-            nonlocal call_count
-            call_count += 1
-            return value * 2
-
-        # First call
-        result1 = await timed_function(5)
-        assert result1 == 10
-        assert call_count == 1
-
-        # Second call immediately (should use cache)
-        result2 = await timed_function(5)
-        assert result2 == 10
-        assert call_count == 1
-
-        # Wait for TTL to expire
-        import asyncio
-        await asyncio.sleep(0.2)
-
-        # Third call after expiration (should call again)
-        result3 = await timed_function(5)
-        assert result3 == 10
-        assert call_count == 2  # Should call again
-
-    @pytest.mark.asyncio
-    async def test_cache_key_includes_function_and_args(self):
-        """Test that different arguments create different cache keys."""
-        call_count = 0
-
-        @cache_result(ttl_seconds=300)
-        async def function_with_args(value: int, multiplier: int = 2):
-            nonlocal call_count
-            call_count += 1
-            return value * multiplier
-
-        # First call with value=5
-        result1 = await function_with_args(5)
-        assert result1 == 10
-        assert call_count == 1
-
-        # Second call with value=5 (same args - should use cache)
-        result2 = await function_with_args(5)
-        assert result2 == 10
-        assert call_count == 1
-
-        # Third call with value=10 (different args - should call again)
-        result3 = await function_with_args(10)
-        assert result3 == 20
-        assert call_count == 2
-
-        # Fourth call with value=5 again (should use cache)
-        result4 = await function_with_args(5)
-        assert result4 == 10
-        assert call_count == 2  # Still 2, using cache
-
-    @pytest.mark.asyncio
-    async def test_cache_works_with_kwargs(self):
-        """Test that cache works correctly with kwargs."""
-        call_count = 0
-
-        @cache_result(ttl_seconds=300)
-        async def function_with_kwargs(value: int, multiplier: int = 2):
-            nonlocal call_count
-            call_count += 1
-            return value * multiplier
-
-        # First call with positional args
-        result1 = await function_with_kwargs(5)
-        assert call_count == 1
-
-        # Second call with kwargs (different call signature but same result)
-        result2 = await function_with_kwargs(value=5)
-        # These should be different cache keys due to different call signatures
-        assert call_count == 2  # Should call again due to different cache key
-
-    @pytest.mark.asyncio
-    async def test_cache_cleanup_removes_expired_entries(self):
-        """Test that cache cleanup removes expired entries."""
-        call_count = 0
-
-        @cache_result(ttl_seconds=0.1)
-        async def many_cached_values(value: int):
-            nonlocal call_count
-            call_count += 1
-            return value
-
-        # Create many cache entries
-        for i in range(100):
-            await many_cached_values(i)
-
-        assert call_count == 100
-
-        # Wait for all to expire
-        import asyncio
-        await asyncio.sleep(0.2)
-
-        # Trigger cleanup by adding more entries (cache > 1000 should trigger cleanup)
-        # Actually, we need to add enough to trigger the cleanup (len(cache) > 1000)
-        # But we can test that expired entries are removed when cache is large
-        # For now, let's test that new entries work after expiration
-        result = await many_cached_values(0)
-        assert result == 0
-        assert call_count == 101  # Should call again after expiration
-
-    @pytest.mark.asyncio
-    async def test_cache_cleanup_triggers_when_over_threshold(self):
-        """Test that cache cleanup is triggered when cache size exceeds 1000 (lines 247-253)."""
-        call_count = 0
-
-        @cache_result(ttl_seconds=0.01)  # Very short TTL so entries expire quickly
-        async def create_many_entries(i: int):
-            nonlocal call_count
-            call_count += 1
-            return i
-
-        # First, create entries that will expire
-        for i in range(100):
-            await create_many_entries(i)
-        
-        assert call_count == 100
-
-        # Wait for entries to expire
-        import asyncio
-        await asyncio.sleep(0.02)
-
-        # Now create enough entries to exceed 1000 threshold (lines 246-253)
-        # When adding entry 1001, cleanup should be triggered
-        # Since previous 100 entries are expired, they should be removed (line 253)
-        for i in range(100, 1002):
-            await create_many_entries(i)
-
-        assert call_count == 1002  # Should have called function for all new entries
-
-        # Verify that expired entries were cleaned up
-        # Create one more entry that should trigger cleanup again
-        result = await create_many_entries(2000)
-        assert result == 2000
-        assert call_count == 1003  # Should increment
-
-        # Verify cache still works for recent entries
-        result_cached = await create_many_entries(2000)
-        assert result_cached == 2000
-        assert call_count == 1003  # Should use cache, no increment
-
-    @pytest.mark.asyncio
-    async def test_cache_cleanup_on_large_cache(self):
-        """Test that cache cleanup is triggered when cache is large."""
-        call_count = 0
-        
-        @cache_result(ttl_seconds=300)
-        async def create_cache_entry(i: int):
-            nonlocal call_count
-            call_count += 1
-            return i
-
-        # Create many entries (but not enough to trigger cleanup threshold of 1000)
-        # We'll create 50 entries and verify they're cached
-        for i in range(50):
-            await create_cache_entry(i)
-        
-        assert call_count == 50
-
-        # All should be cached (same arguments)
-        result = await create_cache_entry(0)
-        assert result == 0
-        assert call_count == 50  # Still 50, using cache
-        
-        # New argument should call function
-        result_new = await create_cache_entry(100)
-        assert result_new == 100
-        assert call_count == 51  # Should increment for new argument
-
-    @pytest.mark.asyncio
-    async def test_cache_logs_hit(self):
-        """Test that cache hit is logged."""
-        @cache_result(ttl_seconds=300)
-        async def cached_function(value: int):
-            return value * 2
-
-        with patch('app.core.decorators.logger') as mock_logger:
-            # First call (cache miss)
-            await cached_function(5)
-            # Should not log cache hit yet
-            
-            # Second call (cache hit)
-            await cached_function(5)
-            # Should log cache hit
-            mock_logger.debug.assert_called()
-            assert "Cache hit" in str(mock_logger.debug.call_args)
-
-    @pytest.mark.asyncio
-    async def test_cache_handles_different_function_instances(self):
-        """Test that cache works correctly with different function instances."""
-        # Each decorator call creates its own cache, so this should work
-        call_count_1 = 0
-        call_count_2 = 0
-
-        @cache_result(ttl_seconds=300)
-        async def function1(value: int):
-            nonlocal call_count_1
-            call_count_1 += 1
-            return value + 1
-
-        @cache_result(ttl_seconds=300)
-        async def function2(value: int):
-            nonlocal call_count_2
-            call_count_2 += 1
-            return value + 2
-
-        # Call both functions
-        result1 = await function1(5)
-        result2 = await function2(5)
-
-        assert result1 == 6
-        assert result2 == 7
-        assert call_count_1 == 1
-        assert call_count_2 == 1
-
-        # Call again - both should use cache
-        await function1(5)
-        await function2(5)
-
-        assert call_count_1 == 1
-        assert call_count_2 == 1
-
-
 class TestHandleRepositoryErrorsEdgeCases:
     """Edge cases for @handle_repository_errors decorator."""
 
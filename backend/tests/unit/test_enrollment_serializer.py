@@ -7,6 +7,7 @@ from app.models.user import User, UserRole
 from app.models.subject import Subject
 from app.models.enrollment import Enrollment
 from app.api.v1.serializers.enrollment_serializer import EnrollmentSerializer
+from app.repositories.enrollment_repository import EnrollmentRepository
 from app.utils.codigo_generator import generar_codigo_institucional
 from app.core.security import get_password_hash
 
@@ -171,3 +172,32 @@ async def test_serialize_batch_missing_subject_in_map(
     # Second enrollment should still have subject
     assert result[1].subject is not None
 
+
+
+@pytest.mark.asyncio
+async def test_serialize_batch_only_fetches_unloaded_relationships(
+    db_session: AsyncSession, test_data_enrollment_serializer, count_queries
+):
+    """Test joined-loaded estudiante and subject relationships are reused."""
+    estudiante_id = test_data_enrollment_serializer["estudiante"].id
+    repo = EnrollmentRepository(db_session)
+    
+    db_session.expunge_all()
+    enrollments = await repo.get_many_with_relations(
+        estudiante_id=estudiante_id, relations=['estudiante', 'subject']
+    )
+    count_queries.clear()
+    result = await EnrollmentSerializer.serialize_batch(enrollments, db_session)
+    assert count_queries == []
+    assert {r.subject.nombre for r in result} == {s.nombre for s in test_data_enrollment_serializer["subjects"]}
+    
+    db_session.expunge_all()
+    enrollments = await repo.get_many_with_relations(
+        estudiante_id=estudiante_id, relations=['estudiante']
+    )
+    count_queries.clear()
+    result = await EnrollmentSerializer.serialize_batch(enrollments, db_session)
+    # Only the subjects are fetched
+    assert len(count_queries) == 1
+    assert "subjects" in count_queries[0]
+    assert all(r.estudiante is not None and r.subject is not None for r in result)
@@ -0,0 +1,55 @@
+"""Tests for fast JSON encoding of responses and JSON reports."""
+
+import json
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from app.core import fast_json
+from app.core.fast_json import FastJSONResponse, dumps
+from app.factories import ReportFactory
+from app.main import app
+
+
+VALUE = {
+    "nombre": "Matemáticas",
+    "fecha": date(2024, 3, 1),
+    "generado": datetime(2024, 3, 1, 8, 30),
+    "nota": Decimal("4.5"),
+    1: [1.5, None, True],
+}
+COMPACT = (
+    '{"nombre":"Matemáticas","fecha":"2024-03-01","generado":"2024-03-01T08:30:00",'
+    '"nota":"4.5","1":[1.5,null,true]}'
+)
+
+
+def test_dumps_is_compact_utf8():
+    """Test values are encoded once to compact UTF-8 bytes."""
+    assert dumps(VALUE) == COMPACT.encode("utf-8")
+    assert json.loads(dumps(VALUE, indent=True)) == json.loads(COMPACT)
+    assert b'\n  "nombre"' in dumps(VALUE, indent=True)
+
+
+def test_standard_library_fallback(monkeypatch):
+    """Test the fallback without orjson produces the same output."""
+    monkeypatch.setattr(fast_json, "orjson", None)
+    assert dumps(VALUE) == COMPACT.encode("utf-8")
+    assert json.loads(dumps(VALUE, indent=True)) == json.loads(COMPACT)
+
+
+@pytest.mark.asyncio
+async def test_json_report_is_encoded_once():
+    """Test JSON reports carry ready-to-send bytes."""
+    data = {"estudiante": {"nombre": "Ana", "codigo_institucional": "EST-2024-0001"}, "subjects": []}
+    report = await ReportFactory.create_generator("json").render(data)
+
+    assert isinstance(report["content"], bytes)
+    assert b"\n" not in report["content"]
+    assert json.loads(report["content"])["estudiante"]["nombre"] == "Ana"
+
+
+def test_list_endpoints_use_fast_responses():
+    """Test API routes render with FastJSONResponse by default."""
+    routes = {route.path: route for route in app.routes if hasattr(route, "response_class")}
+    for path in ("/api/v1/grades", "/api/v1/enrollments", "/api/v1/subjects"):
+        assert routes[path].response_class is FastJSONResponse
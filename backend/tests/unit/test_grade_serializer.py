@@ -3,12 +3,14 @@
 import pytest
 from datetime import date
 from decimal import Decimal
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.user import User, UserRole
 from app.models.subject import Subject
 from app.models.enrollment import Enrollment
 from app.models.grade import Grade
 from app.api.v1.serializers.grade_serializer import GradeSerializer
+from app.repositories.grade_repository import GradeRepository
 from app.utils.codigo_generator import generar_codigo_institucional
 from app.core.security import get_password_hash
 
@@ -227,3 +229,37 @@ async def test_serialize_batch_missing_subject_in_map(
     assert result[0].enrollment is not None
     assert result[0].enrollment.subject is None
 
+
+
+@pytest.mark.asyncio
+async def test_serialize_batch_reuses_loaded_relationships(
+    db_session: AsyncSession, test_data_grade_serializer, count_queries
+):
+    """Test relationships joined-loaded by the repository are not fetched again."""
+    enrollment = test_data_grade_serializer["enrollment"]
+    db_session.expunge_all()
+    grades = await GradeRepository(db_session).get_many_with_relations(
+        enrollment_id=enrollment.id, relations=['enrollment']
+    )
+    count_queries.clear()
+    
+    result = await GradeSerializer.serialize_batch(grades, db_session)
+    
+    assert count_queries == []
+    assert {r.enrollment.subject.nombre for r in result} == {"Matemáticas"}
+
+
+@pytest.mark.asyncio
+async def test_serialize_batch_fetches_missing_relationships(
+    db_session: AsyncSession, test_data_grade_serializer, count_queries
+):
+    """Test unloaded relationships are batch loaded without lazy loads."""
+    db_session.expunge_all()
+    grades = (await db_session.execute(select(Grade))).scalars().all()
+    count_queries.clear()
+    
+    result = await GradeSerializer.serialize_batch(grades, db_session)
+    
+    # One query each for enrollments, estudiantes and subjects
+    assert len(count_queries) == 3
+    assert all(r.enrollment.estudiante.nombre == "Juan" for r in result)
@@ -0,0 +1,134 @@
+"""Tests for materialized enrollment grade statistics."""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.enrollment import Enrollment
+from app.models.grade import Grade
+from app.models.subject import Subject
+from app.models.user import User, UserRole
+from app.repositories.grade_repository import GradeRepository
+from app.repositories.grade_stats_repository import GradeStatsRepository
+from app.schemas.grade import GradeCreate, GradeUpdate
+from app.services.grade_service import GradeService
+
+
+@pytest.fixture
+async def enrollment(db_session: AsyncSession) -> Enrollment:
+    """Create an enrollment without grades."""
+    profesor = User(
+        email="stats.prof@test.com",
+        password_hash="hash",
+        role=UserRole.PROFESOR,
+        nombre="Stats",
+        apellido="Profesor",
+        codigo_institucional="PROF-STATS",
+        fecha_nacimiento=date(1980, 1, 1),
+    )
+    estudiante = User(
+        email="stats.est@test.com",
+        password_hash="hash",
+        role=UserRole.ESTUDIANTE,
+        nombre="Stats",
+        apellido="Estudiante",
+        codigo_institucional="EST-STATS",
+        fecha_nacimiento=date(2000, 1, 1),
+    )
+    db_session.add_all([profesor, estudiante])
+    await db_session.flush()
+    subject = Subject(
+        codigo_institucional="MAT-STATS",
+        nombre="Estadística",
+        numero_creditos=3,
+        profesor_id=profesor.id,
+    )
+    db_session.add(subject)
+    await db_session.flush()
+    enrollment = Enrollment(estudiante_id=estudiante.id, subject_id=subject.id)
+    db_session.add(enrollment)
+    await db_session.commit()
+    return enrollment
+
+
+def _grade(enrollment_id: int, nota: str) -> GradeCreate:
+    return GradeCreate(
+        enrollment_id=enrollment_id,
+        nota=Decimal(nota),
+        periodo="2024-1",
+        fecha=date(2024, 6, 1),
+    )
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_service_writes(db_session: AsyncSession, enrollment: Enrollment):
+    """Create, update and delete through GradeService keep the row current."""
+    service = GradeService(db_session)
+    stats_repo = GradeStatsRepository(db_session)
+
+    assert await stats_repo.get_by_enrollment(enrollment.id) is None
+
+    first = await service.create_grade(_grade(enrollment.id, "3.00"))
+    second = await service.create_grade(_grade(enrollment.id, "4.50"))
+    stats = await stats_repo.get_by_enrollment(enrollment.id)
+    await db_session.refresh(stats)
+    assert stats.grade_count == 2
+    assert stats.grade_sum == Decimal("7.50")
+    assert stats.grade_min == Decimal("3.00")
+    assert stats.grade_max == Decimal("4.50")
+
+    await service.update_grade(first.id, GradeUpdate(nota=Decimal("5.00")))
+    stats = await stats_repo.get_by_enrollment(enrollment.id)
+    await db_session.refresh(stats)
+    assert stats.grade_sum == Decimal("9.50")
+    assert stats.grade_min == Decimal("4.50")
+
+    await service.delete_grade(second.id)
+    stats = await stats_repo.get_by_enrollment(enrollment.id)
+    await db_session.refresh(stats)
+    assert stats.grade_count == 1
+    assert stats.grade_max == Decimal("5.00")
+
+    await service.delete_grade(first.id)
+    assert await stats_repo.get_by_enrollment(enrollment.id) is None
+    assert await stats_repo.find_drift() == []
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_direct_orm_writes(db_session: AsyncSession, enrollment: Enrollment):
+    """Grades added to the session directly are picked up at flush."""
+    db_session.add_all([
+        Grade(enrollment_id=enrollment.id, nota=4.25, periodo="2024-1", fecha=date(2024, 6, 1)),
+        Grade(enrollment_id=enrollment.id, nota=4.50, periodo="2024-1", fecha=date(2024, 6, 2)),
+    ])
+    await db_session.commit()
+
+    average = await GradeRepository(db_session).get_average_by_enrollment(enrollment.id)
+    assert average == pytest.approx(4.375)
+    assert await GradeStatsRepository(db_session).find_drift() == []
+
+
+@pytest.mark.asyncio
+async def test_find_drift_and_rebuild(db_session: AsyncSession, enrollment: Enrollment):
+    """Bulk writes outside the repository are reported and repaired."""
+    service = GradeService(db_session)
+    grade = await service.create_grade(_grade(enrollment.id, "3.00"))
+
+    # Bypass the repository and the flush hook
+    await db_session.execute(update(Grade).where(Grade.id == grade.id).values(nota=Decimal("2.00")))
+    await db_session.commit()
+
+    stats_repo = GradeStatsRepository(db_session)
+    assert await stats_repo.find_drift() == [enrollment.id]
+
+    assert await stats_repo.rebuild() == 1
+    await db_session.commit()
+    assert await stats_repo.find_drift() == []
+    assert await GradeRepository(db_session).get_average_by_enrollment(enrollment.id) == pytest.approx(2.0)
+
+
+@pytest.mark.asyncio
+async def test_average_without_grades_is_none(db_session: AsyncSession, enrollment: Enrollment):
+    """Enrollments without grades have no statistics row."""
+    assert await GradeRepository(db_session).get_average_by_enrollment(enrollment.id) is None
@@ -0,0 +1,60 @@
+"""Tests for the index advisor and the indexes it checks."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.utils.index_advisor import find_sequential_scans, run_advisor, seed_database
+
+
+def test_find_sequential_scans_sqlite():
+    """Test that SQLite full scans are flagged and index searches are not."""
+    plan = [
+        "SCAN grades",
+        "SEARCH enrollments USING INDEX ix_enrollments_subject_id (subject_id=?)",
+        "SCAN users USING COVERING INDEX ix_users_role",
+        "USE TEMP B-TREE FOR ORDER BY",
+    ]
+    
+    assert find_sequential_scans(plan) == ["grades"]
+
+
+def test_find_sequential_scans_postgres():
+    """Test that PostgreSQL sequential scans are flagged."""
+    plan = [
+        "Hash Join  (cost=1.09..2.21 rows=1 width=60)",
+        "  ->  Seq Scan on grades  (cost=0.00..1.06 rows=6 width=60)",
+        "  ->  Index Scan using ix_enrollments_subject_id on enrollments  (cost=0.15..8.17 rows=1 width=4)",
+    ]
+    
+    assert find_sequential_scans(plan) == ["grades"]
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_use_indexes(db_session: AsyncSession):
+    """Test that no repository hot query falls back to a sequential scan."""
+    await seed_database(db_session, profesores=2, estudiantes=20)
+    
+    reports = await run_advisor(db_session)
+    
+    assert reports
+    flagged = {report["query"]: report["sequential_scans"] for report in reports if report["sequential_scans"]}
+    assert flagged == {}
+
+
+@pytest.mark.asyncio
+async def test_advisor_flags_missing_index(db_session: AsyncSession):
+    """Test that dropping a foreign key index is reported."""
+    await seed_database(db_session, profesores=2, estudiantes=20)
+    await db_session.execute(text("DROP INDEX ix_subjects_profesor_id"))
+    
+    reports = await run_advisor(db_session)
+    
+    flagged = {report["query"] for report in reports if report["sequential_scans"]}
+    assert "SubjectRepository.get_by_profesor" in flagged
+
+
+@pytest.mark.asyncio
+async def test_advisor_requires_data(db_session: AsyncSession):
+    """Test that an empty database is rejected."""
+    with pytest.raises(ValueError):
+        await run_advisor(db_session)
@@ -0,0 +1,141 @@
+"""Tests for in-process metrics and the /metrics endpoint."""
+
+import pytest
+from datetime import date
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import Settings, settings
+from app.core.metrics import (
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    http_request_duration,
+    password_hash_duration,
+    registry,
+    report_bytes,
+    report_generation_duration,
+)
+from app.core.security import create_access_token, get_password_hash_async
+from app.factories import ReportFactory
+from app.models.user import User, UserRole
+
+
+REPORT_DATA = {
+    "estudiante": {"nombre": "Juan", "apellido": "Pérez", "codigo_institucional": "EST-2024-0001"},
+    "subjects": [{"subject": {"nombre": "Matemáticas"}, "average": 4.5}],
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test with empty counters and histograms."""
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def test_histogram_exposition():
+    """Test histograms render cumulative buckets, sum and count."""
+    metrics = MetricsRegistry()
+    histogram = metrics.register(Histogram("job_seconds", "Job time", ("kind",), buckets=(0.1, 1.0)))
+    histogram.observe(0.05, "a")
+    histogram.observe(0.1, "a")
+    histogram.observe(3.0, "a")
+
+    lines = metrics.render().splitlines()
+    assert "# TYPE job_seconds histogram" in lines
+    assert 'job_seconds_bucket{kind="a",le="0.1"} 2' in lines
+    assert 'job_seconds_bucket{kind="a",le="1"} 2' in lines
+    assert 'job_seconds_bucket{kind="a",le="+Inf"} 3' in lines
+    assert 'job_seconds_sum{kind="a"} 3.15' in lines
+    assert 'job_seconds_count{kind="a"} 3' in lines
+
+
+def test_counter_escapes_label_values():
+    """Test label values with quotes and backslashes stay parseable."""
+    metrics = MetricsRegistry()
+    counter = metrics.register(Counter("events_total", "Events", ("name",)))
+    counter.inc('a"b\\c', amount=2)
+    assert 'events_total{name="a\\"b\\\\c"} 2' in metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_request_latency_by_route_and_role(client: AsyncClient, db_session: AsyncSession):
+    """Test requests are timed by route template, method, role and status class."""
+    admin = User(
+        email="metrics.admin@test.com",
+        password_hash="hash",
+        role=UserRole.ADMIN,
+        nombre="Metrics",
+        apellido="Admin",
+        codigo_institucional="ADM-METRICS",
+        fecha_nacimiento=date(1980, 1, 1),
+    )
+    db_session.add(admin)
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': admin.email})}"}
+
+    await client.get(f"/api/v1/users/{admin.id}", headers=headers)
+    await client.get("/api/v1/users/999999", headers=headers)
+    await client.get("/health")
+    await client.get("/does-not-exist")
+
+    assert http_request_duration.count("GET", "/api/v1/users/{user_id}", "Admin", "2xx") == 1
+    assert http_request_duration.count("GET", "/api/v1/users/{user_id}", "Admin", "4xx") == 1
+    assert http_request_duration.count("GET", "/health", "anonymous", "2xx") == 1
+    assert http_request_duration.count("GET", "unmatched", "anonymous", "4xx") == 1
+
+
+@pytest.mark.asyncio
+async def test_report_metrics_by_format():
+    """Test report rendering time and bytes are recorded per format."""
+    report = await ReportFactory.create_generator("json").render(REPORT_DATA)
+    assert report_generation_duration.count("json", "full") == 1
+    assert report_bytes.value("json") == len(report["content"])
+
+    streamed = await ReportFactory.create_generator("html").render(REPORT_DATA, stream=True)
+    assert report_generation_duration.count("html", "stream") == 0
+    size = sum(len(chunk.encode("utf-8")) for chunk in streamed["content"])
+    assert report_generation_duration.count("html", "stream") == 1
+    assert report_bytes.value("html") == size
+
+
+@pytest.mark.asyncio
+async def test_password_hash_time_is_recorded():
+    """Test bcrypt work done in the hashing pool is timed."""
+    await get_password_hash_async("secret123")
+    assert password_hash_duration.count("get_password_hash") == 1
+    assert password_hash_duration.total("get_password_hash") > 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient, monkeypatch):
+    """Test /metrics exposes request, pool and cache metrics in text format."""
+    monkeypatch.setattr(settings, "metrics_enabled", True)
+    await client.get("/health")
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",role="anonymous",status="2xx"} 1' in body
+    assert 'cache_hit_ratio{cache="report"}' in body
+    assert 'password_hash_pool{figure="pending"}' in body
+    assert "# TYPE db_pool_checkout_wait_seconds histogram" in body
+
+    monkeypatch.setattr(settings, "metrics_enabled", False)
+    assert (await client.get("/metrics")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_is_off_by_default_and_token_protected(client: AsyncClient, monkeypatch):
+    """Test /metrics is disabled by default and requires the configured bearer token."""
+    assert Settings.model_fields["metrics_enabled"].default is False
+
+    monkeypatch.setattr(settings, "metrics_enabled", True)
+    monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+    assert (await client.get("/metrics")).status_code == 401
+    wrong = {"Authorization": "Bearer other"}
+    assert (await client.get("/metrics", headers=wrong)).status_code == 401
+    right = {"Authorization": "Bearer scrape-secret"}
+    assert (await client.get("/metrics", headers=right)).status_code == 200
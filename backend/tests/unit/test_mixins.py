@@ -134,6 +134,35 @@ class TestPaginationMixin:
         assert repo.DEFAULT_PAGE_SIZE == 100
         assert repo.MAX_PAGE_SIZE == 1000
 
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes back to the sort key values."""
+        from datetime import datetime
+        from app.models.enrollment import Enrollment
+        
+        created_at = datetime(2024, 3, 1, 12, 30)
+        cursor = PaginationMixin.encode_cursor([created_at, 42])
+        
+        values = PaginationMixin.decode_cursor(cursor, [Enrollment.created_at, Enrollment.id])
+        assert values == [created_at, 42]
+
+    def test_decode_cursor_rejects_garbage(self):
+        """Test that malformed cursors are rejected."""
+        from app.models.enrollment import Enrollment
+        
+        with pytest.raises(ValueError) as exc_info:
+            PaginationMixin.decode_cursor("not-a-cursor!", [Enrollment.id])
+        
+        assert "invalid cursor" in str(exc_info.value).lower()
+
+    def test_decode_cursor_rejects_wrong_key_length(self):
+        """Test that a cursor built for other columns is rejected."""
+        from app.models.enrollment import Enrollment
+        
+        cursor = PaginationMixin.encode_cursor([1, 2])
+        
+        with pytest.raises(ValueError):
+            PaginationMixin.decode_cursor(cursor, [Enrollment.id])
+
 
 class TestTimestampMixin:
     """Tests for TimestampMixin."""
@@ -0,0 +1,117 @@
+"""Tests for the cached profesor-to-subject permission checks."""
+
+import pytest
+from datetime import date
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.permission_cache import SubjectAssignmentCache, subject_assignment_cache
+from app.models.subject import Subject
+from app.models.user import User, UserRole
+from app.schemas.subject import SubjectUpdate
+from app.services.permission_service import PermissionService
+from app.services.subject_service import SubjectService
+
+
+async def _create_profesor(db_session: AsyncSession, codigo: str) -> User:
+    profesor = User(
+        email=f"{codigo.lower()}@example.com",
+        password_hash="hash",
+        role=UserRole.PROFESOR,
+        nombre="Profe",
+        apellido=codigo,
+        codigo_institucional=codigo,
+        fecha_nacimiento=date(1980, 1, 1),
+    )
+    db_session.add(profesor)
+    await db_session.flush()
+    return profesor
+
+
+async def _create_subject(db_session: AsyncSession, codigo: str, profesor: User) -> Subject:
+    subject = Subject(nombre=codigo, codigo_institucional=codigo, numero_creditos=3, profesor_id=profesor.id)
+    db_session.add(subject)
+    await db_session.commit()
+    return subject
+
+
+@pytest.mark.asyncio
+async def test_cached_assignments_skip_queries(db_session: AsyncSession, count_queries):
+    """Test repeated checks for a profesor are answered from memory."""
+    profesor = await _create_profesor(db_session, "PROF-1")
+    subject = await _create_subject(db_session, "MAT-1", profesor)
+    permissions = PermissionService(db_session)
+
+    assert await permissions.profesor_teaches(profesor.id, subject.id)
+    count_queries.clear()
+
+    assert await permissions.profesor_teaches(profesor.id, subject.id)
+    assert await permissions.profesor_teaches(profesor.id, subject.id)
+    assert count_queries == []
+    assert subject_assignment_cache.hits == 2
+
+
+@pytest.mark.asyncio
+async def test_reassignment_invalidates_both_profesores(db_session: AsyncSession):
+    """Test reassigning a subject updates the old and new profesor's permissions."""
+    ana = await _create_profesor(db_session, "PROF-1")
+    beto = await _create_profesor(db_session, "PROF-2")
+    subject = await _create_subject(db_session, "MAT-1", ana)
+    permissions = PermissionService(db_session)
+    assert await permissions.profesor_teaches(ana.id, subject.id)
+    assert not await permissions.profesor_teaches(beto.id, subject.id)
+
+    await SubjectService(db_session).update_subject(subject.id, SubjectUpdate(profesor_id=beto.id))
+
+    assert subject_assignment_cache.get(ana.id) is None
+    assert not await permissions.profesor_teaches(ana.id, subject.id)
+    assert await permissions.profesor_teaches(beto.id, subject.id)
+
+
+@pytest.mark.asyncio
+async def test_stale_negative_is_confirmed_in_database(db_session: AsyncSession):
+    """Test a subject assigned behind the cache's back is still allowed."""
+    ana = await _create_profesor(db_session, "PROF-1")
+    beto = await _create_profesor(db_session, "PROF-2")
+    subject = await _create_subject(db_session, "MAT-1", beto)
+    permissions = PermissionService(db_session)
+    assert not await permissions.profesor_teaches(ana.id, subject.id)
+
+    # Simulate a reassignment made by another worker process
+    await db_session.execute(update(Subject).where(Subject.id == subject.id).values(profesor_id=ana.id))
+    await db_session.commit()
+
+    assert await permissions.profesor_teaches(ana.id, subject.id)
+    assert subject_assignment_cache.get(ana.id) is None
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    """Test assignments loaded before an invalidation are discarded."""
+    cache = SubjectAssignmentCache(ttl_seconds=60)
+    generation = cache.generation
+    cache.invalidate_profesores(1)
+
+    cache.set(1, {10, 11}, generation)
+    assert cache.get(1) is None
+
+    cache.set(1, {10}, cache.generation)
+    assert cache.get(1) == frozenset({10})
+
+
+@pytest.mark.asyncio
+async def test_stale_positive_is_confirmed_for_writes(db_session: AsyncSession):
+    """Test a profesor whose subject was reassigned elsewhere loses write access at once."""
+    ana = await _create_profesor(db_session, "PROF-1")
+    beto = await _create_profesor(db_session, "PROF-2")
+    subject = await _create_subject(db_session, "MAT-1", ana)
+    permissions = PermissionService(db_session)
+    assert await permissions.profesor_teaches(ana.id, subject.id, for_write=True)
+
+    # Simulate a reassignment made by another worker process
+    await db_session.execute(update(Subject).where(Subject.id == subject.id).values(profesor_id=beto.id))
+    await db_session.commit()
+
+    # Reads may use the cached set until the TTL expires
+    assert await permissions.profesor_teaches(ana.id, subject.id)
+    assert not await permissions.profesor_teaches(ana.id, subject.id, for_write=True)
+    assert subject_assignment_cache.get(ana.id) is None
+    assert not await permissions.profesor_teaches(ana.id, subject.id)
@@ -0,0 +1,121 @@
+"""Tests for the authenticated principal cache."""
+
+import pytest
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.dependencies import get_current_user, get_current_principal
+from app.core.config import settings
+from app.core.principal_cache import principal_cache
+from app.core.security import create_access_token
+from app.models.user import User, UserRole
+from app.schemas.token import Principal
+from app.schemas.user import UserUpdate
+from app.services.user_service import UserService
+
+
+async def _create_user(db_session: AsyncSession) -> User:
+    user = User(
+        email="profesor@example.com",
+        password_hash="hash",
+        role=UserRole.PROFESOR,
+        nombre="Profe",
+        apellido="Test",
+        codigo_institucional="PROF-0001",
+        fecha_nacimiento=date(1980, 1, 1),
+    )
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+    return user
+
+
+def _token(user: User) -> str:
+    return create_access_token({"sub": user.email, "role": user.role.value, "uid": user.id})
+
+
+@pytest.mark.asyncio
+async def test_cached_principal_skips_user_query(db_session: AsyncSession, count_queries):
+    """Test that a repeated token resolves the user without querying."""
+    user = await _create_user(db_session)
+    token = _token(user)
+    
+    queries_before = len(count_queries)
+    hits_before = principal_cache.hits
+    first = await get_current_user(token, db_session)
+    second = await get_current_user(token, db_session)
+    
+    assert len(count_queries) == queries_before + 1
+    assert second.id == first.id
+    assert second.role == UserRole.PROFESOR
+    assert principal_cache.hits == hits_before + 1
+
+
+@pytest.mark.asyncio
+async def test_cached_principal_is_attached_to_session(db_session: AsyncSession):
+    """Test that a cached user can be used in a fresh session."""
+    user = await _create_user(db_session)
+    token = _token(user)
+    await get_current_user(token, db_session)
+    db_session.expunge_all()
+    
+    cached_user = await get_current_user(token, db_session)
+    
+    assert cached_user in db_session
+    assert cached_user.email == "profesor@example.com"
+
+
+@pytest.mark.asyncio
+async def test_update_user_invalidates_principal(db_session: AsyncSession, count_queries):
+    """Test that updating a user drops the cached principal."""
+    user = await _create_user(db_session)
+    token = _token(user)
+    await get_current_user(token, db_session)
+    
+    await UserService(db_session).update_user(user.id, UserUpdate(nombre="Renamed"))
+    queries_before = len(count_queries)
+    reloaded = await get_current_user(token, db_session)
+    
+    assert len(count_queries) == queries_before + 1
+    assert reloaded.nombre == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_delete_user_invalidates_principal(db_session: AsyncSession):
+    """Test that a deleted user can no longer authenticate from the cache."""
+    user = await _create_user(db_session)
+    token = _token(user)
+    await get_current_user(token, db_session)
+    
+    await UserService(db_session).delete_user(user.id)
+    
+    with pytest.raises(Exception) as exc_info:
+        await get_current_user(token, db_session)
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_principal_from_trusted_claims(db_session: AsyncSession, count_queries, monkeypatch):
+    """Test that trusted token claims build a principal without a query."""
+    monkeypatch.setattr(settings, "trust_token_claims", True)
+    user = await _create_user(db_session)
+    queries_before = len(count_queries)
+    
+    principal = await get_current_principal(_token(user), db_session)
+    
+    assert isinstance(principal, Principal)
+    assert principal.id == user.id
+    assert principal.role == UserRole.PROFESOR
+    assert len(count_queries) == queries_before
+
+
+@pytest.mark.asyncio
+async def test_principal_loads_user_when_claims_not_trusted(db_session: AsyncSession):
+    """Test that the user is loaded and reduced to a principal when token claims are not trusted."""
+    user = await _create_user(db_session)
+    
+    principal = await get_current_principal(_token(user), db_session)
+    
+    assert isinstance(principal, Principal)
+    assert principal.id == user.id
+    assert principal.email == user.email
+    assert principal.role == user.role
@@ -0,0 +1,209 @@
+"""Tests for read-replica routing and read-your-writes stickiness."""
+
+import pytest
+from datetime import date
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.requests import Request
+from app.api.v1.dependencies import _load_user
+from app.core import database
+from app.core.cache import cache
+from app.core.database import READ_ONLY, WRITER, Base, create_session_factory, get_db
+from app.core.permission_cache import subject_assignment_cache
+from app.core.principal_cache import principal_cache
+from app.core.read_replica import RecentWriters, reads_from_replica, recent_writers, request_writer, wants_replica
+from app.core.report_cache import report_cache
+from app.core.security import create_access_token
+from app.models.subject import Subject
+from app.models.user import User, UserRole
+from app.services.permission_service import PermissionService
+
+
+def make_user(email: str, nombre: str) -> User:
+    """Build a user whose name tells which database it was read from."""
+    return User(
+        email=email,
+        password_hash="hash",
+        role=UserRole.ESTUDIANTE,
+        nombre=nombre,
+        apellido="Replica",
+        codigo_institucional=f"EST-{email.split('@')[0]}",
+        fecha_nacimiento=date(2000, 1, 1),
+    )
+
+
+def make_request(method: str, token: str = None) -> Request:
+    """Build a bare request with an optional bearer token."""
+    headers = [] if token is None else [(b"authorization", f"Bearer {token}".encode())]
+    return Request({"type": "http", "method": method, "path": "/", "headers": headers})
+
+
+@pytest.fixture
+async def engines(tmp_path):
+    """Primary and replica SQLite databases holding differently named rows."""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for engine, nombre in ((primary, "Primary"), (replica, "Replica")):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add(make_user("seed@test.com", nombre))
+            await session.commit()
+    yield primary, replica
+    await primary.dispose()
+    await replica.dispose()
+
+
+async def read_seed_name(session: AsyncSession) -> str:
+    """Read the seeded user's name."""
+    result = await session.execute(select(User.nombre).where(User.email == "seed@test.com"))
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_only_read_only_sessions_use_the_replica(engines):
+    """Test SELECTs of read-only sessions go to the replica and others to the primary."""
+    factory = create_session_factory(*engines)
+    async with factory(info={READ_ONLY: True}) as session:
+        assert await read_seed_name(session) == "Replica"
+        locked = await session.execute(select(User.nombre).with_for_update())
+        assert locked.scalar_one() == "Primary"
+    async with factory() as session:
+        assert await read_seed_name(session) == "Primary"
+
+    async with create_session_factory(engines[0])(info={READ_ONLY: True}) as session:
+        assert await read_seed_name(session) == "Primary"
+
+
+@pytest.mark.asyncio
+async def test_writes_pin_the_session_and_the_writer(engines):
+    """Test a write moves the session to the primary and marks its writer after commit."""
+    factory = create_session_factory(*engines)
+    async with factory(info={READ_ONLY: True, WRITER: "ana@test.com"}) as session:
+        session.add(make_user("ana@test.com", "Ana"))
+        await session.flush()
+        assert not recent_writers.is_recent("ana@test.com")
+        assert await read_seed_name(session) == "Primary"
+        await session.commit()
+
+    assert recent_writers.is_recent("ana@test.com")
+
+    async with factory(info={READ_ONLY: False, WRITER: "luis@test.com"}) as session:
+        session.add(make_user("luis@test.com", "Luis"))
+        await session.flush()
+        await session.rollback()
+    assert not recent_writers.is_recent("luis@test.com")
+
+
+def test_recent_writers_window(monkeypatch):
+    """Test writers are forgotten when the window passes."""
+    now = [100.0]
+    monkeypatch.setattr("app.core.read_replica.time.monotonic", lambda: now[0])
+    writers = RecentWriters(window_seconds=5, max_entries=2)
+    writers.mark("a")
+    writers.mark("b")
+    assert writers.is_recent("a")
+
+    now[0] = 106.0
+    writers.mark("c")
+    assert not writers.is_recent("a")
+    assert writers.is_recent("c")
+    assert len(writers) == 1
+
+    RecentWriters(window_seconds=0).mark("a")
+
+
+def test_replica_decision_per_request():
+    """Test only GET/HEAD requests of callers without recent writes use the replica."""
+    token = create_access_token({"sub": "ana@test.com"})
+    assert request_writer(make_request("GET", token)) == "ana@test.com"
+    assert request_writer(make_request("GET", "not-a-jwt")) is None
+    assert request_writer(make_request("GET")) is None
+
+    assert wants_replica(make_request("GET"), None)
+    assert not wants_replica(make_request("POST"), None)
+    recent_writers.mark("ana@test.com")
+    assert not wants_replica(make_request("GET", token), "ana@test.com")
+    assert wants_replica(make_request("HEAD"), "luis@test.com")
+
+
+@pytest.mark.asyncio
+async def test_get_db_reads_your_writes(engines, monkeypatch):
+    """Test a user's GET after their POST reads from the primary, other users from the replica."""
+    primary, replica = engines
+    monkeypatch.setattr(database, "replica_engine", replica)
+    monkeypatch.setattr(database, "AsyncSessionLocal", create_session_factory(primary, replica))
+
+    test_app = FastAPI()
+
+    @test_app.get("/seed")
+    async def read_seed(db: AsyncSession = Depends(get_db)):
+        return {"nombre": await read_seed_name(db)}
+
+    @test_app.post("/users")
+    async def create_user(db: AsyncSession = Depends(get_db)):
+        db.add(make_user("nuevo@test.com", "Nuevo"))
+        await db.commit()
+        return {"ok": True}
+
+    ana = {"Authorization": f"Bearer {create_access_token({'sub': 'ana@test.com'})}"}
+    luis = {"Authorization": f"Bearer {create_access_token({'sub': 'luis@test.com'})}"}
+    async with AsyncClient(app=test_app, base_url="http://test") as test_client:
+        assert (await test_client.get("/seed", headers=ana)).json() == {"nombre": "Replica"}
+        await test_client.post("/users", headers=ana)
+        assert (await test_client.get("/seed", headers=ana)).json() == {"nombre": "Primary"}
+        assert (await test_client.get("/seed", headers=luis)).json() == {"nombre": "Replica"}
+
+
+class SeedReader:
+    """Service-like reader whose cached result tells which database it came from."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @cache.cached(namespace="test.seed_name")
+    async def seed_name(self) -> str:
+        return await read_seed_name(self.db)
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_do_not_fill_shared_caches(engines):
+    """Test rows read from a lagging replica are served once but never cached."""
+    primary, replica = engines
+    factory = create_session_factory(primary, replica)
+    # The subject was reassigned away from the seed user, but not yet on the replica
+    for engine, profesor_id in ((primary, 2), (replica, 1)):
+        async with AsyncSession(engine) as session:
+            session.add(make_user("otro@test.com", "Otro"))
+            await session.flush()
+            session.add(Subject(nombre="MAT", codigo_institucional="MAT-1", numero_creditos=3, profesor_id=profesor_id))
+            await session.commit()
+
+    async with factory(info={READ_ONLY: True}) as session:
+        assert reads_from_replica(session)
+        assert await SeedReader(session).seed_name() == "Replica"
+        assert (await _load_user(session, "seed@test.com")).nombre == "Replica"
+        assert await PermissionService(session).profesor_teaches(1, 1)
+        report = await report_cache.get_or_generate(
+            "student", "estudiante", 1, "json",
+            lambda: read_seed_name(session),
+            store=not reads_from_replica(session),
+        )
+        assert report == "Replica"
+
+    assert principal_cache.get("seed@test.com") is None
+    assert subject_assignment_cache.get(1) is None
+    assert len(report_cache) == 0
+
+    async with factory() as session:
+        assert not reads_from_replica(session)
+        assert await SeedReader(session).seed_name() == "Primary"
+        assert (await _load_user(session, "seed@test.com")).nombre == "Primary"
+        assert not await PermissionService(session).profesor_teaches(1, 1)
+
+    assert principal_cache.get("seed@test.com")["nombre"] == "Primary"
+    assert subject_assignment_cache.get(1) == frozenset()
+    async with factory(info={READ_ONLY: True}) as session:
+        assert await SeedReader(session).seed_name() == "Primary"
@@ -0,0 +1,272 @@
+"""Tests for the in-process report cache."""
+
+import asyncio
+import pytest
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.report_cache import MIN_TRACKED_VERSIONS, ReportCache, report_cache
+from app.models.enrollment import Enrollment
+from app.models.subject import Subject
+from app.models.user import User, UserRole
+from app.schemas.subject import SubjectUpdate
+from app.schemas.user import UserUpdate
+from app.services.subject_service import SubjectService
+from app.services.user_service import UserService
+
+
+def _report(content: bytes = b"report") -> dict:
+    return {"content": content, "filename": "report.pdf", "content_type": "application/pdf"}
+
+
+def _generator(report: dict, calls: list):
+    async def generate():
+        calls.append(1)
+        return report
+    return generate
+
+
+@pytest.mark.asyncio
+async def test_get_or_generate_caches_report():
+    """Test that a second request for the same key is served from the cache."""
+    cache = ReportCache(max_bytes=1024, ttl_seconds=60)
+    calls = []
+
+    first = await cache.get_or_generate("student", "estudiante", 1, "pdf", _generator(_report(), calls))
+    second = await cache.get_or_generate("student", "estudiante", 1, "PDF", _generator(_report(), calls))
+
+    assert first is second
+    assert len(calls) == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_formats_are_cached_separately():
+    """Test that each format has its own entry."""
+    cache = ReportCache(max_bytes=1024, ttl_seconds=60)
+    calls = []
+
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", _generator(_report(), calls))
+    await cache.get_or_generate("student", "estudiante", 1, "html", _generator(_report(), calls))
+
+    assert len(calls) == 2
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_entity_entries():
+    """Test that invalidating an entity forces regeneration."""
+    cache = ReportCache(max_bytes=1024, ttl_seconds=60)
+    calls = []
+
+    await cache.get_or_generate("subject", "subject", 7, "pdf", _generator(_report(), calls))
+    await cache.get_or_generate("student", "estudiante", 3, "pdf", _generator(_report(), calls))
+    cache.invalidate_enrollment(estudiante_id=3, subject_id=7)
+
+    assert len(cache) == 0
+    assert cache.size == 0
+
+    await cache.get_or_generate("subject", "subject", 7, "pdf", _generator(_report(), calls))
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_respects_byte_budget():
+    """Test that least recently used reports are evicted over the byte budget."""
+    cache = ReportCache(max_bytes=10, ttl_seconds=60)
+    calls = []
+
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", _generator(_report(b"aaaa"), calls))
+    await cache.get_or_generate("student", "estudiante", 2, "pdf", _generator(_report(b"bbbb"), calls))
+    # Touch entry 1 so entry 2 becomes the least recently used
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", _generator(_report(b"aaaa"), calls))
+    await cache.get_or_generate("student", "estudiante", 3, "pdf", _generator(_report(b"cccc"), calls))
+
+    assert cache.size <= 10
+    assert len(calls) == 3
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", _generator(_report(b"aaaa"), calls))
+    assert len(calls) == 3
+    await cache.get_or_generate("student", "estudiante", 2, "pdf", _generator(_report(b"bbbb"), calls))
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_reports_larger_than_budget_are_not_stored():
+    """Test that a single report larger than the budget is not cached."""
+    cache = ReportCache(max_bytes=4, ttl_seconds=60)
+    calls = []
+
+    await cache.get_or_generate("student", "estudiante", 1, "html", _generator(_report("ñññññ"), calls))
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_regenerated():
+    """Test that entries older than the TTL are regenerated."""
+    cache = ReportCache(max_bytes=1024, ttl_seconds=0)
+    calls = []
+
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", _generator(_report(), calls))
+    await asyncio.sleep(0.01)
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", _generator(_report(), calls))
+
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_generate_once():
+    """Test that concurrent requests for a missing report share one generation."""
+    cache = ReportCache(max_bytes=1024, ttl_seconds=60)
+    calls = []
+    release = asyncio.Event()
+
+    async def slow_generate():
+        calls.append(1)
+        await release.wait()
+        return _report()
+
+    tasks = [
+        asyncio.create_task(cache.get_or_generate("general", "estudiante", 1, "pdf", slow_generate))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_waiters_receive_generation_error():
+    """Test that a failed generation is raised to every waiting request and not cached."""
+    cache = ReportCache(max_bytes=1024, ttl_seconds=60)
+    release = asyncio.Event()
+
+    async def failing_generate():
+        await release.wait()
+        raise ValueError("Estudiante not found")
+
+    tasks = [
+        asyncio.create_task(cache.get_or_generate("student", "estudiante", 1, "pdf", failing_generate))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_report_invalidated_during_generation_is_not_stored():
+    """Test that a report built from pre-invalidation data is not cached."""
+    cache = ReportCache(max_bytes=1024, ttl_seconds=60)
+
+    async def generate_then_invalidate():
+        cache.invalidate("estudiante", 1)
+        return _report()
+
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", generate_then_invalidate)
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_versions_of_uncached_entities_are_pruned():
+    """Test that data versions do not grow with every entity ever invalidated."""
+    cache = ReportCache(max_bytes=1024, ttl_seconds=60)
+    calls = []
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", _generator(_report(), calls))
+    cache.invalidate("estudiante", 1)
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", _generator(_report(), calls))
+
+    for subject_id in range(2 * MIN_TRACKED_VERSIONS):
+        cache.invalidate("subject", subject_id)
+
+    assert len(cache._versions) <= MIN_TRACKED_VERSIONS
+    # The cached entity keeps its version, so its entry is still served
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", _generator(_report(), calls))
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_pruning_keeps_versions_of_inflight_generations():
+    """Test that a report invalidated mid-generation is still discarded after pruning."""
+    cache = ReportCache(max_bytes=1024, ttl_seconds=60)
+
+    async def generate_then_invalidate():
+        cache.invalidate("estudiante", 1)
+        cache.invalidate_many("subject", range(2 * MIN_TRACKED_VERSIONS))
+        return _report()
+
+    await cache.get_or_generate("student", "estudiante", 1, "pdf", generate_then_invalidate)
+
+    assert len(cache) == 0
+
+
+async def _create_enrollment(db_session: AsyncSession) -> Enrollment:
+    profesor = User(
+        email="profe@example.com", password_hash="hash", role=UserRole.PROFESOR,
+        nombre="Profe", apellido="Uno", codigo_institucional="PROF-1",
+        fecha_nacimiento=date(1980, 1, 1),
+    )
+    estudiante = User(
+        email="estu@example.com", password_hash="hash", role=UserRole.ESTUDIANTE,
+        nombre="Estu", apellido="Uno", codigo_institucional="EST-1",
+        fecha_nacimiento=date(2000, 1, 1),
+    )
+    db_session.add_all([profesor, estudiante])
+    await db_session.flush()
+    subject = Subject(nombre="Matematicas", codigo_institucional="MAT-1", numero_creditos=3, profesor_id=profesor.id)
+    db_session.add(subject)
+    await db_session.flush()
+    enrollment = Enrollment(estudiante_id=estudiante.id, subject_id=subject.id)
+    db_session.add(enrollment)
+    await db_session.commit()
+    return enrollment
+
+
+async def _cache_reports(enrollment: Enrollment) -> None:
+    calls: list = []
+    await report_cache.get_or_generate(
+        "student", "estudiante", enrollment.estudiante_id, "pdf", _generator(_report(), calls)
+    )
+    await report_cache.get_or_generate(
+        "subject", "subject", enrollment.subject_id, "pdf", _generator(_report(), calls)
+    )
+
+
+@pytest.mark.asyncio
+async def test_renaming_subject_drops_its_reports(db_session: AsyncSession):
+    """Test that a subject rename drops the subject and enrolled students' reports."""
+    enrollment = await _create_enrollment(db_session)
+    await _cache_reports(enrollment)
+
+    await SubjectService(db_session).update_subject(enrollment.subject_id, SubjectUpdate(nombre="Algebra"))
+
+    assert len(report_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_renaming_student_drops_its_reports(db_session: AsyncSession):
+    """Test that a student rename drops their report and their subjects' reports."""
+    enrollment = await _create_enrollment(db_session)
+    await _cache_reports(enrollment)
+
+    await UserService(db_session).update_user(enrollment.estudiante_id, UserUpdate(nombre="Otro"))
+
+    assert len(report_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_deleting_subject_drops_its_reports(db_session: AsyncSession):
+    """Test that deleting a subject drops the reports that listed it."""
+    enrollment = await _create_enrollment(db_session)
+    await _cache_reports(enrollment)
+
+    await SubjectService(db_session).delete_subject(enrollment.subject_id)
+
+    assert len(report_cache) == 0
@@ -89,6 +89,44 @@ def test_html_generator_generate():
     assert "<html" in result["content"].lower() or "<!doctype" in result["content"].lower()
 
 
+def test_html_generator_generate_stream_matches_render():
+    """Test HTMLReportGenerator streaming yields the same document as generate."""
+    generator = HTMLReportGenerator()
+    
+    report_data = {
+        "estudiante": {
+            "nombre": "Juan",
+            "apellido": "Pérez",
+            "codigo_institucional": "EST-2024-0001",
+        },
+        "subjects": [
+            {
+                "subject": {"nombre": "Matemáticas"},
+                "average": 4.5,
+            }
+        ],
+    }
+    
+    streamed = generator.generate_stream(report_data)
+    rendered = generator.generate(report_data)
+    
+    assert streamed["content_type"] == "text/html"
+    assert streamed["filename"].endswith(".html")
+    assert not isinstance(streamed["content"], str)
+    # Timestamps may differ by a second; compare everything before the footer
+    streamed_html = "".join(streamed["content"])
+    assert streamed_html.split("Generado el")[0] == rendered["content"].split("Generado el")[0]
+
+
+def test_non_streaming_generator_generate_stream_returns_full_content():
+    """Test generate_stream falls back to generate for non-streaming formats."""
+    generator = JSONReportGenerator()
+    
+    assert generator.supports_streaming is False
+    result = generator.generate_stream({"estudiante": {"nombre": "Juan"}})
+    assert isinstance(result["content"], bytes)
+
+
 def test_json_generator_generate():
     """Test JSONReportGenerator generates JSON report."""
     generator = JSONReportGenerator()
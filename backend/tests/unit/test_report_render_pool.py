@@ -0,0 +1,156 @@
+"""Tests for the report render pool."""
+
+import asyncio
+import threading
+import pytest
+from app.core.exceptions import ServiceUnavailableError
+from app.factories import ReportFactory, ReportRenderPool
+
+
+REPORT_DATA = {
+    "estudiante": {
+        "id": 1,
+        "nombre": "Ana",
+        "apellido": "Gómez",
+        "codigo_institucional": "EST-2024-0001",
+        "programa_academico": "Ingeniería",
+    },
+    "subjects": [
+        {
+            "subject": {"id": 1, "nombre": "Cálculo", "codigo_institucional": "CAL-001", "numero_creditos": 4},
+            "grades": [{"nota": 4.5, "periodo": "2024-1", "fecha": "2024-03-01"}],
+            "average": 4.5,
+        }
+    ],
+    "general_average": 4.5,
+}
+
+
+@pytest.fixture
+def render_pool():
+    """Install a thread-backed render pool and restore the default afterwards."""
+    pool = ReportRenderPool(max_workers=0, timeout_seconds=10, max_pending=2)
+    ReportFactory.set_render_pool(pool)
+    yield pool
+    ReportFactory.set_render_pool(None)
+    pool.shutdown()
+
+
+def test_render_pool_rejects_invalid_configuration():
+    """Test that invalid worker or queue sizes are rejected."""
+    with pytest.raises(ValueError):
+        ReportRenderPool(max_workers=-1)
+    with pytest.raises(ValueError):
+        ReportRenderPool(max_pending=0)
+
+
+def test_pdf_generator_is_offloaded():
+    """Test that only the PDF generator renders in the pool by default."""
+    assert ReportFactory.create_generator("pdf").offload is True
+    assert ReportFactory.create_generator("json").offload is False
+    assert ReportFactory.create_generator("pdf").format_name == "pdf"
+
+
+@pytest.mark.asyncio
+async def test_generate_async_renders_pdf_in_pool(render_pool):
+    """Test that generate_async renders PDF through the render pool."""
+    generator = ReportFactory.create_generator("pdf")
+
+    report = await generator.generate_async(REPORT_DATA)
+
+    assert report["content_type"] == "application/pdf"
+    assert report["content"].startswith(b"%PDF")
+    assert render_pool.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_generate_async_runs_cheap_generators_inline(render_pool):
+    """Test that non-offloaded generators do not use the pool."""
+    generator = ReportFactory.create_generator("json")
+
+    report = await generator.generate_async(REPORT_DATA)
+
+    assert report["content_type"] == "application/json"
+
+
+@pytest.fixture
+def blocked_render(monkeypatch):
+    """Replace the render with one that blocks until the event is set."""
+    release = threading.Event()
+
+    def render(format_name, data):
+        release.wait(timeout=10)
+        return {}
+
+    monkeypatch.setattr("app.factories.render_pool._render_in_worker", render)
+    yield release
+    release.set()
+
+
+async def wait_until_idle(pool: ReportRenderPool) -> None:
+    """Wait for background jobs to release their queue slots."""
+    for _ in range(200):
+        if pool.pending == 0:
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_render_pool_rejects_jobs_when_queue_is_full(render_pool, blocked_render):
+    """Test that the pool raises ServiceUnavailableError beyond max_pending."""
+    first = asyncio.create_task(render_pool.render("pdf", REPORT_DATA))
+    second = asyncio.create_task(render_pool.render("pdf", REPORT_DATA))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceUnavailableError, match="busy"):
+        await render_pool.render("pdf", REPORT_DATA)
+
+    blocked_render.set()
+    await asyncio.gather(first, second)
+    await wait_until_idle(render_pool)
+    assert render_pool.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_render_pool_times_out_slow_jobs(blocked_render):
+    """Test that a job exceeding the timeout raises ServiceUnavailableError."""
+    pool = ReportRenderPool(max_workers=0, timeout_seconds=0.2, max_pending=2)
+
+    with pytest.raises(ServiceUnavailableError, match="timed out"):
+        await pool.render("pdf", REPORT_DATA)
+
+    # The abandoned job still occupies the worker, so it keeps its slot
+    assert pool.pending == 1
+    blocked_render.set()
+    await wait_until_idle(pool)
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_jobs_count_against_the_queue(blocked_render):
+    """Test that slow jobs abandoned by their requests still bound the queue."""
+    pool = ReportRenderPool(max_workers=0, timeout_seconds=0.05, max_pending=2)
+
+    for _ in range(2):
+        with pytest.raises(ServiceUnavailableError, match="timed out"):
+            await pool.render("pdf", REPORT_DATA)
+    with pytest.raises(ServiceUnavailableError, match="busy"):
+        await pool.render("pdf", REPORT_DATA)
+
+    blocked_render.set()
+    await wait_until_idle(pool)
+    assert await pool.render("pdf", REPORT_DATA) == {}
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_render_pool_uses_worker_processes():
+    """Test that PDF rendering works in a separate worker process."""
+    pool = ReportRenderPool(max_workers=1, timeout_seconds=60, max_pending=2)
+    try:
+        report = await pool.render("pdf", REPORT_DATA)
+    finally:
+        pool.shutdown()
+
+    assert report["content"].startswith(b"%PDF")
@@ -3,6 +3,7 @@
 import json
 import pytest
 from fastapi import Response
+from fastapi.responses import StreamingResponse
 from app.api.v1.serializers.report_response_handler import ReportResponseHandler
 from app.core.exceptions import NotFoundError, ForbiddenError, ValidationError
 
@@ -17,8 +18,10 @@ def test_handle_response_json_format_bytes():
     
     result = ReportResponseHandler.handle_response(report, "json")
     
-    assert isinstance(result, dict)
-    assert result["test"] == "data"
+    assert isinstance(result, Response)
+    assert result.body is report["content"]
+    assert result.media_type == "application/json"
+    assert "content-disposition" not in result.headers
 
 
 def test_handle_response_json_format_string():
@@ -31,8 +34,8 @@ def test_handle_response_json_format_string():
     
     result = ReportResponseHandler.handle_response(report, "json")
     
-    assert isinstance(result, dict)
-    assert result["test"] == "data"
+    assert isinstance(result, Response)
+    assert json.loads(result.body) == {"test": "data"}
 
 
 def test_handle_response_pdf_format():
@@ -97,6 +100,21 @@ def test_handle_response_html_format_string():
     assert isinstance(result.body, bytes)
 
 
+def test_handle_response_html_streamed_content():
+    """Test handling HTML response with an iterator of chunks (streaming)."""
+    report = {
+        "content": iter(["<html>", "<body>Report</body>", "</html>"]),
+        "content_type": "text/html",
+        "filename": "report.html",
+    }
+    
+    result = ReportResponseHandler.handle_response(report, "html")
+    
+    assert isinstance(result, StreamingResponse)
+    assert result.media_type == "text/html"
+    assert "report.html" in result.headers.get("content-disposition", "")
+
+
 def test_handle_response_case_insensitive_format():
     """Test that format is case insensitive."""
     report = {
@@ -107,8 +125,8 @@ def test_handle_response_case_insensitive_format():
     
     result = ReportResponseHandler.handle_response(report, "JSON")
     
-    assert isinstance(result, dict)
-    assert result["test"] == "data"
+    assert isinstance(result, Response)
+    assert json.loads(result.body) == {"test": "data"}
 
 
 def test_handle_response_error_not_found():
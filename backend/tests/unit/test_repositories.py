@@ -114,6 +114,57 @@ async def test_user_repository_update(db_session: AsyncSession):
     assert updated_user.apellido == "Name"
 
 
+@pytest.mark.asyncio
+async def test_update_returns_row_in_one_statement(db_session: AsyncSession, count_queries):
+    """Test update uses UPDATE ... RETURNING instead of a follow-up SELECT."""
+    repo = UserRepository(db_session)
+    
+    user = User(
+        email="returning@example.com",
+        password_hash="hash",
+        role=UserRole.ESTUDIANTE,
+        nombre="Original",
+        apellido="Name",
+        codigo_institucional="EST-RET",
+        fecha_nacimiento=date(2000, 1, 1),
+    )
+    db_session.add(user)
+    await db_session.commit()
+    count_queries.clear()
+    
+    updated_user = await repo.update(user.id, {"nombre": "Updated"})
+    
+    assert len(count_queries) == 1
+    assert "RETURNING" in count_queries[0]
+    assert updated_user is user
+    assert user.nombre == "Updated"
+    assert await repo.update(99999, {"nombre": "Missing"}) is None
+
+
+@pytest.mark.asyncio
+async def test_update_without_returning_support(db_session: AsyncSession, monkeypatch):
+    """Test update falls back to a SELECT when UPDATE ... RETURNING is unavailable."""
+    repo = UserRepository(db_session)
+    monkeypatch.setattr(repo, "_supports_update_returning", lambda: False)
+    
+    user = User(
+        email="fallback@example.com",
+        password_hash="hash",
+        role=UserRole.ESTUDIANTE,
+        nombre="Original",
+        apellido="Name",
+        codigo_institucional="EST-FALLBACK",
+        fecha_nacimiento=date(2000, 1, 1),
+    )
+    db_session.add(user)
+    await db_session.commit()
+    
+    updated_user = await repo.update(user.id, {"nombre": "Updated"})
+    
+    assert updated_user.nombre == "Updated"
+    assert await repo.update(99999, {"nombre": "Missing"}) is None
+
+
 @pytest.mark.asyncio
 async def test_user_repository_delete(db_session: AsyncSession):
     """Test UserRepository delete method."""
@@ -304,6 +304,48 @@ class TestGradeRepositoryAdvanced:
         assert average is not None
         assert abs(average - 4.375) < 0.01  # Allow small floating point differences
 
+    @pytest.mark.asyncio
+    async def test_get_report_data_by_estudiante_groups_grades_and_averages(
+        self, db_session: AsyncSession, setup_test_data
+    ):
+        """Test that get_report_data_by_estudiante groups grades per enrollment."""
+        data = setup_test_data
+        enrollment_id = data['enrollment'].id
+        
+        repo = GradeRepository(db_session)
+        
+        report_data = await repo.get_report_data_by_estudiante(data['estudiante'].id)
+        
+        assert list(report_data.keys()) == [enrollment_id]
+        assert [g.id for g in report_data[enrollment_id]["grades"]] == [g.id for g in data['grades']]
+        assert abs(report_data[enrollment_id]["average"] - 4.375) < 0.01
+
+    @pytest.mark.asyncio
+    async def test_get_report_data_by_subject_groups_grades_and_averages(
+        self, db_session: AsyncSession, setup_test_data
+    ):
+        """Test that get_report_data_by_subject groups grades per enrollment."""
+        data = setup_test_data
+        enrollment_id = data['enrollment'].id
+        
+        repo = GradeRepository(db_session)
+        
+        report_data = await repo.get_report_data_by_subject(data['subject'].id)
+        
+        assert list(report_data.keys()) == [enrollment_id]
+        assert len(report_data[enrollment_id]["grades"]) == 2
+        assert abs(report_data[enrollment_id]["average"] - 4.375) < 0.01
+
+    @pytest.mark.asyncio
+    async def test_get_report_data_returns_empty_when_no_grades(
+        self, db_session: AsyncSession
+    ):
+        """Test that report data loaders return an empty mapping without grades."""
+        repo = GradeRepository(db_session)
+        
+        assert await repo.get_report_data_by_estudiante(99999) == {}
+        assert await repo.get_report_data_by_subject(99999) == {}
+
     @pytest.mark.asyncio
     async def test_get_average_by_enrollment_returns_none_when_no_grades(
         self, db_session: AsyncSession, setup_test_data
@@ -501,6 +543,65 @@ class TestGradeRepositoryAdvanced:
         assert len(grades) == 0
 
 
+class TestGradeRepositoryQueryCount:
+    """Regression tests: subject and student grade lookups run as one statement."""
+
+    @pytest.mark.asyncio
+    async def test_get_by_subject_issues_one_statement(
+        self, db_session: AsyncSession, setup_test_data, count_queries
+    ):
+        """Test that get_by_subject joins enrollments in a single query."""
+        repo = GradeRepository(db_session)
+        count_queries.clear()
+        
+        grades = await repo.get_by_subject(setup_test_data['subject'].id)
+        
+        assert len(count_queries) == 1
+        assert [g.id for g in grades] == sorted(g.id for g in setup_test_data['grades'])
+
+    @pytest.mark.asyncio
+    async def test_get_by_estudiante_issues_one_statement(
+        self, db_session: AsyncSession, setup_test_data, count_queries
+    ):
+        """Test that get_by_estudiante joins enrollments in a single query."""
+        repo = GradeRepository(db_session)
+        count_queries.clear()
+        
+        grades = await repo.get_by_estudiante(setup_test_data['estudiante'].id)
+        
+        assert len(count_queries) == 1
+        assert [g.id for g in grades] == sorted(g.id for g in setup_test_data['grades'])
+
+    @pytest.mark.asyncio
+    async def test_get_many_with_relations_by_subject_issues_one_statement(
+        self, db_session: AsyncSession, setup_test_data, count_queries
+    ):
+        """Test that filtering by subject uses a semi-join instead of an ID list."""
+        repo = GradeRepository(db_session)
+        count_queries.clear()
+        
+        grades = await repo.get_many_with_relations(
+            subject_id=setup_test_data['subject'].id, relations=['enrollment']
+        )
+        
+        assert len(count_queries) == 1
+        assert len(grades) == 2
+        assert grades[0].enrollment.subject.id == setup_test_data['subject'].id
+
+    @pytest.mark.asyncio
+    async def test_get_by_subject_for_nonexistent_subject_issues_one_statement(
+        self, db_session: AsyncSession, count_queries
+    ):
+        """Test that an empty subject still costs a single statement."""
+        repo = GradeRepository(db_session)
+        count_queries.clear()
+        
+        grades = await repo.get_by_subject(99999)
+        
+        assert grades == []
+        assert len(count_queries) == 1
+
+
 class TestEnrollmentRepositoryAdvanced:
     """Tests for EnrollmentRepository advanced methods."""
 
@@ -3,9 +3,13 @@
 import pytest
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
+from app.core.exceptions import ServiceUnavailableError
 from app.core.security import (
+    PasswordHashPool,
     verify_password,
+    verify_password_async,
     get_password_hash,
+    get_password_hash_async,
     create_access_token,
     decode_access_token,
 )
@@ -254,3 +258,153 @@ def test_password_verification_case_sensitive():
     assert verify_password("TESTPASSWORD123", hashed) is False
     assert verify_password("TeStPaSsWoRd123", hashed) is False
 
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_async():
+    """Test async password hashing and verification."""
+    hashed = await get_password_hash_async("test_password_123")
+    
+    assert await verify_password_async("test_password_123", hashed) is True
+    assert await verify_password_async("wrong_password", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_async_rejects_empty_password():
+    """Test that async hashing rejects empty passwords before queueing."""
+    with pytest.raises(ValueError):
+        await get_password_hash_async("")
+
+
+@pytest.mark.asyncio
+async def test_password_hash_pool_records_queue_wait():
+    """Test that the pool records queue wait for every started job."""
+    import asyncio
+    
+    pool = PasswordHashPool(max_workers=1, max_pending=8)
+    try:
+        hashed = get_password_hash("secret")
+        results = await asyncio.gather(
+            *(pool.run(verify_password, "secret", hashed) for _ in range(3))
+        )
+        
+        assert results == [True, True, True]
+        stats = pool.stats()
+        assert stats["completed"] == 3
+        assert stats["pending"] == 0
+        assert stats["max_wait_seconds"] > 0
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hash_pool_rejects_when_full():
+    """Test that jobs beyond max_pending are rejected with 503."""
+    import asyncio
+    import threading
+    
+    pool = PasswordHashPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        blocked = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(ServiceUnavailableError):
+            await pool.run(verify_password, "secret", "hash")
+        assert pool.rejected == 1
+        
+        release.set()
+        await blocked
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hash_pool_holds_slot_of_cancelled_caller():
+    """Test a cancelled caller's job keeps its slot until the thread finishes it."""
+    import asyncio
+    import threading
+    
+    pool = PasswordHashPool(max_workers=1, max_pending=1)
+    started = threading.Event()
+    release = threading.Event()
+    
+    def slow_hash():
+        started.set()
+        release.wait()
+    
+    try:
+        caller = asyncio.create_task(pool.run(slow_hash))
+        await asyncio.to_thread(started.wait, 5)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        
+        assert pool.pending == 1
+        with pytest.raises(ServiceUnavailableError):
+            await pool.run(verify_password, "secret", "hash")
+        
+        release.set()
+        for _ in range(100):
+            if pool.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.pending == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_workers", [0, 1])
+async def test_bulk_password_hasher_keeps_order_and_reports_progress(max_workers):
+    """Hashes come back in input order from threads or worker processes."""
+    from app.core.security import BulkPasswordHasher, verify_password
+
+    hasher = BulkPasswordHasher(max_workers=max_workers, chunk_size=2)
+    passwords = ["uno", "dos", "tres"]
+    progress = []
+    try:
+        hashes = await hasher.hash_all(passwords, progress=lambda done, total: progress.append((done, total)))
+    finally:
+        hasher.shutdown()
+
+    assert [verify_password(p, h) for p, h in zip(passwords, hashes)] == [True, True, True]
+    assert progress[-1] == (3, 3)
+    assert len(progress) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_password_hasher_rejects_empty_password():
+    from app.core.security import BulkPasswordHasher
+
+    with pytest.raises(ValueError):
+        await BulkPasswordHasher(max_workers=0).hash_all(["ok", ""])
+
+
+@pytest.mark.asyncio
+async def test_bulk_password_hasher_bounds_shared_pool_queue(monkeypatch):
+    """Imports with more chunks than max_pending neither fail nor fill the login queue."""
+    from app.core import security
+    from app.core.security import BulkPasswordHasher
+
+    pool = PasswordHashPool(max_workers=2, max_pending=8)
+    monkeypatch.setattr(security, "password_hash_pool", pool)
+    monkeypatch.setattr(security, "_hash_password_chunk", lambda chunk: [f"hash-{p}" for p in chunk])
+    peak = []
+    original_run = pool.run
+
+    async def run(func, *args):
+        peak.append(pool.pending + 1)
+        return await original_run(func, *args)
+
+    monkeypatch.setattr(pool, "run", run)
+    passwords = [f"password-{i}" for i in range(pool.max_pending * 3)]
+    try:
+        hashes = await BulkPasswordHasher(max_workers=0, chunk_size=1).hash_all(passwords)
+    finally:
+        pool.shutdown()
+
+    assert hashes == [f"hash-{p}" for p in passwords]
+    assert pool.rejected == 0
+    assert max(peak) <= pool.max_pending // 4
@@ -0,0 +1,116 @@
+"""Tests for per-request SQL instrumentation."""
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.sql_instrumentation import (
+    RepeatedQueryError,
+    SQLInstrumentationMiddleware,
+    current_query_stats,
+    statement_shape,
+    track_queries,
+)
+from app.models.user import User
+
+
+class TestStatementShape:
+    """Tests for statement normalization."""
+
+    def test_literals_and_placeholders_are_removed(self):
+        """Test executions with different values share a shape."""
+        assert statement_shape("SELECT * FROM users WHERE id = 5 AND email = 'a@x.com'") == (
+            "SELECT * FROM users WHERE id = ? AND email = ?"
+        )
+        assert statement_shape("SELECT * FROM users WHERE id = $1") == statement_shape(
+            "SELECT * FROM users WHERE id = ?"
+        )
+
+    def test_in_lists_are_collapsed(self):
+        """Test expanded IN lists of any length share a shape."""
+        assert statement_shape("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == statement_shape(
+            "SELECT 1 FROM t WHERE id IN ($1, $2)"
+        )
+
+    def test_identifiers_with_digits_are_kept(self):
+        """Test aliases such as users_1 are not treated as literals."""
+        assert "users_1.id" in statement_shape("SELECT users_1.id FROM users AS users_1")
+
+
+@pytest.mark.asyncio
+async def test_track_queries_groups_statements(db_session: AsyncSession):
+    """Test statements are counted per shape inside a tracked block."""
+    assert current_query_stats() is None
+    with track_queries() as stats:
+        for user_id in range(3):
+            await db_session.execute(select(User).where(User.id == user_id))
+        await db_session.execute(text("SELECT 1"))
+
+    assert current_query_stats() is None
+    assert stats.count == 4
+    assert stats.max_repeat == 3
+    assert len(stats.shapes) == 2
+    assert stats.repeated(2)[0][1] == 3
+    assert stats.repeated(3) == []
+    assert stats.duration > 0
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(client: AsyncClient):
+    """Test every HTTP response reports its database time and query count."""
+    response = await client.post(
+        "/api/v1/auth/login", data={"username": "nobody@test.com", "password": "secret123"}
+    )
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith("db;dur=")
+    assert 'desc="1 queries"' in server_timing
+    assert "app;dur=" in server_timing
+
+
+@pytest.fixture
+def n_plus_one_app(db_session: AsyncSession) -> FastAPI:
+    """Application whose endpoint runs one query per ID."""
+    test_app = FastAPI()
+    test_app.add_middleware(SQLInstrumentationMiddleware)
+
+    @test_app.get("/users")
+    async def list_users(count: int):
+        for user_id in range(count):
+            await db_session.execute(select(User).where(User.id == user_id))
+        return {"ok": True}
+
+    return test_app
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_raise(n_plus_one_app: FastAPI, monkeypatch):
+    """Test an N+1 request fails when the action is 'raise'."""
+    monkeypatch.setattr(settings, "sql_repeat_threshold", 3)
+    async with AsyncClient(app=n_plus_one_app, base_url="http://test") as test_client:
+        response = await test_client.get("/users", params={"count": 3})
+        assert response.status_code == 200
+
+        with pytest.raises(RepeatedQueryError, match="4x SELECT"):
+            await test_client.get("/users", params={"count": 4})
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_warn(n_plus_one_app: FastAPI, monkeypatch):
+    """Test an N+1 request is logged when the action is 'warn'."""
+    monkeypatch.setattr(settings, "sql_repeat_threshold", 3)
+    monkeypatch.setattr(settings, "sql_repeat_action", "warn")
+    warnings = []
+    monkeypatch.setattr(
+        "app.core.sql_instrumentation.logger.warning",
+        lambda message, **kwargs: warnings.append((message, kwargs)),
+    )
+    async with AsyncClient(app=n_plus_one_app, base_url="http://test") as test_client:
+        response = await test_client.get("/users", params={"count": 5})
+
+    assert response.status_code == 200
+    message, kwargs = warnings[0]
+    assert "n_plus_one" in message
+    assert kwargs["extra"]["sql_stats"]["max_repeat"] == 5
+    assert kwargs["extra"]["sql_stats"]["path"] == "/users"
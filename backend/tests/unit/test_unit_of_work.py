@@ -0,0 +1,137 @@
+"""Tests for the request-scoped unit of work."""
+
+import pytest
+from datetime import date
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
+from httpx import AsyncClient
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import unit_of_work
+from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.models.user import User, UserRole
+from app.repositories.user_repository import UserRepository
+from app.schemas.user import UserCreate
+from app.services.user_service import UserService
+
+
+def user_data(email: str) -> dict:
+    """Column values of an estudiante."""
+    return {
+        "email": email,
+        "password_hash": "hash",
+        "role": UserRole.ESTUDIANTE,
+        "nombre": "Uow",
+        "apellido": "Test",
+        "codigo_institucional": f"EST-{email.split('@')[0]}",
+        "fecha_nacimiento": date(2000, 1, 1),
+    }
+
+
+@pytest.fixture
+def count_commits(db_session: AsyncSession):
+    """List appended to on every commit of the test session."""
+    commits = []
+
+    def after_commit(session):
+        commits.append(session)
+
+    event.listen(db_session.sync_session, "after_commit", after_commit)
+    yield commits
+    event.remove(db_session.sync_session, "after_commit", after_commit)
+
+
+async def count_users(db_session: AsyncSession) -> int:
+    result = await db_session.execute(select(func.count(User.id)))
+    return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_scope_commits_once_and_runs_callbacks_after(db_session: AsyncSession, count_commits):
+    """Test writes inside a unit of work are flushed and committed once at the end."""
+    invalidated = []
+    repo = UserRepository(db_session)
+
+    async with unit_of_work.scope(db_session):
+        await repo.create(user_data("uno@test.com"))
+        await repo.create(user_data("dos@test.com"))
+        await unit_of_work.after_commit(db_session, invalidated.append, "users")
+        assert count_commits == []
+        assert invalidated == []
+
+    assert len(count_commits) == 1
+    assert invalidated == ["users"]
+    assert not unit_of_work.in_unit_of_work(db_session)
+
+
+@pytest.mark.asyncio
+async def test_scope_rolls_back_on_error(db_session: AsyncSession, count_commits):
+    """Test a failing unit of work keeps none of its writes or callbacks."""
+    invalidated = []
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work.scope(db_session):
+            await UserRepository(db_session).create(user_data("uno@test.com"))
+            await unit_of_work.after_commit(db_session, invalidated.append, "users")
+            raise RuntimeError("boom")
+
+    assert count_commits == []
+    assert invalidated == []
+    assert await count_users(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_outside_scope_commits_immediately(db_session: AsyncSession, count_commits):
+    """Test services used without a request keep committing their own writes."""
+    invalidated = []
+
+    await UserRepository(db_session).create(user_data("uno@test.com"))
+    await unit_of_work.after_commit(db_session, invalidated.append, "users")
+
+    assert len(count_commits) == 1
+    assert invalidated == ["users"]
+
+
+@pytest.mark.asyncio
+async def test_request_commits_once_before_responding(db_session: AsyncSession, count_commits):
+    """Test a multi-step request costs one commit, made before the response is sent."""
+    committed_at_response = []
+    router = APIRouter(route_class=UnitOfWorkRoute)
+
+    @router.post("/users")
+    async def create_users(db: AsyncSession = Depends(get_db)):
+        service = UserService(db)
+        for email in ("uno@test.com", "dos@test.com"):
+            await service.create_user(UserCreate(
+                email=email, password="secret123", role=UserRole.ESTUDIANTE,
+                nombre="Uow", apellido="Test", fecha_nacimiento=date(2000, 1, 1),
+            ))
+        return {"ok": True}
+
+    @router.post("/fail")
+    async def fail(db: AsyncSession = Depends(get_db)):
+        await UserRepository(db).create(user_data("tres@test.com"))
+        raise HTTPException(status_code=409, detail="conflict")
+
+    test_app = FastAPI()
+    test_app.include_router(router)
+
+    @test_app.middleware("http")
+    async def record_commits(request, call_next):
+        response = await call_next(request)
+        committed_at_response.append(len(count_commits))
+        return response
+
+    async def override_get_db(request: Request):
+        async with unit_of_work.scope(db_session, request):
+            yield db_session
+
+    test_app.dependency_overrides[get_db] = override_get_db
+    async with AsyncClient(app=test_app, base_url="http://test") as test_client:
+        assert (await test_client.post("/users")).status_code == 200
+        assert committed_at_response == [1]
+
+        assert (await test_client.post("/fail")).status_code == 409
+
+    assert len(count_commits) == 1
+    assert await count_users(db_session) == 2
@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react'
 import { Users, BookOpen, GraduationCap, UserCheck } from 'lucide-react'
 import StatsCard from '../common/StatsCard'
-import { userService, subjectService, enrollmentService, gradeService, profesorService, estudianteService } from '../../services/apiService'
+import { dashboardService } from '../../services/apiService'
 import { useAuth } from '../../context/AuthContext'
 import Loading from '../common/Loading'
 
@@ -24,99 +24,20 @@ const DashboardHome = () => {
   const fetchStats = async () => {
     try {
       setLoading(true)
-      
-      if (user?.role === 'Admin') {
-        // Admin: todas las estadísticas
-        const [users, subjects, enrollments, grades] = await Promise.all([
-          userService.getAll(),
-          subjectService.getAll(),
-          enrollmentService.getAll(),
-          gradeService.getAll(),
-        ])
-
-        setStats({
-          users: users.length || 0,
-          subjects: subjects.length || 0,
-          enrollments: enrollments.length || 0,
-          grades: grades.length || 0,
-        })
-      } else if (user?.role === 'Profesor') {
-        // Profesor: sus materias y notas de sus materias
-        try {
-          const mySubjects = await profesorService.getAssignedSubjects(user.id)
-          if (!mySubjects || mySubjects.length === 0) {
-            setStats({ users: 0, subjects: 0, enrollments: 0, grades: 0 })
-            return
-          }
-          
-          // Obtener notas de todas las materias del profesor
-          let totalGrades = 0
-          for (const subject of mySubjects) {
-            if (subject?.id) {
-              try {
-                const grades = await gradeService.getAll({ subject_id: subject.id })
-                totalGrades += (grades?.length || 0)
-              } catch (err) {
-                // Silenciar errores individuales, solo loguear
-                console.warn(`No se pudieron obtener notas para materia ${subject.id}:`, err)
-              }
-            }
-          }
-          
-          setStats({
-            users: 0,
-            subjects: mySubjects.length || 0,
-            enrollments: 0,
-            grades: totalGrades,
-          })
-        } catch (err) {
-          console.error('Error fetching profesor stats:', err)
-          setStats({ users: 0, subjects: 0, enrollments: 0, grades: 0 })
-        }
-      } else if (user?.role === 'Estudiante') {
-        // Estudiante: sus materias y notas
-        try {
-          const enrollments = await estudianteService.getMyEnrollments(user.id)
-          if (!enrollments || enrollments.length === 0) {
-            setStats({ users: 0, subjects: 0, enrollments: 0, grades: 0 })
-            return
-          }
-          
-          // Obtener notas del estudiante
-          let totalGrades = 0
-          for (const enrollment of enrollments) {
-            const subjectId = enrollment.subject_id || enrollment.subject?.id
-            if (subjectId) {
-              try {
-                const grades = await gradeService.getAll({ subject_id: subjectId })
-                // Filtrar solo las notas del estudiante
-                const myGrades = (grades || []).filter(
-                  (g) => g.enrollment?.estudiante_id === user.id
-                )
-                totalGrades += myGrades.length
-              } catch (err) {
-                // Silenciar errores individuales, solo loguear
-                console.warn(`No se pudieron obtener notas para materia ${subjectId}:`, err)
-              }
-            }
-          }
-          
-          setStats({
-            users: 0,
-            subjects: enrollments.length || 0,
-            enrollments: enrollments.length || 0,
-            grades: totalGrades,
-          })
-        } catch (err) {
-          // Silenciar errores 403, ya que el servicio los maneja
-          if (err.response?.status !== 403 && err.response?.status !== 401) {
-            console.error('Error fetching estudiante stats:', err)
-          }
-          setStats({ users: 0, subjects: 0, enrollments: 0, grades: 0 })
-        }
-      }
+      // Conteos calculados en el servidor según el rol (una sola petición)
+      const summary = await dashboardService.getSummary()
+      setStats({
+        users: summary.counts.users || 0,
+        subjects: summary.counts.subjects || 0,
+        enrollments: summary.counts.enrollments || 0,
+        grades: summary.counts.grades || 0,
+      })
     } catch (error) {
-      console.error('Error fetching stats:', error)
+      // Silenciar errores 403/401, ya que el servicio los maneja
+      if (error.response?.status !== 403 && error.response?.status !== 401) {
+        console.error('Error fetching stats:', error)
+      }
+      setStats({ users: 0, subjects: 0, enrollments: 0, grades: 0 })
     } finally {
       setLoading(false)
     }
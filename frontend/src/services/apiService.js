@@ -182,6 +182,18 @@ export const profileService = {
   },
 }
 
+// ==================== DASHBOARD ====================
+export const dashboardService = {
+  /**
+   * Estadísticas del dashboard según el rol del usuario (conteos, promedios
+   * por materia y notas recientes), calculadas en el servidor
+   */
+  getSummary: async () => {
+    const response = await api.get('/dashboard/summary')
+    return response.data
+  },
+}
+
 // ==================== PROFESOR ====================
 export const profesorService = {
   /**